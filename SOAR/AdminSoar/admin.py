@@ -1,3 +1,26 @@
 from django.contrib import admin
+from .models import DailyRegistrationStat, OrganizationMonthlyEventStat, DailyRSVPStat, OrganizationMemberStat
 
-# Register your models here.
+
+@admin.register(DailyRegistrationStat)
+class DailyRegistrationStatAdmin(admin.ModelAdmin):
+    list_display = ('day', 'count')
+    date_hierarchy = 'day'
+
+
+@admin.register(OrganizationMonthlyEventStat)
+class OrganizationMonthlyEventStatAdmin(admin.ModelAdmin):
+    list_display = ('organization', 'month', 'count')
+    list_select_related = ('organization',)
+
+
+@admin.register(DailyRSVPStat)
+class DailyRSVPStatAdmin(admin.ModelAdmin):
+    list_display = ('day', 'status', 'count')
+    list_filter = ('status',)
+
+
+@admin.register(OrganizationMemberStat)
+class OrganizationMemberStatAdmin(admin.ModelAdmin):
+    list_display = ('organization', 'member_count', 'approved_count')
+    list_select_related = ('organization',)
@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from SOAR.event.models import OrganizationEvent
+from SOAR.organization.models import Organization
+from .models import DailyRegistrationStat, OrganizationMonthlyEventStat, DailyRSVPStat
+
+ANALYTICS_CACHE_KEY = 'adminsoar:analytics'
+ANALYTICS_CACHE_TIMEOUT = 60
+
+RECENT_EVENT_LIMIT = 5
+
+
+def _rollup_total(model):
+    return model.objects.aggregate(total=Sum('count'))['total'] or 0
+
+
+def _registrations_by_month():
+    rows = DailyRegistrationStat.objects.annotate(
+        month=TruncMonth('day')
+    ).values('month').annotate(count=Sum('count')).order_by('month')
+    return [
+        {
+            'period': row['month'].strftime('%Y-%m'),
+            'label': row['month'].strftime('%b %Y'),
+            'count': row['count'],
+        }
+        for row in rows if row['count']
+    ]
+
+
+def _organization_types():
+    rows = Organization.objects.values('org_type').annotate(count=Count('id')).order_by('-count', 'org_type')
+    return {row['org_type']: row['count'] for row in rows}
+
+
+def _event_types():
+    labels = dict(OrganizationEvent._meta.get_field('activity_type').choices)
+    rows = OrganizationEvent.objects.values('activity_type').annotate(
+        count=Count('id')
+    ).order_by('-count', 'activity_type')
+    return {labels.get(row['activity_type'], row['activity_type']): row['count'] for row in rows}
+
+
+def _recent_events():
+    events = OrganizationEvent.objects.select_related('organization').order_by('-event_date')[:RECENT_EVENT_LIMIT]
+    return [
+        {
+            'id': str(event.id),
+            'eventName': event.title,
+            'organization': event.organization.name,
+            'date': event.event_date.isoformat(),
+            'activityType': event.get_activity_type_display(),
+        }
+        for event in events
+    ]
+
+
+def compute_analytics():
+    """Aggregate dashboard numbers in SQL.
+
+    User, event and RSVP numbers come from the rollup tables, so the cost
+    does not grow with the number of source rows.
+    """
+    return {
+        'totals': {
+            'users': _rollup_total(DailyRegistrationStat),
+            'organizations': Organization.objects.count(),
+            'events': _rollup_total(OrganizationMonthlyEventStat),
+            'rsvps': _rollup_total(DailyRSVPStat),
+        },
+        'registrations': _registrations_by_month(),
+        'organizationTypes': _organization_types(),
+        'eventTypes': _event_types(),
+        'recentEvents': _recent_events(),
+        'generatedAt': timezone.now().isoformat(),
+    }
+
+
+def get_analytics(refresh=False):
+    """Return dashboard analytics, recomputed at most once per ANALYTICS_CACHE_TIMEOUT seconds."""
+    data = None if refresh else cache.get(ANALYTICS_CACHE_KEY)
+    if data is None:
+        data = compute_analytics()
+        cache.set(ANALYTICS_CACHE_KEY, data, ANALYTICS_CACHE_TIMEOUT)
+    return data
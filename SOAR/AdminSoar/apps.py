@@ -5,3 +5,6 @@ class AdminConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'SOAR.AdminSoar'   # folder path
     label = 'adminsoar'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,329 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count
+
+from SOAR.accounts.models import User
+from SOAR.event.models import OrganizationEvent, EventRSVP, EventWaitlistEntry
+from SOAR.event.services import promote_from_waitlist
+from SOAR.notification.models import Notification
+from SOAR.organization.models import Organization, OrganizationMember, Program, ROLE_CHOICES
+from SOAR.organization.services import ProgramStats
+from .imports import delete_auth_users
+from .models import OrganizationMemberStat
+from .rollups import batched_rollups, bump
+
+# Ids handled per DELETE/UPDATE statement
+BULK_CHUNK_SIZE = 500
+
+# Largest id list accepted in one request
+MAX_BULK_IDS = 5000
+
+BULK_ACTIONS = ('delete', 'deactivate', 'update')
+
+
+def _parse_bool(value):
+    if not isinstance(value, bool):
+        raise ValueError("Must be true or false.")
+    return value
+
+
+def _parse_text(value):
+    if not isinstance(value, str):
+        raise ValueError("Must be a string.")
+    return value
+
+
+def _parse_choice(choices):
+    def parse(value):
+        if value not in dict(choices):
+            raise ValueError(f"Must be one of: {', '.join(dict(choices))}.")
+        return value
+    return parse
+
+
+def _parse_year_level(value):
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Year level must be a number.")
+
+
+def _parse_course(value):
+    if not value:
+        return None
+    program = Program.objects.filter(abbreviation=value).first() or Program.objects.filter(name=value).first()
+    if program is None:
+        raise ValueError("Program not found.")
+    return program
+
+
+class BulkTarget:
+    """What a bulk request may do to one admin dataset.
+
+    `fields` maps payload keys to (model field, parser); parsers raise
+    ValueError for bad values. `deactivate` is the field update applied by the
+    'deactivate' action (None when the dataset has no such state). The hooks
+    receive the ids of one chunk that exist:
+
+    - `protect(request, ids, action)` returns {id: error} for ids that must be left alone
+    - `notify(ids, action, values)` returns unsaved Notifications, built
+      before the chunk is changed and saved with one bulk_create after it
+    - `before_update(ids, values)` runs just before a chunk is updated, for
+      bookkeeping that signals would otherwise do
+    - `before_delete(ids)` runs just before a chunk is deleted and returns
+      state for `after_chunk_delete(state)`, which runs right after the chunk
+      is deleted in the same transaction, and for `after_delete(state)`, which
+      runs after the transaction commits
+    """
+
+    def __init__(self, model, fields=None, deactivate=None, protect=None, notify=None,
+                 before_update=None, before_delete=None, after_chunk_delete=None, after_delete=None):
+        self.model = model
+        self.fields = fields or {}
+        self.deactivate = deactivate
+        self.protect = protect
+        self.notify = notify
+        self.before_update = before_update
+        self.before_delete = before_delete
+        self.after_chunk_delete = after_chunk_delete
+        self.after_delete = after_delete
+
+    def parse_values(self, action, payload):
+        """Return the model field values for an action. Raises ValueError for a bad request."""
+        if action == 'delete':
+            return {}
+        if action == 'deactivate':
+            if self.deactivate is None:
+                raise ValueError("This dataset cannot be deactivated")
+            return dict(self.deactivate)
+
+        changes = payload.get('fields')
+        if not isinstance(changes, dict) or not changes:
+            raise ValueError("'fields' must be a non-empty object")
+        values = {}
+        for key, value in changes.items():
+            if key not in self.fields:
+                raise ValueError(f"Cannot update field: {key}")
+            field, parse = self.fields[key]
+            try:
+                values[field] = parse(value)
+            except ValueError as e:
+                raise ValueError(f"{key}: {e}")
+        return values
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def parse_ids(model, raw_ids):
+    """Parse requested ids into (unique valid pks, outcomes).
+
+    `outcomes` maps every distinct id, in request order, to None or to the
+    error outcome of an id that could not be parsed.
+    """
+    if not isinstance(raw_ids, list) or not raw_ids:
+        raise ValueError("'ids' must be a non-empty list")
+    if len(raw_ids) > MAX_BULK_IDS:
+        raise ValueError(f"Too many ids: at most {MAX_BULK_IDS} can be changed at once")
+    pk_field = model._meta.pk
+    pks, outcomes = [], {}
+    for raw in raw_ids:
+        try:
+            pk = pk_field.to_python(raw)
+        except (TypeError, ValidationError):
+            outcomes[str(raw)] = {'status': 'error', 'error': 'Invalid id.'}
+            continue
+        if str(pk) not in outcomes:
+            outcomes[str(pk)] = None
+            pks.append(pk)
+    return pks, outcomes
+
+
+def run_bulk(target, request, payload):
+    """Apply a bulk delete, deactivate or update and report the outcome of every id.
+
+    Each chunk of BULK_CHUNK_SIZE ids costs one SELECT for the ids that exist
+    and one set-based DELETE or UPDATE (plus cascades); all chunks run in one
+    transaction, so a failure leaves nothing half-applied. Rollup counters
+    touched by cascades are merged and written once per row at the end.
+    Raises ValueError for a malformed request.
+    """
+    action = payload.get('action')
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"'action' must be one of: {', '.join(BULK_ACTIONS)}")
+    values = target.parse_values(action, payload)
+    pks, outcomes = parse_ids(target.model, payload.get('ids'))
+    done = 'deleted' if action == 'delete' else 'updated'
+    queryset = target.model._base_manager
+    deleted_state = []
+
+    with transaction.atomic(), batched_rollups():
+        for chunk in _chunks(pks, BULK_CHUNK_SIZE):
+            existing = set(queryset.filter(pk__in=chunk).values_list('pk', flat=True))
+            protected = target.protect(request, existing, action) if target.protect else {}
+            ids = [pk for pk in chunk if pk in existing and pk not in protected]
+            for pk in chunk:
+                if pk in protected:
+                    outcomes[str(pk)] = {'status': 'error', 'error': protected[pk]}
+                elif pk not in existing:
+                    outcomes[str(pk)] = {'status': 'not_found'}
+                else:
+                    outcomes[str(pk)] = {'status': done}
+            if not ids:
+                continue
+
+            notifications = target.notify(ids, action, values) if target.notify else []
+            if action == 'delete':
+                state = target.before_delete(ids) if target.before_delete else None
+                queryset.filter(pk__in=ids).delete()
+                if target.after_chunk_delete:
+                    target.after_chunk_delete(state)
+                deleted_state.append(state)
+            else:
+                if target.before_update:
+                    target.before_update(ids, values)
+                queryset.filter(pk__in=ids).update(**values)
+            if notifications:
+                Notification.objects.bulk_create(notifications)
+
+    # queryset.update() sends no signals, and several of these fields feed the program counts
+    transaction.on_commit(ProgramStats.invalidate)
+    if target.after_delete:
+        for state in deleted_state:
+            target.after_delete(state)
+
+    results = [{'id': raw, **outcome} for raw, outcome in outcomes.items()]
+    summary = {'total': len(results), 'succeeded': sum(1 for r in results if r['status'] == done)}
+    summary['failed'] = summary['total'] - summary['succeeded']
+    return {'action': action, 'summary': summary, 'results': results}
+
+
+def _count_approval_change(ids, values):
+    """Keep OrganizationMemberStat in step with an is_approved UPDATE, which sends no signal."""
+    if 'is_approved' not in values:
+        return
+    approved = values['is_approved']
+    flipped = OrganizationMember.objects.filter(pk__in=ids, is_approved=not approved).values(
+        'organization_id'
+    ).annotate(total=Count('id')).order_by()
+    for row in flipped:
+        delta = row['total'] if approved else -row['total']
+        bump(OrganizationMemberStat, {'organization_id': row['organization_id']}, approved_count=delta)
+
+
+def _protect_current_user(request, ids, action):
+    if action in ('delete', 'deactivate') and request.user.pk in ids:
+        return {request.user.pk: f'Cannot {action} the currently logged-in user.'}
+    return {}
+
+
+def _notify_cancelled_events(ids, action, values):
+    if not values.get('cancelled'):
+        return []
+    rsvps = EventRSVP.objects.filter(
+        event_id__in=ids,
+        event__cancelled=False,
+        status__in=['going', 'interested']
+    ).select_related('event__organization')
+    return [
+        Notification(
+            user_id=rsvp.user_id,
+            message=f"❌ '{rsvp.event.title}' by {rsvp.event.organization.name} has been cancelled.",
+            notification_type=Notification.TYPE_EVENT,
+            priority=Notification.PRIORITY_HIGH,
+            link=f"/event/{rsvp.event_id}/"
+        )
+        for rsvp in rsvps
+    ]
+
+
+def _notify_members(ids, action, values):
+    members = OrganizationMember.objects.filter(pk__in=ids).select_related('organization')
+    if action == 'delete':
+        # Same notice as removing a member from the organization page; pending requests were never members
+        return [
+            Notification(
+                user_id=member.student_id,
+                message=f"⚠️ You have been removed from {member.organization.name}.",
+                notification_type=Notification.TYPE_ORGANIZATION,
+                priority=Notification.PRIORITY_HIGH
+            )
+            for member in members.filter(is_approved=True)
+        ]
+    if values.get('is_approved'):
+        return [
+            Notification(
+                user_id=member.student_id,
+                message=f"✅ Your membership request to {member.organization.name} has been approved! Welcome aboard.",
+                notification_type=Notification.TYPE_MEMBERSHIP,
+                priority=Notification.PRIORITY_HIGH,
+                link=f"/organization/organization/{member.organization_id}/profile/"
+            )
+            for member in members.filter(is_approved=False)
+        ]
+    return []
+
+
+def _lock_events_with_freed_spots(ids):
+    """Lock the events whose 'going' RSVPs are about to be deleted, as cancel_rsvp() does, and return them."""
+    freed = EventRSVP.objects.filter(pk__in=ids, status='going').values('event_id')
+    return list(
+        OrganizationEvent.objects.select_for_update(of=('self',)).filter(id__in=freed).order_by('id').select_related('organization')
+    )
+
+
+def _fill_freed_spots(events):
+    """Hand spots freed by deleted 'going' RSVPs to the waitlists while the event locks are held."""
+    waitlisted = set(EventWaitlistEntry.objects.filter(event__in=events).values_list('event_id', flat=True))
+    for event in events:
+        if event.id in waitlisted:
+            promote_from_waitlist(event)
+
+
+BULK_TARGETS = {
+    'users': BulkTarget(
+        User,
+        fields={
+            'isActive': ('is_active', _parse_bool),
+            'yearLevel': ('year_level', _parse_year_level),
+            'course': ('course', _parse_course),
+        },
+        deactivate={'is_active': False},
+        protect=_protect_current_user,
+        before_delete=list,
+        after_delete=delete_auth_users,
+    ),
+    'organizations': BulkTarget(
+        Organization,
+        fields={'isPublic': ('is_public', _parse_bool)},
+    ),
+    'members': BulkTarget(
+        OrganizationMember,
+        fields={
+            'role': ('role', _parse_choice(ROLE_CHOICES)),
+            'isApproved': ('is_approved', _parse_bool),
+        },
+        notify=_notify_members,
+        before_update=_count_approval_change,
+    ),
+    'events': BulkTarget(
+        OrganizationEvent,
+        fields={
+            'cancelled': ('cancelled', _parse_bool),
+            'activityType': ('activity_type', _parse_choice(OrganizationEvent._meta.get_field('activity_type').choices)),
+            'location': ('location', _parse_text),
+        },
+        deactivate={'cancelled': True},
+        notify=_notify_cancelled_events,
+    ),
+    'rsvps': BulkTarget(
+        EventRSVP,
+        before_delete=_lock_events_with_freed_spots,
+        after_chunk_delete=_fill_freed_spots,
+    ),
+    'programs': BulkTarget(Program),
+}
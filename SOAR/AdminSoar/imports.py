@@ -0,0 +1,285 @@
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import IntegrityError, transaction
+
+from SOAR.accounts.models import User
+from SOAR.organization.models import Program
+from SOAR.organization.services import ProgramStats
+from SOAR.supabase_client import create_supabase_auth_client, get_supabase_admin_client
+from .rollups import count_registrations
+
+# Largest file accepted in one request; split bigger classes into several files
+MAX_IMPORT_ROWS = 5000
+
+# Supabase sign-ups run in parallel, but never more than this many at once
+AUTH_CONCURRENCY = 8
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+ROLES = ('student', 'staff', 'admin')
+
+
+def parse_import_file(upload, fmt=None):
+    """Read an uploaded CSV or JSONL file into a list of row dicts.
+
+    Column names match the single-user API (email, firstName, lastName,
+    password, role, course, yearLevel, studentId). The format is taken from
+    `fmt` or the file extension. Raises ValueError for unreadable files.
+    """
+    fmt = (fmt or upload.name.rsplit('.', 1)[-1]).lower()
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig')
+    if fmt == 'csv':
+        rows = list(csv.DictReader(text))
+    else:
+        rows = []
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                raise ValueError(f"Line {number} is not valid JSON")
+            if not isinstance(row, dict):
+                raise ValueError(f"Line {number} is not a JSON object")
+            rows.append(row)
+
+    if not rows:
+        raise ValueError("The file contains no rows")
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise ValueError(f"Too many rows: at most {MAX_IMPORT_ROWS} can be imported at once")
+    return rows
+
+
+def _text(row, key):
+    value = row.get(key)
+    return str(value).strip() if value is not None else ''
+
+
+def validate_rows(rows):
+    """Validate every row in one pass.
+
+    Existing emails, usernames and student IDs are loaded with one query
+    each, and programs with a single lookup dict, so validation cost does not
+    depend on per-row queries. Returns a list of dicts holding either the
+    cleaned fields or an `errors` dict.
+    """
+    emails = {_text(row, 'email') for row in rows} - {''}
+    usernames = {email.split('@')[0] for email in emails}
+    student_ids = {_text(row, 'studentId') for row in rows} - {''}
+
+    taken_emails = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+    taken_student_ids = set(User.objects.filter(student_id__in=student_ids).values_list('student_id', flat=True))
+
+    # Same precedence as the single-user API: abbreviation first, then name
+    all_programs = list(Program.objects.all())
+    programs = {program.name: program for program in all_programs}
+    programs.update({program.abbreviation: program for program in all_programs})
+
+    results = []
+    for number, row in enumerate(rows, start=1):
+        errors = {}
+        email = _text(row, 'email')
+        first_name = _text(row, 'firstName')
+        last_name = _text(row, 'lastName')
+        password = row.get('password') or ''
+        role = _text(row, 'role').lower()
+        course = _text(row, 'course')
+        student_id = _text(row, 'studentId')
+        year_level = _text(row, 'yearLevel')
+
+        if not email:
+            errors['email'] = 'Email is required.'
+        elif email in taken_emails:
+            errors['email'] = 'Email already exists.'
+        elif email.split('@')[0] in taken_usernames:
+            errors['email'] = 'A user with this username already exists.'
+        if not first_name:
+            errors['firstName'] = 'First name is required.'
+        if not last_name:
+            errors['lastName'] = 'Last name is required.'
+        if not password:
+            errors['password'] = 'Password is required for new users.'
+        if not role:
+            errors['role'] = 'Role is required.'
+        elif role not in ROLES:
+            errors['role'] = 'Invalid role. Must be student, staff, or admin.'
+        if course and course not in programs:
+            errors['course'] = 'Program not found.'
+        if student_id and student_id in taken_student_ids:
+            errors['studentId'] = 'School ID already exists.'
+        if year_level:
+            try:
+                year_level = int(year_level)
+            except ValueError:
+                errors['yearLevel'] = 'Year level must be a number.'
+
+        result = {'row': number, 'email': email}
+        if errors:
+            result['errors'] = errors
+        else:
+            # Later rows in the same file must not reuse these values
+            taken_emails.add(email)
+            taken_usernames.add(email.split('@')[0])
+            if student_id:
+                taken_student_ids.add(student_id)
+            result['fields'] = {
+                'email': email,
+                'password': password,
+                'username': email.split('@')[0],
+                'first_name': first_name,
+                'last_name': last_name,
+                'student_id': student_id or None,
+                'course': programs.get(course),
+                'year_level': year_level or None,
+                'is_superuser': role == 'admin',
+                'is_staff': role in ('admin', 'staff'),
+            }
+        results.append(result)
+    return results
+
+
+def _auth_user_id(response):
+    """Pull the new user's id out of the shapes supabase-py returns from sign_up."""
+    user = getattr(response, 'user', None)
+    if user is None and isinstance(response, dict):
+        user = response.get('user') or (response.get('data') or {}).get('user')
+    if user is None:
+        return None
+    return getattr(user, 'id', None) or (user.get('id') if isinstance(user, dict) else None)
+
+
+def _sign_up(fields):
+    """Create the Supabase auth account for one row; returns (user id, error message)."""
+    client = create_supabase_auth_client()
+    if not client:
+        return None, 'Supabase service is not available.'
+    try:
+        response = client.auth.sign_up({'email': fields['email'], 'password': fields['password']})
+    except Exception as e:
+        message = str(e)
+        if 'already registered' in message.lower() or 'already exists' in message.lower():
+            return None, 'An account with this email already exists.'
+        return None, f'Supabase registration failed: {message}'
+    user_id = _auth_user_id(response)
+    if not user_id:
+        return None, 'Failed to create user in authentication system.'
+    return str(user_id), None
+
+
+def _build_user(user_id, fields):
+    user = User(id=user_id, is_active=False)
+    for name, value in fields.items():
+        if name != 'password':
+            setattr(user, name, value)
+    user.set_unusable_password()
+    return user
+
+
+def delete_auth_users(user_ids):
+    """Remove users from Supabase auth, e.g. once their local rows are gone or could not be written."""
+    def delete(user_id):
+        try:
+            get_supabase_admin_client().auth.admin.delete_user(str(user_id), should_soft_delete=False)
+        except Exception as e:
+            # The user might not exist in Supabase; there is no local row to keep in step with it
+            print(f"Warning: Could not delete user {user_id} from Supabase auth: {str(e)}")
+
+    with ThreadPoolExecutor(max_workers=AUTH_CONCURRENCY) as pool:
+        list(pool.map(delete, user_ids))
+
+
+def _write_users(users):
+    """Insert `users`, updating rows an auth hook already inserted; returns the users that were created."""
+    existing = {
+        str(pk) for pk in User.objects.filter(pk__in=[user.pk for user in users]).values_list('pk', flat=True)
+    }
+    to_update = [user for user in users if user.pk in existing]
+    to_create = [user for user in users if user.pk not in existing]
+    User.objects.bulk_create(to_create, batch_size=500)
+    if to_update:
+        User.objects.bulk_update(to_update, [
+            'username', 'email', 'first_name', 'last_name', 'student_id', 'course',
+            'year_level', 'is_superuser', 'is_staff', 'is_active', 'password'
+        ], batch_size=500)
+    return to_create
+
+
+def _save_users(users):
+    """Write the imported users locally; returns {user id: error} for the ones that could not be saved.
+
+    All users go in one batch. If that hits a unique constraint (e.g. a
+    sign-up took an email or school ID after validation), each user is
+    retried on its own so only the conflicting rows fail.
+    """
+    failed = {}
+    try:
+        with transaction.atomic():
+            created = _write_users(users)
+    except IntegrityError:
+        created = []
+        for user in users:
+            try:
+                with transaction.atomic():
+                    created.extend(_write_users([user]))
+            except IntegrityError:
+                failed[user.pk] = 'Could not save the user: the email, username or school ID is already taken.'
+    # bulk_create() skips the post_save rollup signal
+    count_registrations(created)
+    return failed
+
+
+def import_users(rows, dry_run=False, concurrency=None):
+    """Validate and create users from parsed import rows.
+
+    Auth accounts are created in Supabase with at most `concurrency`
+    (default AUTH_CONCURRENCY) requests in flight; the local users are then written with one
+    bulk_create. Auth accounts whose local row could not be written are
+    deleted again. Returns a per-row report; with `dry_run` nothing is created.
+    """
+    results = validate_rows(rows)
+    valid = [result for result in results if 'fields' in result]
+
+    if not dry_run and valid:
+        with ThreadPoolExecutor(max_workers=concurrency or AUTH_CONCURRENCY) as pool:
+            outcomes = list(pool.map(lambda result: _sign_up(result['fields']), valid))
+
+        new_users = []
+        for result, (user_id, error) in zip(valid, outcomes):
+            if error:
+                result['errors'] = {'email': error}
+            else:
+                result['id'] = user_id
+                new_users.append(_build_user(user_id, result['fields']))
+
+        failed = _save_users(new_users)
+        # bulk_create() sends no post_save either, and new students feed the program counts
+        transaction.on_commit(ProgramStats.invalidate)
+        for result in valid:
+            if result.get('id') in failed:
+                result['errors'] = {'email': failed[result['id']]}
+        # Otherwise these auth accounts would block the emails without a local user
+        delete_auth_users(list(failed))
+
+    report = []
+    for result in results:
+        row = {'row': result['row'], 'email': result['email']}
+        if 'errors' in result:
+            row.update(status='error', errors=result['errors'])
+        elif dry_run:
+            row['status'] = 'valid'
+        else:
+            row.update(status='created', id=result['id'])
+        report.append(row)
+
+    created = sum(1 for row in report if row['status'] == 'created')
+    failed = sum(1 for row in report if row['status'] == 'error')
+    return {
+        'summary': {'total': len(report), 'created': created, 'failed': failed, 'dryRun': dry_run},
+        'results': report,
+    }
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from SOAR.AdminSoar.rollups import rebuild_rollups
+
+class Command(BaseCommand):
+    help = 'Recompute the admin dashboard rollup tables from source rows, optionally for a date range only'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD); defaults to the beginning')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD); defaults to today and later')
+
+    def _parse(self, value, option):
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f'--{option} must be a date in YYYY-MM-DD format, got "{value}"')
+        return day
+
+    def handle(self, *args, **options):
+        start = self._parse(options['start'], 'start')
+        end = self._parse(options['end'], 'end')
+        if start and end and start > end:
+            raise CommandError('--start must not be after --end')
+
+        rebuild_rollups(start, end)
+
+        span = f"{start or 'beginning'} to {end or 'now'}"
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt admin rollups for {span}'))
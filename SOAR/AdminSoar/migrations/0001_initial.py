@@ -0,0 +1,63 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('organization', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRegistrationStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRSVPStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day', 'status'],
+                'unique_together': {('day', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='OrganizationMemberStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('member_count', models.IntegerField(default=0)),
+                ('approved_count', models.IntegerField(default=0)),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='member_stat', to='organization.organization')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OrganizationMonthlyEventStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('count', models.IntegerField(default=0)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_event_stats', to='organization.organization')),
+            ],
+            options={
+                'ordering': ['month'],
+                'indexes': [models.Index(fields=['month'], name='orgeventstat_month_idx')],
+                'unique_together': {('organization', 'month')},
+            },
+        ),
+    ]
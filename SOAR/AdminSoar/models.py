@@ -1,3 +1,53 @@
 from django.db import models
 
-# Create your models here.
+# Rollup tables for the admin dashboard. They are kept up to date by
+# SOAR.AdminSoar.signals and can be rebuilt with `manage.py rebuild_admin_rollups`.
+
+
+class DailyRegistrationStat(models.Model):
+    day = models.DateField(unique=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day}: {self.count} registration(s)"
+
+
+class OrganizationMonthlyEventStat(models.Model):
+    organization = models.ForeignKey('organization.Organization', on_delete=models.CASCADE, related_name='monthly_event_stats')
+    month = models.DateField(help_text="First day of the month")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('organization', 'month')
+        ordering = ['month']
+        indexes = [
+            models.Index(fields=['month'], name='orgeventstat_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.organization_id} {self.month:%Y-%m}: {self.count} event(s)"
+
+
+class DailyRSVPStat(models.Model):
+    day = models.DateField()
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('day', 'status')
+        ordering = ['day', 'status']
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.count} RSVP(s)"
+
+
+class OrganizationMemberStat(models.Model):
+    organization = models.OneToOneField('organization.Organization', on_delete=models.CASCADE, related_name='member_stat')
+    member_count = models.IntegerField(default=0)
+    approved_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.organization_id}: {self.approved_count}/{self.member_count} approved"
@@ -0,0 +1,40 @@
+from functools import wraps
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+
+# Admin access is decided from the Django user row (request.user), never from
+# a Supabase REST call. The row is loaded on every request anyway, so the flags
+# are not cached anywhere and revoked access takes effect on the next request.
+
+
+def get_admin_access(request):
+    """Return {'is_superuser': bool, 'is_staff': bool} for the request's user."""
+    user = request.user
+    if not user.is_authenticated:
+        return {'is_superuser': False, 'is_staff': False}
+    return {'is_superuser': user.is_superuser, 'is_staff': user.is_staff}
+
+
+def is_admin(request, superuser=False):
+    """True if the request's user may use the admin panel (superusers only with `superuser=True`)."""
+    access = get_admin_access(request)
+    if superuser:
+        return access['is_superuser']
+    return access['is_superuser'] or access['is_staff']
+
+
+def admin_required(view_func=None, superuser=False):
+    """Decorator for admin API views: log-in required, then a JSON 403 for non-admins."""
+    def decorator(func):
+        @login_required
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            if not is_admin(request, superuser=superuser):
+                return JsonResponse({'error': 'Unauthorized'}, status=403)
+            return func(request, *args, **kwargs)
+        return wrapper
+
+    if view_func is not None:
+        return decorator(view_func)
+    return decorator
@@ -0,0 +1,184 @@
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Q
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from SOAR.accounts.models import User
+from SOAR.event.models import OrganizationEvent, EventRSVP
+from SOAR.organization.models import OrganizationMember
+from .models import DailyRegistrationStat, OrganizationMonthlyEventStat, DailyRSVPStat, OrganizationMemberStat
+
+
+def local_day(value):
+    """Calendar day of a datetime in the project timezone, matching TruncDate."""
+    if timezone.is_naive(value):
+        # Naive values are saved as project-timezone times, so read them the same way
+        value = timezone.make_aware(value)
+    return timezone.localtime(value).date()
+
+
+def month_start(value):
+    """First day of the month of a datetime, matching TruncMonth."""
+    return local_day(value).replace(day=1)
+
+
+_batch = threading.local()
+
+
+@contextmanager
+def batched_rollups():
+    """Collect bump() calls and apply them merged per rollup row on exit.
+
+    Bulk deletes send one signal per cascaded row; inside this block they
+    cost one UPDATE per distinct rollup row instead. Use it inside the
+    transaction doing the writes. Nested blocks join the outermost one.
+    """
+    if getattr(_batch, 'pending', None) is not None:
+        yield
+        return
+    _batch.pending = defaultdict(Counter)
+    try:
+        yield
+        pending = _batch.pending
+    finally:
+        _batch.pending = None
+    for (model, keys), deltas in pending.items():
+        bump(model, dict(keys), **deltas)
+
+
+def bump(model, keys, **deltas):
+    """Add `deltas` to the counters of the rollup row identified by `keys`, creating it if needed.
+
+    Inside a transaction the write waits for the commit. Every RSVP or
+    sign-up of the day hits the same rollup row, and writing it in the
+    caller's transaction would serialize those transactions on its lock.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    pending = getattr(_batch, 'pending', None)
+    if pending is not None:
+        pending[(model, tuple(sorted(keys.items())))].update(deltas)
+        return
+    # robust: a failed counter write is logged rather than failing a committed request
+    transaction.on_commit(lambda: _apply_bump(model, keys, deltas), robust=True)
+
+
+def _apply_bump(model, keys, deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**keys).update(**changes):
+        return
+    if any(delta < 0 for delta in deltas.values()):
+        # Nothing to decrement (e.g. the row was removed by a cascade); a rebuild fixes any drift
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **deltas)
+    except IntegrityError:
+        # Another transaction created the row first
+        model.objects.filter(**keys).update(**changes)
+
+
+def count_registrations(users):
+    """Add users written with bulk_create(), which sends no post_save, to the registration rollup."""
+    days = Counter(local_day(user.date_joined) for user in users)
+    for day, count in days.items():
+        bump(DailyRegistrationStat, {'day': day}, count=count)
+
+
+def _day_bounds(start, end):
+    """Aware datetimes covering the local days start..end inclusive (either may be None)."""
+    tz = timezone.get_current_timezone()
+    lower = timezone.make_aware(datetime.combine(start, time.min), tz) if start else None
+    upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz) if end else None
+    return lower, upper
+
+
+def _range_filter(field, lower, upper):
+    q = Q()
+    if lower:
+        q &= Q(**{f'{field}__gte': lower})
+    if upper:
+        q &= Q(**{f'{field}__lt': upper})
+    return q
+
+
+def _rebuild_registrations(start, end):
+    lower, upper = _day_bounds(start, end)
+    DailyRegistrationStat.objects.filter(_range_filter('day', start, end and end + timedelta(days=1))).delete()
+    rows = User.objects.filter(_range_filter('date_joined', lower, upper)).annotate(
+        day=TruncDate('date_joined')
+    ).values('day').annotate(total=Count('id')).order_by()
+    DailyRegistrationStat.objects.bulk_create([
+        DailyRegistrationStat(day=row['day'], count=row['total']) for row in rows
+    ])
+
+
+def _rebuild_rsvps(start, end):
+    lower, upper = _day_bounds(start, end)
+    DailyRSVPStat.objects.filter(_range_filter('day', start, end and end + timedelta(days=1))).delete()
+    rows = EventRSVP.objects.filter(_range_filter('date_created', lower, upper)).annotate(
+        day=TruncDate('date_created')
+    ).values('day', 'status').annotate(total=Count('id')).order_by()
+    DailyRSVPStat.objects.bulk_create([
+        DailyRSVPStat(day=row['day'], status=row['status'], count=row['total']) for row in rows
+    ])
+
+
+def _rebuild_monthly_events(start, end):
+    # Whole months are rebuilt, widening the range to month boundaries
+    first = start.replace(day=1) if start else None
+    after = (end.replace(day=1) + timedelta(days=32)).replace(day=1) if end else None
+    lower, upper = _day_bounds(first, after and after - timedelta(days=1))
+    OrganizationMonthlyEventStat.objects.filter(_range_filter('month', first, after)).delete()
+    rows = OrganizationEvent.objects.filter(_range_filter('event_date', lower, upper)).annotate(
+        month=TruncMonth('event_date', output_field=DateField())
+    ).values('organization_id', 'month').annotate(total=Count('id')).order_by()
+    OrganizationMonthlyEventStat.objects.bulk_create([
+        OrganizationMonthlyEventStat(
+            organization_id=row['organization_id'],
+            month=row['month'],
+            count=row['total']
+        )
+        for row in rows
+    ])
+
+
+def _rebuild_member_stats():
+    OrganizationMemberStat.objects.all().delete()
+    rows = OrganizationMember.objects.values('organization_id').annotate(
+        total=Count('id'),
+        approved=Count('id', filter=Q(is_approved=True))
+    ).order_by()
+    OrganizationMemberStat.objects.bulk_create([
+        OrganizationMemberStat(
+            organization_id=row['organization_id'],
+            member_count=row['total'],
+            approved_count=row['approved']
+        )
+        for row in rows
+    ])
+
+
+def rebuild_rollups(start=None, end=None):
+    """Recompute the rollup tables from source rows for the days start..end (inclusive).
+
+    Either bound may be None for an open range. Event rollups are rebuilt for
+    every month the range touches; member totals are not dated and are
+    always rebuilt in full. Run inside a transaction so readers never see a
+    half-rebuilt range.
+    """
+    if isinstance(start, datetime) or isinstance(end, datetime):
+        raise TypeError("rebuild_rollups() expects dates, not datetimes")
+    if start and end and start > end:
+        raise ValueError("start must not be after end")
+    with transaction.atomic():
+        _rebuild_registrations(start, end)
+        _rebuild_rsvps(start, end)
+        _rebuild_monthly_events(start, end)
+        _rebuild_member_stats()
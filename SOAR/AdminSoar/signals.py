@@ -0,0 +1,111 @@
+# AdminSoar/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from SOAR.accounts.models import User
+from SOAR.event.models import OrganizationEvent, EventRSVP
+from SOAR.organization.models import OrganizationMember
+from .models import DailyRegistrationStat, OrganizationMonthlyEventStat, DailyRSVPStat, OrganizationMemberStat
+from .rollups import bump, local_day, month_start
+
+# Rollup counters are adjusted once the row change commits (see rollups.bump()).
+# Writes that bypass signals (queryset.update(), raw SQL) drift until
+# `manage.py rebuild_admin_rollups` is run for the affected dates.
+
+
+@receiver(post_save, sender=User)
+def count_registration(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        bump(DailyRegistrationStat, {'day': local_day(instance.date_joined)}, count=1)
+
+
+@receiver(post_delete, sender=User)
+def uncount_registration(sender, instance, **kwargs):
+    bump(DailyRegistrationStat, {'day': local_day(instance.date_joined)}, count=-1)
+
+
+def _event_key(organization_id, event_date):
+    return {'organization_id': organization_id, 'month': month_start(event_date)}
+
+
+@receiver(pre_save, sender=OrganizationEvent)
+def remember_event_rollup_key(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    previous = OrganizationEvent.objects.filter(pk=instance.pk).values_list('organization_id', 'event_date').first()
+    instance._rollup_key = _event_key(*previous) if previous else None
+
+
+@receiver(post_save, sender=OrganizationEvent)
+def count_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    key = _event_key(instance.organization_id, instance.event_date)
+    previous = None if created else getattr(instance, '_rollup_key', None)
+    if previous != key:
+        if previous:
+            bump(OrganizationMonthlyEventStat, previous, count=-1)
+        bump(OrganizationMonthlyEventStat, key, count=1)
+
+
+@receiver(post_delete, sender=OrganizationEvent)
+def uncount_event(sender, instance, **kwargs):
+    bump(OrganizationMonthlyEventStat, _event_key(instance.organization_id, instance.event_date), count=-1)
+
+
+@receiver(pre_save, sender=EventRSVP)
+def remember_rsvp_rollup_status(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if not hasattr(instance, '_loaded_status'):
+        instance._loaded_status = EventRSVP.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+    instance._rollup_status = instance._loaded_status
+
+
+@receiver(post_save, sender=EventRSVP)
+def count_rsvp(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    day = local_day(instance.date_created)
+    previous_status = None if created else getattr(instance, '_rollup_status', None)
+    if previous_status != instance.status:
+        if previous_status:
+            bump(DailyRSVPStat, {'day': day, 'status': previous_status}, count=-1)
+        bump(DailyRSVPStat, {'day': day, 'status': instance.status}, count=1)
+
+
+@receiver(post_delete, sender=EventRSVP)
+def uncount_rsvp(sender, instance, **kwargs):
+    status = getattr(instance, '_loaded_status', instance.status)
+    bump(DailyRSVPStat, {'day': local_day(instance.date_created), 'status': status}, count=-1)
+
+
+@receiver(pre_save, sender=OrganizationMember)
+def remember_member_rollup_state(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._rollup_state = OrganizationMember.objects.filter(pk=instance.pk).values_list(
+        'organization_id', 'is_approved'
+    ).first()
+
+
+@receiver(post_save, sender=OrganizationMember)
+def count_member(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = (instance.organization_id, instance.is_approved)
+    previous = None if created else getattr(instance, '_rollup_state', None)
+    if previous == current:
+        return
+    if previous:
+        bump(OrganizationMemberStat, {'organization_id': previous[0]}, member_count=-1, approved_count=-int(previous[1]))
+    bump(OrganizationMemberStat, {'organization_id': current[0]}, member_count=1, approved_count=int(current[1]))
+
+
+@receiver(post_delete, sender=OrganizationMember)
+def uncount_member(sender, instance, **kwargs):
+    bump(
+        OrganizationMemberStat,
+        {'organization_id': instance.organization_id},
+        member_count=-1,
+        approved_count=-int(instance.is_approved)
+    )
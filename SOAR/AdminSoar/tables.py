@@ -0,0 +1,221 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+
+# Server-side protocol shared by the admin data tables.
+#
+# Query parameters:
+#   page, page_size   offset paging (page is 1-based)
+#   cursor            keyset paging; pass an empty cursor for the first page,
+#                     then the `nextCursor` of the previous response
+#   sort              column key, prefixed with "-" for descending order
+#   filter[<key>]     per-column filter
+#   search            global search over the searchable columns
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Filtered counts stop at this many rows; past it the planner's estimate is reported
+EXACT_COUNT_LIMIT = 10000
+
+
+class Column:
+    """One column of an admin table.
+
+    `field` is the ORM path used for sorting and filtering (None for display-only
+    columns). `filter` is 'exact', 'icontains' or a callable taking the raw
+    value and returning a Q object (or raising ValueError). Columns with
+    `search=True` take part in the global search. Keyset paging is only offered
+    on non-nullable columns, since NULLs cannot be compared.
+    """
+
+    def __init__(self, key, field=None, sortable=True, filter=None, search=False, nullable=False):
+        self.key = key
+        self.field = field
+        self.sortable = sortable and field is not None
+        self.filter = filter
+        self.search = search
+        self.nullable = nullable
+
+    def filter_q(self, value):
+        if callable(self.filter):
+            return self.filter(value)
+        return Q(**{f'{self.field}__{self.filter}': value})
+
+
+class Table:
+    """A list endpoint described as columns plus a row serializer."""
+
+    def __init__(self, columns, default_sort, serialize):
+        self.columns = {column.key: column for column in columns}
+        self.default_sort = default_sort
+        self.serialize = serialize
+
+    def _ordering(self, sort):
+        descending = sort.startswith('-')
+        column = self.columns.get(sort.lstrip('-'))
+        if column is None or not column.sortable:
+            raise ValueError(f"Cannot sort by: {sort}")
+        return column, descending
+
+    def _filtered(self, queryset, params):
+        for name, value in params.items():
+            if not (name.startswith('filter[') and name.endswith(']')) or value == '':
+                continue
+            column = self.columns.get(name[len('filter['):-1])
+            if column is None or column.filter is None:
+                raise ValueError(f"Cannot filter by: {name}")
+            queryset = queryset.filter(column.filter_q(value))
+
+        term = (params.get('search') or '').strip()
+        if term:
+            q = Q()
+            for column in self.columns.values():
+                if column.search:
+                    q |= Q(**{f'{column.field}__icontains': term})
+            queryset = queryset.filter(q)
+        return queryset
+
+    def apply(self, queryset, params):
+        """Return `queryset` filtered, searched and sorted as the request asks.
+
+        Also returns the sort column and direction. Raises ValueError for
+        unknown columns or filter values.
+        """
+        column, descending = self._ordering(params.get('sort') or self.default_sort)
+        queryset = self._filtered(queryset, params)
+        prefix = '-' if descending else ''
+        return queryset.order_by(f'{prefix}{column.field}', f'{prefix}pk'), column, descending
+
+    def page(self, queryset, params):
+        """Return one page of `queryset` as the JSON-ready protocol response.
+
+        Raises ValueError for unknown columns, bad page numbers and malformed
+        cursors, which views report as 400 responses.
+        """
+        size = parse_page_size(params.get('page_size'))
+        queryset, column, descending = self.apply(queryset, params)
+        total, estimated = count_rows(queryset)
+
+        response = {'total': total, 'totalIsEstimate': estimated, 'pageSize': size}
+        if 'cursor' in params:
+            if column.nullable:
+                raise ValueError(f"Cursor paging is not available when sorting by: {column.key}")
+            cursor = params.get('cursor')
+            if cursor:
+                value, pk = decode_cursor(cursor, queryset, column.field)
+                after = '__lt' if descending else '__gt'
+                queryset = queryset.filter(
+                    Q(**{f'{column.field}{after}': value}) |
+                    Q(**{column.field: value, f'pk{after}': pk})
+                )
+            rows = list(queryset[:size + 1])
+            has_next = len(rows) > size
+            rows = rows[:size]
+            response['nextCursor'] = encode_cursor(rows[-1], column.field) if has_next else None
+        else:
+            page = parse_page_number(params.get('page'))
+            offset = (page - 1) * size
+            rows = list(queryset[offset:offset + size + 1])
+            has_next = len(rows) > size
+            rows = rows[:size]
+            response['page'] = page
+
+        response['hasNext'] = has_next
+        response['data'] = [self.serialize(row) for row in rows]
+        return response
+
+
+def choice_filter(choices):
+    """Filter for a column with a fixed set of values.
+
+    `choices` maps each lowercase value to a Q object; the request may pass
+    several values separated by commas.
+    """
+    def build(value):
+        q = Q()
+        for choice in value.lower().split(','):
+            choice = choice.strip()
+            if choice not in choices:
+                raise ValueError(f"Unknown filter value: {choice}")
+            q |= choices[choice]
+        return q
+    return build
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Parse a requested page size, falling back to `default` and capping at MAX_PAGE_SIZE."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def parse_page_number(value):
+    if value in (None, ''):
+        return 1
+    try:
+        page = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid page number")
+    if page < 1:
+        raise ValueError("Invalid page number")
+    return page
+
+
+def _lookup_value(obj, path):
+    for part in path.split('__'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _lookup_field(model, path):
+    parts = path.split('__')
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(parts[-1])
+
+
+def encode_cursor(obj, field):
+    """Return an opaque cursor pointing just after `obj` in a table sorted by `field`."""
+    raw = json.dumps([_lookup_value(obj, field), obj.pk], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, queryset, field):
+    """Return the (sort value, pk) pair encoded in a cursor for `queryset` sorted by `field`.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    annotation = queryset.query.annotations.get(field)
+    output_field = annotation.output_field if annotation is not None else _lookup_field(queryset.model, field)
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return output_field.to_python(value), queryset.model._meta.pk.to_python(pk)
+    except (TypeError, ValueError, ValidationError):
+        raise ValueError("Invalid cursor")
+
+
+def _planner_estimate(queryset):
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_rows(queryset):
+    """Return (count, is_estimate) for a table query.
+
+    Counting stops after EXACT_COUNT_LIMIT rows; on PostgreSQL larger results
+    are reported from the planner's row estimate instead of a full count.
+    """
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count(), False
+    capped = queryset[:EXACT_COUNT_LIMIT + 1].count()
+    if capped <= EXACT_COUNT_LIMIT:
+        return capped, False
+    return max(_planner_estimate(queryset), capped), True
@@ -1,3 +1,707 @@
+import json
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from SOAR.event.models import OrganizationEvent, EventRSVP, EventWaitlistEntry
+from SOAR.notification.models import Notification
+from SOAR.organization.models import Organization, OrganizationMember, Program
+from SOAR.organization.services import ProgramStats
+from SOAR.supabase_client import override_supabase_client
+from .models import DailyRegistrationStat, OrganizationMonthlyEventStat, DailyRSVPStat, OrganizationMemberStat
+from .rollups import local_day, month_start, rebuild_rollups
+from .tables import count_rows
+from .imports import validate_rows
 
-# Create your tests here.
+User = get_user_model()
+
+
+class AnalyticsAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.student = User.objects.create_user(username='student', password='testpass123')
+        User.objects.filter(id=self.student.id).update(date_joined=timezone.now() - timedelta(days=62))
+
+        sports = Organization.objects.create(name='Sports Club', tags=['SPORTS'])
+        Organization.objects.create(name='Dance Troupe', tags=['Cultural', 'sports'])
+        Organization.objects.create(name='Chess Club', tags=['Special'])
+        Organization.objects.create(name='Math Society')
+
+        for activity_type in ['workshop', 'workshop', 'social']:
+            event = OrganizationEvent.objects.create(
+                organization=sports,
+                title=f'{activity_type} event',
+                event_date=timezone.now() + timedelta(days=1),
+                activity_type=activity_type
+            )
+        EventRSVP.objects.create(event=event, user=self.student, status='going')
+        # date_joined was moved with update(), which bypasses the rollup signals
+        rebuild_rollups()
+
+    def test_aggregates(self):
+        """Test that totals and breakdowns are computed server-side"""
+        self.client.login(username='admin', password='testpass123')
+        data = self.client.get(reverse('api_analytics')).json()['data']
+
+        self.assertEqual(data['totals'], {'users': 2, 'organizations': 4, 'events': 3, 'rsvps': 1})
+        self.assertEqual(
+            data['organizationTypes'],
+            {'Sports': 2, 'Academic': 1, 'Special Interest': 1}
+        )
+        self.assertEqual(data['eventTypes'], {'Workshop': 2, 'Social Event': 1})
+        self.assertEqual(sum(row['count'] for row in data['registrations']), 2)
+        self.assertEqual(len(data['registrations']), 2)
+        self.assertEqual(len(data['recentEvents']), 3)
+
+    def test_results_are_cached(self):
+        """Test that repeat requests are served from the cache"""
+        self.client.login(username='admin', password='testpass123')
+        url = reverse('api_analytics')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            OrganizationEvent.objects.all().delete()
+
+        with self.assertNumQueries(2):  # session + user only
+            data = self.client.get(url).json()['data']
+        self.assertEqual(data['totals']['events'], 3)
+
+        data = self.client.get(url, {'refresh': '1'}).json()['data']
+        self.assertEqual(data['totals']['events'], 0)
+
+    def test_requires_staff(self):
+        """Test that non-admin users cannot read analytics"""
+        self.client.login(username='student', password='testpass123')
+        self.assertEqual(self.client.get(reverse('api_analytics')).status_code, 403)
+
+
+class RollupTestCase(TestCase):
+    def setUp(self):
+        # Rollup counters are written once the change commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username='student', password='testpass123')
+            self.org = Organization.objects.create(name='Sports Club')
+            self.event = OrganizationEvent.objects.create(
+                organization=self.org,
+                title='Tryouts',
+                event_date=timezone.now() + timedelta(days=1)
+            )
+
+    def _count(self, model, **keys):
+        return model.objects.filter(**keys).values_list('count', flat=True).first()
+
+    def test_registrations_follow_user_changes(self):
+        """Test that creating and deleting users adjusts the daily registration count"""
+        today = local_day(timezone.now())
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='second', password='testpass123')
+        self.assertEqual(self._count(DailyRegistrationStat, day=today), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertEqual(self._count(DailyRegistrationStat, day=today), 1)
+
+    def test_event_moves_between_months(self):
+        """Test that rescheduling an event moves it to the new month"""
+        old_month = month_start(self.event.event_date)
+        self.event.event_date += timedelta(days=40)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        new_month = month_start(self.event.event_date)
+
+        self.assertEqual(self._count(OrganizationMonthlyEventStat, organization=self.org, month=old_month), 0)
+        self.assertEqual(self._count(OrganizationMonthlyEventStat, organization=self.org, month=new_month), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertEqual(self._count(OrganizationMonthlyEventStat, organization=self.org, month=new_month), 0)
+
+    def test_rsvp_status_changes(self):
+        """Test that RSVP status changes move the count between statuses"""
+        today = local_day(timezone.now())
+        with self.captureOnCommitCallbacks(execute=True):
+            rsvp = EventRSVP.objects.create(event=self.event, user=self.user, status='going')
+            rsvp.status = 'not_going'
+            rsvp.save()
+
+        self.assertEqual(self._count(DailyRSVPStat, day=today, status='going'), 0)
+        self.assertEqual(self._count(DailyRSVPStat, day=today, status='not_going'), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rsvp.delete()
+        self.assertEqual(self._count(DailyRSVPStat, day=today, status='not_going'), 0)
+
+    def test_member_counts(self):
+        """Test that joining, approval and leaving update the member totals"""
+        with self.captureOnCommitCallbacks(execute=True):
+            member = OrganizationMember.objects.create(organization=self.org, student=self.user)
+        stat = OrganizationMemberStat.objects.get(organization=self.org)
+        self.assertEqual((stat.member_count, stat.approved_count), (1, 0))
+
+        member.is_approved = True
+        with self.captureOnCommitCallbacks(execute=True):
+            member.save()
+        stat.refresh_from_db()
+        self.assertEqual((stat.member_count, stat.approved_count), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            member.delete()
+        stat.refresh_from_db()
+        self.assertEqual((stat.member_count, stat.approved_count), (0, 0))
+
+    def test_organization_delete_cascades(self):
+        """Test that deleting an organization does not recreate its rollup rows"""
+        OrganizationMember.objects.create(organization=self.org, student=self.user, is_approved=True)
+        self.org.delete()
+        self.assertFalse(OrganizationMonthlyEventStat.objects.exists())
+        self.assertFalse(OrganizationMemberStat.objects.exists())
+
+    def test_rebuild_command_repairs_range(self):
+        """Test that the rebuild command fixes drift only inside the given range"""
+        today = local_day(timezone.now())
+        old_day = today - timedelta(days=30)
+        DailyRegistrationStat.objects.filter(day=today).update(count=99)
+        DailyRegistrationStat.objects.create(day=old_day, count=5)
+
+        out = StringIO()
+        call_command('rebuild_admin_rollups', start=today.isoformat(), end=today.isoformat(), stdout=out)
+
+        self.assertIn('Rebuilt admin rollups', out.getvalue())
+        self.assertEqual(self._count(DailyRegistrationStat, day=today), 1)
+        self.assertEqual(self._count(DailyRegistrationStat, day=old_day), 5)
+
+        call_command('rebuild_admin_rollups', stdout=StringIO())
+        self.assertFalse(DailyRegistrationStat.objects.filter(day=old_day).exists())
+
+    def test_rebuild_command_rejects_bad_dates(self):
+        """Test that invalid ranges are reported as command errors"""
+        with self.assertRaises(CommandError):
+            call_command('rebuild_admin_rollups', start='yesterday')
+        with self.assertRaises(CommandError):
+            call_command('rebuild_admin_rollups', start=date(2025, 2, 1).isoformat(), end='2025-01-01')
+
+
+class AdminTableAPITestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True, is_superuser=True
+        )
+        self.client.login(username='admin', password='testpass123')
+        for i in range(5):
+            User.objects.create_user(username=f'student{i}', email=f'student{i}@example.com', password='testpass123')
+        self.org = Organization.objects.create(name='Sports Club', tags=['sports'])
+        Organization.objects.create(name='Math Society')
+        for i in range(3):
+            OrganizationEvent.objects.create(
+                organization=self.org,
+                title=f'Event {i}',
+                event_date=timezone.now() + timedelta(days=i + 1),
+                activity_type='workshop' if i else 'social'
+            )
+
+    def test_offset_paging(self):
+        """Test that pages are sliced server-side with a total count"""
+        url = reverse('api_users')
+        data = self.client.get(url, {'page_size': 4, 'sort': 'email'}).json()
+        self.assertEqual(data['total'], 6)
+        self.assertFalse(data['totalIsEstimate'])
+        self.assertTrue(data['hasNext'])
+        self.assertEqual([row['email'] for row in data['data']][:2], ['admin@example.com', 'student0@example.com'])
+
+        data = self.client.get(url, {'page_size': 4, 'sort': 'email', 'page': 2}).json()
+        self.assertEqual(len(data['data']), 2)
+        self.assertFalse(data['hasNext'])
+
+    def test_keyset_paging(self):
+        """Test that cursor pages walk the table without gaps or repeats"""
+        url = reverse('api_users')
+        seen = []
+        params = {'page_size': 2, 'sort': '-dateJoined', 'cursor': ''}
+        while True:
+            data = self.client.get(url, params).json()
+            seen.extend(row['id'] for row in data['data'])
+            if not data['nextCursor']:
+                break
+            params['cursor'] = data['nextCursor']
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(len(set(seen)), 6)
+
+    def test_filters_and_search(self):
+        """Test that column filters and the global search are applied in SQL"""
+        data = self.client.get(reverse('api_users'), {'filter[role]': 'admin'}).json()
+        self.assertEqual([row['email'] for row in data['data']], ['admin@example.com'])
+
+        data = self.client.get(reverse('api_users'), {'search': 'student3'}).json()
+        self.assertEqual(data['total'], 1)
+
+        data = self.client.get(reverse('api_organizations'), {'filter[type]': 'sports'}).json()
+        self.assertEqual([row['orgName'] for row in data['data']], ['Sports Club'])
+
+        data = self.client.get(reverse('api_events'), {'filter[activityType]': 'workshop', 'sort': 'date'}).json()
+        self.assertEqual([row['eventName'] for row in data['data']], ['Event 1', 'Event 2'])
+
+    def test_page_query_count_is_constant(self):
+        """Test that a page costs the same number of queries however large the table is"""
+        with self.assertNumQueries(4):  # session + user + count + page
+            self.client.get(reverse('api_events'), {'page_size': 2})
+        for i in range(10):
+            OrganizationEvent.objects.create(organization=self.org, title=f'Extra {i}', event_date=timezone.now())
+        with self.assertNumQueries(4):
+            self.client.get(reverse('api_events'), {'page_size': 2})
+
+    def test_annotated_sort_with_cursor(self):
+        """Test that cursors also work on aggregated columns"""
+        url = reverse('api_organizations')
+        first = self.client.get(url, {'page_size': 1, 'sort': '-members', 'cursor': ''}).json()
+        second = self.client.get(url, {'page_size': 1, 'sort': '-members', 'cursor': first['nextCursor']}).json()
+        self.assertEqual(len(first['data'] + second['data']), 2)
+        self.assertIsNone(second['nextCursor'])
+
+    @mock.patch('SOAR.AdminSoar.tables.EXACT_COUNT_LIMIT', 3)
+    def test_large_counts_are_estimated(self):
+        """Test that counts past the exact limit are reported as estimates"""
+        total, estimated = count_rows(User.objects.all())
+        if connection.vendor == 'postgresql':
+            self.assertTrue(estimated)
+            self.assertGreaterEqual(total, 4)
+        else:
+            self.assertEqual((total, estimated), (6, False))
+
+    def test_invalid_parameters(self):
+        """Test that unknown columns and malformed cursors are rejected"""
+        url = reverse('api_users')
+        self.assertEqual(self.client.get(url, {'sort': 'password'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'filter[password]': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'page': '0'}).status_code, 400)
+
+
+class ExportAPITestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        self.student = User.objects.create_user(username='student', email='student@example.com', password='testpass123')
+        org = Organization.objects.create(name='Sports Club', tags=['sports'])
+        self.event = OrganizationEvent.objects.create(
+            organization=org, title='Tryouts', event_date=timezone.now() + timedelta(days=1)
+        )
+        EventRSVP.objects.create(event=self.event, user=self.student, status='going')
+
+    def _get(self, dataset, **params):
+        self.client.login(username='admin', password='testpass123')
+        return self.client.get(reverse('api_export', args=[dataset]), params)
+
+    def test_csv_export_streams_filtered_rows(self):
+        """Test that CSV exports stream and honour the table filters"""
+        response = self._get('users', **{'filter[role]': 'student'})
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,studentId,email,firstName,lastName,course,yearLevel,role,status,dateJoined')
+        self.assertEqual(len(lines), 2)
+        self.assertIn('student@example.com', lines[1])
+        self.assertIn(',Student,Active,', lines[1])
+
+    def test_ndjson_export(self):
+        """Test that NDJSON exports write one object per line"""
+        response = self._get('events', format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows[0]['eventName'], 'Tryouts')
+        self.assertEqual(rows[0]['status'], 'Upcoming')
+        self.assertEqual(rows[0]['going'], 1)
+
+        rows = b''.join(self._get('organizations', format='ndjson').streaming_content).decode().splitlines()
+        self.assertEqual(json.loads(rows[0])['type'], 'Sports')
+
+    def test_invalid_requests(self):
+        """Test that bad datasets, formats and filters fail before streaming"""
+        self.assertEqual(self._get('passwords').status_code, 404)
+        self.assertEqual(self._get('rsvps', format='xlsx').status_code, 400)
+        self.assertEqual(self._get('rsvps', **{'filter[status]': ''}).status_code, 200)
+        self.assertEqual(self._get('users', sort='password').status_code, 400)
+
+        self.client.login(username='student', password='testpass123')
+        self.assertEqual(self.client.get(reverse('api_export', args=['users'])).status_code, 403)
+
+
+class FakeAuth:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def sign_up(self, credentials):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.01)
+            if credentials['email'].startswith('taken'):
+                raise Exception('User already registered')
+            return SimpleNamespace(user=SimpleNamespace(id=str(uuid.uuid4())))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class FakeAuthClient:
+    def __init__(self):
+        self.auth = FakeAuth()
+
+
+class ImportUsersTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin = User.objects.create_user(
+                username='admin', email='admin@example.com', password='testpass123', is_staff=True
+            )
+            User.objects.create_user(username='existing', email='existing@example.com', student_id='S-1')
+        self.client.login(username='admin', password='testpass123')
+        Program.objects.create(abbreviation='BSIT', name='Information Technology')
+
+    def _upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(reverse('api_import_users'), {'file': upload, **data})
+
+    def test_csv_import_report(self):
+        """Test that valid rows are created in bulk and invalid rows are reported"""
+        rows = [
+            'email,firstName,lastName,password,role,course,yearLevel,studentId',
+            'new1@example.com,Ana,Cruz,pw123456,student,BSIT,1,S-2',
+            'new2@example.com,Ben,Reyes,pw123456,staff,Information Technology,,',
+            'existing@example.com,Dup,User,pw123456,student,,,',
+            'new3@example.com,Cy,Lim,pw123456,student,BSCS,1,S-1',
+            'new1@example.com,Ana,Again,pw123456,student,,,',
+            'taken@example.com,Tom,Tan,pw123456,student,,,',
+        ]
+        fake = FakeAuthClient()
+        ProgramStats.get()
+        with override_supabase_client(fake), self.captureOnCommitCallbacks(execute=True):
+            data = self._upload('freshmen.csv', '\n'.join(rows)).json()
+
+        self.assertEqual(data['summary'], {'total': 6, 'created': 2, 'failed': 4, 'dryRun': False})
+        statuses = [row['status'] for row in data['results']]
+        self.assertEqual(statuses, ['created', 'created', 'error', 'error', 'error', 'error'])
+        self.assertEqual(data['results'][2]['errors'], {'email': 'Email already exists.'})
+        self.assertEqual(set(data['results'][3]['errors']), {'course', 'studentId'})
+        self.assertEqual(data['results'][5]['errors'], {'email': 'An account with this email already exists.'})
+
+        user = User.objects.get(email='new1@example.com')
+        self.assertEqual((user.course.abbreviation, user.year_level, user.is_active), ('BSIT', 1, False))
+        self.assertEqual(User.objects.get(email='new2@example.com').course.abbreviation, 'BSIT')
+        self.assertTrue(User.objects.get(email='new2@example.com').is_staff)
+        self.assertEqual(ProgramStats.for_program(user.course_id)['student_count'], 2)
+        self.assertEqual(
+            DailyRegistrationStat.objects.get(day=local_day(timezone.now())).count,
+            User.objects.count()
+        )
+
+    def test_auth_calls_are_bounded(self):
+        """Test that Supabase sign-ups run concurrently but within the limit"""
+        rows = '\n'.join(
+            json.dumps({'email': f'student{i}@example.com', 'firstName': 'S', 'lastName': str(i),
+                        'password': 'pw123456', 'role': 'student'})
+            for i in range(20)
+        )
+        fake = FakeAuthClient()
+        with override_supabase_client(fake), mock.patch('SOAR.AdminSoar.imports.AUTH_CONCURRENCY', 4):
+            data = self._upload('class.jsonl', rows).json()
+        self.assertEqual(data['summary']['created'], 20)
+        self.assertLessEqual(fake.auth.max_in_flight, 4)
+        self.assertGreater(fake.auth.max_in_flight, 1)
+
+    def test_conflicting_rows_fail_alone(self):
+        """Test that a row taken after validation fails on its own and its auth account is removed"""
+        rows = '\n'.join([
+            'email,firstName,lastName,password,role,studentId',
+            'new1@example.com,Ana,Cruz,pw123456,student,S-2',
+            'new2@example.com,Ben,Reyes,pw123456,student,S-3',
+        ])
+
+        def validate_then_conflict(rows):
+            results = validate_rows(rows)
+            # Someone else signs up with the same school ID before the import writes its rows
+            User.objects.create_user(username='racer', email='racer@example.com', student_id='S-3')
+            return results
+
+        fake = FakeAuthClient()
+        fake.auth.admin = FakeAdminAuth()
+        with override_supabase_client(fake), \
+                mock.patch('SOAR.AdminSoar.imports.validate_rows', validate_then_conflict):
+            data = self._upload('users.csv', rows).json()
+
+        self.assertEqual(data['summary'], {'total': 2, 'created': 1, 'failed': 1, 'dryRun': False})
+        self.assertEqual(data['results'][0]['status'], 'created')
+        self.assertEqual(set(data['results'][1]['errors']), {'email'})
+        self.assertTrue(User.objects.filter(email='new1@example.com').exists())
+        self.assertFalse(User.objects.filter(email='new2@example.com').exists())
+        self.assertEqual(len(fake.auth.admin.deleted), 1)
+        self.assertNotEqual(fake.auth.admin.deleted[0], data['results'][0]['id'])
+
+    def test_validation_queries_do_not_grow_with_rows(self):
+        """Test that validation uses a fixed number of queries"""
+        rows = [{'email': f'user{i}@example.com', 'firstName': 'A', 'lastName': 'B', 'password': 'x',
+                 'role': 'student', 'course': 'BSIT', 'studentId': f'ID-{i}'} for i in range(50)]
+        with self.assertNumQueries(4):
+            results = validate_rows(rows)
+        self.assertTrue(all('fields' in result for result in results))
+
+    def test_dry_run_and_bad_files(self):
+        """Test that dry runs create nothing and unreadable files are rejected"""
+        content = 'email,firstName,lastName,password,role\nnew@example.com,A,B,pw,student'
+        with override_supabase_client(FakeAuthClient()):
+            data = self._upload('users.csv', content, dry_run='1').json()
+        self.assertEqual(data['results'][0]['status'], 'valid')
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
+
+        self.assertEqual(self._upload('users.xlsx', content).status_code, 400)
+        self.assertEqual(self._upload('users.jsonl', '{"email": ').status_code, 400)
+        self.assertEqual(self.client.post(reverse('api_import_users')).status_code, 400)
+
+
+class FakeAdminAuth:
+    def __init__(self):
+        self.deleted = []
+        self.admin = self
+
+    def delete_user(self, user_id, should_soft_delete=False):
+        self.deleted.append(user_id)
+
+
+class FakeAdminClient:
+    def __init__(self):
+        self.auth = FakeAdminAuth()
+
+
+class NoTableSupabase:
+    def table(self, name):
+        raise AssertionError('Admin checks must not query Supabase tables')
+
+
+class AdminPermissionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.superuser = User.objects.create_user(username='root', password='testpass123', is_staff=True, is_superuser=True)
+        self.staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.student = User.objects.create_user(username='student', password='testpass123')
+
+    def test_admin_panel_uses_local_flags(self):
+        """Test that the admin panel checks is_superuser without calling Supabase"""
+        with override_supabase_client(NoTableSupabase()):
+            self.client.login(username='root', password='testpass123')
+            self.assertTemplateUsed(self.client.get(reverse('admin_panel')), 'AdminSoar/AdminPanel.html')
+
+            self.client.login(username='staff', password='testpass123')
+            self.assertTemplateNotUsed(self.client.get(reverse('admin_panel')), 'AdminSoar/AdminPanel.html')
+
+    def test_api_views_require_staff(self):
+        """Test that every admin API view rejects non-admins"""
+        url = reverse('api_programs')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.login(username='student', password='testpass123')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.login(username='staff', password='testpass123')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class OrganizationAdminQueryTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client.login(username='admin', password='testpass123')
+        self.programs = [
+            Program.objects.create(abbreviation='BSIT', name='Information Technology'),
+            Program.objects.create(abbreviation='BSCS', name='Computer Science'),
+        ]
+
+    def _add_organizations(self, count):
+        start = Organization.objects.count()
+        for i in range(start, start + count):
+            adviser = User.objects.create_user(username=f'adviser{i}', first_name='Ad', last_name=str(i))
+            org = Organization.objects.create(name=f'Org {i}', adviser=adviser, tags=['sports'] if i % 2 else [])
+            org.allowed_programs.set(self.programs)
+
+    def test_list_queries_do_not_grow(self):
+        """Test that the organization list costs a fixed number of queries"""
+        url = reverse('api_organizations')
+        self._add_organizations(2)
+        # session + user + count + page + allowed_programs prefetch
+        with self.assertNumQueries(5):
+            data = self.client.get(url).json()
+        self.assertEqual(len(data['data']), 2)
+
+        self._add_organizations(8)
+        with self.assertNumQueries(5):
+            data = self.client.get(url).json()
+        self.assertEqual(len(data['data']), 10)
+        row = next(row for row in data['data'] if row['orgName'] == 'Org 1')
+        self.assertEqual((row['type'], row['adviser']), ('Sports', 'Ad 1'))
+        self.assertEqual(set(row['programs'].split(', ')), {'BSIT', 'BSCS'})
+
+    def test_details_counts_roles_in_one_query(self):
+        """Test that organization details aggregate role counts with the organization row"""
+        self._add_organizations(1)
+        org = Organization.objects.get()
+        OrganizationMember.objects.create(organization=org, student=self.admin, role='leader', is_approved=True)
+
+        # session + user + organization with role counts + allowed_programs
+        with self.assertNumQueries(4):
+            data = self.client.get(reverse('api_organization_details', args=[org.id])).json()
+        self.assertEqual(data['memberCounts'], {'leader': 1, 'officer': 0, 'member': 0, 'adviser': 1})
+        self.assertEqual(data['totalMembers'], 2)
+        self.assertEqual(data['type'], 'Academic')
+
+    def test_program_list_counts(self):
+        """Test that the program list reports per-program counts with a fixed number of queries"""
+        self._add_organizations(3)
+        User.objects.create_user(username='it-student', course=self.programs[0])
+        # session + user + count + page
+        with self.assertNumQueries(4):
+            data = self.client.get(reverse('api_programs'), {'sort': '-students'}).json()
+        row = data['data'][0]
+        self.assertEqual(
+            (row['code'], row['students'], row['eligibleOrgs'], row['activeMembers']),
+            ('BSIT', '1', '3', '0')
+        )
+
+
+class BulkChangeTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+            self.org = Organization.objects.create(name='Chess Club')
+            self.students = [User.objects.create_user(username=f'student{i}') for i in range(3)]
+        self.client.login(username='admin', password='testpass123')
+
+    def _post(self, dataset, **payload):
+        return self.client.post(reverse('api_bulk', args=[dataset]), json.dumps(payload), content_type='application/json')
+
+    def test_delete_reports_each_id(self):
+        """Test that one request deletes many rows and reports every id in request order"""
+        with self.captureOnCommitCallbacks(execute=True):
+            events = [
+                OrganizationEvent.objects.create(organization=self.org, title=f'Meet {i}', event_date=timezone.now())
+                for i in range(3)
+            ]
+        missing = str(uuid.uuid4())
+        ids = [str(events[0].id), missing, 'not-an-id', str(events[1].id), str(events[0].id)]
+        with mock.patch('SOAR.AdminSoar.bulk.BULK_CHUNK_SIZE', 2), self.captureOnCommitCallbacks(execute=True):
+            data = self._post('events', action='delete', ids=ids).json()
+
+        self.assertEqual(data['summary'], {'total': 4, 'succeeded': 2, 'failed': 2})
+        self.assertEqual([(r['id'], r['status']) for r in data['results']], [
+            (str(events[0].id), 'deleted'), (missing, 'not_found'),
+            ('not-an-id', 'error'), (str(events[1].id), 'deleted'),
+        ])
+        self.assertEqual(list(OrganizationEvent.objects.values_list('id', flat=True)), [events[2].id])
+        self.assertEqual(OrganizationMonthlyEventStat.objects.get(organization=self.org).count, 1)
+
+    def test_user_delete_skips_current_user_and_removes_auth(self):
+        """Test that bulk user deletes keep the admin's own account and clean up Supabase auth"""
+        fake = FakeAdminClient()
+        ids = [str(self.admin.id)] + [str(user.id) for user in self.students[:2]]
+        with override_supabase_client(fake), self.captureOnCommitCallbacks(execute=True):
+            data = self._post('users', action='delete', ids=ids).json()
+
+        self.assertEqual(data['results'][0], {
+            'id': str(self.admin.id), 'status': 'error', 'error': 'Cannot delete the currently logged-in user.'
+        })
+        self.assertEqual(sorted(fake.auth.deleted), sorted(ids[1:]))
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(DailyRegistrationStat.objects.get(day=local_day(timezone.now())).count, 2)
+
+    def test_member_approval_notifies_in_one_batch(self):
+        """Test that bulk approval updates the member rollup and notifies only newly approved members"""
+        with self.captureOnCommitCallbacks(execute=True):
+            members = [
+                OrganizationMember.objects.create(organization=self.org, student=student, is_approved=(i == 0))
+                for i, student in enumerate(self.students)
+            ]
+            data = self._post(
+                'members', action='update', ids=[str(m.id) for m in members], fields={'isApproved': True}
+            ).json()
+
+        self.assertEqual(data['summary']['succeeded'], 3)
+        self.assertEqual(OrganizationMember.objects.filter(is_approved=True).count(), 3)
+        self.assertEqual(OrganizationMemberStat.objects.get(organization=self.org).approved_count, 3)
+        self.assertEqual(
+            set(Notification.objects.values_list('user_id', flat=True)),
+            {self.students[1].id, self.students[2].id}
+        )
+
+    def test_member_delete_notifies_only_approved_members(self):
+        """Test that deleting memberships tells removed members but not users with pending requests"""
+        with self.captureOnCommitCallbacks(execute=True):
+            members = [
+                OrganizationMember.objects.create(organization=self.org, student=student, is_approved=(i == 0))
+                for i, student in enumerate(self.students[:2])
+            ]
+        data = self._post('members', action='delete', ids=[str(m.id) for m in members]).json()
+
+        self.assertEqual(data['summary']['succeeded'], 2)
+        self.assertEqual(list(Notification.objects.values_list('user_id', flat=True)), [self.students[0].id])
+
+    def test_cancel_events_notifies_attendees(self):
+        """Test that deactivating events cancels them and tells going and interested users"""
+        event = OrganizationEvent.objects.create(organization=self.org, title='Open Day', event_date=timezone.now())
+        for student, status in zip(self.students, ['going', 'interested', 'not_going']):
+            EventRSVP.objects.create(event=event, user=student, status=status)
+
+        self.assertEqual(self._post('events', action='deactivate', ids=[str(event.id)]).status_code, 200)
+        self.assertTrue(OrganizationEvent.objects.get(id=event.id).cancelled)
+        self.assertEqual(Notification.objects.count(), 2)
+
+        # Already cancelled events are not announced twice
+        self._post('events', action='deactivate', ids=[str(event.id)])
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_rsvp_delete_fills_freed_spots(self):
+        """Test that deleting going RSVPs promotes users from the waitlist"""
+        event = OrganizationEvent.objects.create(
+            organization=self.org, title='Workshop', event_date=timezone.now(), max_participants=1
+        )
+        rsvp = EventRSVP.objects.create(event=event, user=self.students[0], status='going')
+        EventWaitlistEntry.objects.create(event=event, user=self.students[1])
+
+        # Promotion runs in the delete's transaction, so a failure keeps the RSVP
+        with mock.patch('SOAR.AdminSoar.bulk.promote_from_waitlist', side_effect=RuntimeError), \
+                self.assertRaises(RuntimeError):
+            self._post('rsvps', action='delete', ids=[str(rsvp.id)])
+        self.assertTrue(EventRSVP.objects.filter(id=rsvp.id).exists())
+
+        self._post('rsvps', action='delete', ids=[str(rsvp.id)])
+        self.assertEqual(EventRSVP.objects.get(event=event).user, self.students[1])
+        self.assertFalse(EventWaitlistEntry.objects.exists())
+
+    def test_bad_requests(self):
+        """Test that malformed bulk requests are rejected without changing anything"""
+        ids = [str(self.org.id)]
+        self.assertEqual(self._post('organizations', action='deactivate', ids=ids).status_code, 400)
+        self.assertEqual(self._post('organizations', action='update', ids=ids, fields={'name': 'X'}).status_code, 400)
+        self.assertEqual(
+            self._post('organizations', action='update', ids=ids, fields={'isPublic': 'no'}).status_code, 400
+        )
+        self.assertEqual(self._post('organizations', action='archive', ids=ids).status_code, 400)
+        self.assertEqual(self._post('organizations', action='delete', ids=[]).status_code, 400)
+        self.assertEqual(self._post('widgets', action='delete', ids=ids).status_code, 404)
+        self.assertTrue(Organization.objects.filter(id=self.org.id).exists())
+
+        self.client.logout()
+        self.assertEqual(self._post('organizations', action='delete', ids=ids).status_code, 302)
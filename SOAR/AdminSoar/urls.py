@@ -6,6 +6,7 @@ urlpatterns = [
     path('create-organization/', views.admin_create_organization, name='admin_create_organization'),
     # API endpoints
     path('api/users/', views.get_users_data, name='api_users'),
+    path('api/users/import/', views.import_users_data, name='api_import_users'),
     path('api/users/<uuid:user_id>/', views.delete_user, name='api_delete_user'),
     path('api/users/<uuid:user_id>/details/', views.get_user_details, name='api_user_details'),
     path('api/organizations/', views.get_organizations_data, name='api_organizations'),
@@ -22,4 +23,7 @@ urlpatterns = [
     path('api/events/', views.get_events_data, name='api_events'),
     path('api/rsvps/', views.get_rsvps_data, name='api_rsvps'),
     path('api/programs/', views.get_programs_data, name='api_programs'),
+    path('api/analytics/', views.get_analytics_data, name='api_analytics'),
+    path('api/export/<str:dataset>/', views.export_data, name='api_export'),
+    path('api/bulk/<str:dataset>/', views.bulk_change, name='api_bulk'),
 ]
\ No newline at end of file
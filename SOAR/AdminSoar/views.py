@@ -2,43 +2,48 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from supabase import create_client
-from decouple import config
+from SOAR.supabase_client import get_supabase_client, get_supabase_admin_client, create_supabase_auth_client
 from SOAR.organization.forms import AdminOrganizationCreateForm
-from SOAR.organization.models import Organization, OrganizationMember, Program, ROLE_LEADER
+from SOAR.organization.models import Organization, OrganizationMember, Program, ROLE_LEADER, ORG_TYPES
+from SOAR.organization.services import ProgramStats
 from SOAR.accounts.models import User
 from SOAR.event.models import OrganizationEvent, EventRSVP
-from SOAR.notification.models import Notification
-from django.db.models import Count
+from SOAR.event.services import set_rsvp_status, cancel_rsvp
+from .permissions import admin_required, is_admin
+from .analytics import get_analytics
+from .tables import Table, Column, choice_filter
+from .exports import Export, export_response
+from .imports import parse_import_file, import_users
+from .bulk import BULK_TARGETS, run_bulk
+from SOAR.notification.models import Notification, NotificationJob
+from SOAR.notification.jobs import enqueue_fanout
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import Case, CharField, Count, Func, OuterRef, Q, Value, When
 import json
+from datetime import timedelta
+from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from django.utils.dateparse import parse_datetime, parse_date
 
-SUPABASE_URL = config("SUPABASE_URL")
-SUPABASE_KEY = config("SUPABASE_KEY")
-SUPABASE_SERVICE_ROLE_KEY = config("SUPABASE_SERVICE_ROLE_KEY", default=None)
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+def table_response(table, queryset, request):
+    """Serve one page of an admin table, reporting protocol errors as 400s."""
+    try:
+        return JsonResponse(table.page(queryset, request.GET))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
-# Create a service role client for admin operations (deleting users from auth)
-if SUPABASE_SERVICE_ROLE_KEY:
-    supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-else:
-    supabase_admin = supabase  # Fallback to regular client if service role key not provided
 
 def admin_panel(request):
-    if request.user.is_authenticated:
-        response = supabase.table('accounts_user').select('is_superuser').eq('id', str(request.user.id)).execute()
-        is_superuser = response.data[0]['is_superuser'] if response.data else False
-        if is_superuser:
-            return render(request, 'AdminSoar/AdminPanel.html')
+    if is_admin(request, superuser=True):
+        return render(request, 'AdminSoar/AdminPanel.html')
     return render(request, 'accounts/index.html')
 
 @login_required
 def admin_create_organization(request):
     """Allow admins to create new organizations."""
     # Check if user is admin
-    if not (request.user.is_superuser or request.user.is_staff):
+    if not is_admin(request):
         messages.error(request, 'Only administrators can create organizations.')
         return redirect('admin_panel')
     
@@ -60,44 +65,33 @@ def admin_create_organization(request):
                 is_approved=True
             )
             
-            # Send notifications based on organization visibility
-            notifications = []
+            # Queue notifications based on organization visibility; notification_worker writes them
             org_link = f"/organization/{organization.id}/"
             message = f"🎉 New organization '{organization.name}' has been created! Check it out and join if you're interested."
             
             if organization.is_public:
                 # Public organization: notify all users
-                all_users = User.objects.filter(is_active=True).exclude(id=request.user.id)
-                for user in all_users:
-                    notifications.append(Notification(
-                        user=user,
-                        message=message,
-                        notification_type=Notification.TYPE_ORGANIZATION,
-                        priority=Notification.PRIORITY_MEDIUM,
-                        link=org_link
-                    ))
+                enqueue_fanout(
+                    NotificationJob.AUDIENCE_ACTIVE_USERS,
+                    message,
+                    notification_type=Notification.TYPE_ORGANIZATION,
+                    priority=Notification.PRIORITY_MEDIUM,
+                    link=org_link,
+                    exclude_user_id=request.user.id
+                )
             else:
                 # Private organization: notify users from allowed programs
-                allowed_programs = organization.allowed_programs.all()
-                if allowed_programs.exists():
-                    eligible_users = User.objects.filter(
-                        course__in=allowed_programs,
-                        is_active=True
-                    ).exclude(id=request.user.id)
-                    
-                    for user in eligible_users:
-                        notifications.append(Notification(
-                            user=user,
-                            message=message,
-                            notification_type=Notification.TYPE_ORGANIZATION,
-                            priority=Notification.PRIORITY_MEDIUM,
-                            link=org_link
-                        ))
-            
-            # Bulk create notifications for efficiency
-            if notifications:
-                Notification.objects.bulk_create(notifications)
-                print(f"Created {len(notifications)} notifications for new organization: {organization.name}")
+                program_ids = sorted(organization.allowed_program_ids())
+                if program_ids:
+                    enqueue_fanout(
+                        NotificationJob.AUDIENCE_PROGRAMS,
+                        message,
+                        notification_type=Notification.TYPE_ORGANIZATION,
+                        priority=Notification.PRIORITY_MEDIUM,
+                        link=org_link,
+                        program_ids=program_ids,
+                        exclude_user_id=request.user.id
+                    )
             
             messages.success(
                 request,
@@ -114,12 +108,63 @@ def admin_create_organization(request):
         'form': form
     })
 
-@login_required
+def serialize_user_row(user):
+    course_display = None
+    if user.course:
+        # Prefer the abbreviation (e.g., BSIT); fall back to name if needed
+        course_display = getattr(user.course, 'abbreviation', None) or getattr(user.course, 'name', None)
+
+    # Determine user role
+    if user.is_superuser:
+        role = 'Admin'
+    elif user.is_staff:
+        role = 'Staff'
+    else:
+        role = 'Student'
+
+    # Determine user status
+    status = 'Active' if user.is_active else 'Inactive'
+
+    return {
+        'id': str(user.id),
+        'studentId': user.student_id or 'N/A',
+        'email': user.email,
+        'course': course_display or 'N/A',
+        'yearLevel': user.year_level if user.year_level is not None else 'N/A',
+        'role': role,
+        'status': status,
+        'dateJoined': user.date_joined.strftime('%b. %d, %Y') if user.date_joined else 'N/A'
+    }
+
+
+USER_ROLE_FILTERS = {
+    'admin': Q(is_superuser=True),
+    'staff': Q(is_staff=True, is_superuser=False),
+    'student': Q(is_staff=False, is_superuser=False),
+}
+
+USERS_TABLE = Table(
+    columns=[
+        Column('studentId', 'student_id', filter='icontains', search=True, nullable=True),
+        Column('email', 'email', filter='icontains', search=True),
+        Column('firstName', 'first_name', filter='icontains', search=True),
+        Column('lastName', 'last_name', filter='icontains', search=True),
+        Column('course', 'course__abbreviation', filter='iexact', nullable=True),
+        Column('yearLevel', 'year_level', filter='exact', nullable=True),
+        Column('role', filter=choice_filter(USER_ROLE_FILTERS)),
+        Column('status', 'is_active', filter=choice_filter({
+            'active': Q(is_active=True),
+            'inactive': Q(is_active=False),
+        })),
+        Column('dateJoined', 'date_joined'),
+    ],
+    default_sort='-dateJoined',
+    serialize=serialize_user_row
+)
+
+@admin_required
 def get_users_data(request):
     """API endpoint to get all users data, and add new users via POST."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'POST':
         try:
             data = json.loads(request.body.decode('utf-8'))
@@ -156,7 +201,7 @@ def get_users_data(request):
 
         # Create user in Supabase auth first
         try:
-            response = supabase.auth.sign_up({
+            response = create_supabase_auth_client().auth.sign_up({
                 "email": email,
                 "password": password
             })
@@ -259,46 +304,27 @@ def get_users_data(request):
         return JsonResponse({'success': True, 'id': str(user.id)})
 
     # GET: list users
-    users = User.objects.all().order_by('-date_joined')
-    users_data = []
-
-    for user in users:
-        course_display = None
-        if user.course:
-            # Prefer the abbreviation (e.g., BSIT); fall back to name if needed
-            course_display = getattr(user.course, 'abbreviation', None) or getattr(user.course, 'name', None)
-
-        # Determine user role
-        if user.is_superuser:
-            role = 'Admin'
-        elif user.is_staff:
-            role = 'Staff'
-        else:
-            role = 'Student'
-        
-        # Determine user status
-        status = 'Active' if user.is_active else 'Inactive'
-        
-        users_data.append({
-            'id': str(user.id),
-            'studentId': user.student_id or 'N/A',
-            #'username': user.username,
-            'email': user.email,
-            'course': course_display or 'N/A',
-            'yearLevel': user.year_level if user.year_level is not None else 'N/A',
-            'role': role,
-            'status': status,
-            'dateJoined': user.date_joined.strftime('%b. %d, %Y') if user.date_joined else 'N/A'
-        })
+    return table_response(USERS_TABLE, User.objects.select_related('course'), request)
 
-    return JsonResponse({'data': users_data})
+@admin_required
+@require_http_methods(["POST"])
+def import_users_data(request):
+    """API endpoint to create many users from an uploaded CSV or JSONL file, returning a per-row report."""
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'error': 'Upload a CSV or JSONL file as "file".'}, status=400)
 
-@login_required
+    try:
+        rows = parse_import_file(upload, request.POST.get('format'))
+    except (ValueError, UnicodeDecodeError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    dry_run = request.POST.get('dry_run') == '1'
+    return JsonResponse(import_users(rows, dry_run=dry_run))
+
+@admin_required
 def get_user_details(request, user_id):
     """API endpoint to get detailed information for a specific user."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-    
     try:
         user = User.objects.get(id=user_id)
     except User.DoesNotExist:
@@ -351,76 +377,80 @@ def get_user_details(request, user_id):
     
     return JsonResponse(user_details)
 
-@login_required
+def serialize_organization_row(org):
+    # allowed_programs is prefetched by the list view
+    programs_list = [p.abbreviation for p in org.allowed_programs.all()]
+
+    # Get adviser full name
+    adviser_name = 'N/A'
+    if org.adviser:
+        adviser_name = f"{org.adviser.first_name} {org.adviser.last_name}".strip()
+        if not adviser_name:
+            adviser_name = org.adviser.username
+
+    return {
+        'id': str(org.id),
+        'orgName': org.name,
+        'type': org.org_type,
+        'members': str(org.member_count),
+        'created': org.date_created.strftime('%b. %d, %Y') if org.date_created else 'N/A',
+        'description': org.description,
+        'isPublic': org.is_public,
+        'programs': ', '.join(programs_list) if programs_list else '',
+        'adviser': adviser_name
+    }
+
+
+def organizations_queryset():
+    return Organization.objects.annotate(member_count=Count('members'))
+
+
+def _organization_program_filter(value):
+    return Q(pk__in=Organization.objects.filter(allowed_programs__abbreviation__iexact=value).values('pk'))
+
+
+ORGANIZATIONS_TABLE = Table(
+    columns=[
+        Column('orgName', 'name', filter='icontains', search=True),
+        Column('type', 'org_type', filter=choice_filter({
+            org_type.lower(): Q(org_type=org_type) for org_type in ORG_TYPES
+        })),
+        Column('programs', sortable=False, filter=_organization_program_filter),
+        Column('members', 'member_count'),
+        Column('created', 'date_created'),
+        Column('isPublic', 'is_public', filter=choice_filter({
+            'true': Q(is_public=True),
+            'false': Q(is_public=False),
+        })),
+        Column('adviser', sortable=False),
+    ],
+    default_sort='-created',
+    serialize=serialize_organization_row
+)
+
+@admin_required
 def get_organizations_data(request):
     """API endpoint to get all organizations data."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-    
-    organizations = Organization.objects.annotate(
-        member_count=Count('members')
-    ).order_by('-date_created')
-    
-    orgs_data = []
-    for org in organizations:
-        # Determine organization type based on tags
-        org_type = 'Academic'
-        if org.tags:
-            if 'sports' in [tag.lower() for tag in org.tags]:
-                org_type = 'Sports'
-            elif 'cultural' in [tag.lower() for tag in org.tags]:
-                org_type = 'Cultural'
-            elif any(tag.lower() in ['special', 'interest'] for tag in org.tags):
-                org_type = 'Special Interest'
-        
-        # collect allowed program abbreviations
-        try:
-            programs_list = [p.abbreviation for p in org.allowed_programs.all()]
-        except Exception:
-            programs_list = []
-
-        # Get adviser full name
-        adviser_name = 'N/A'
-        if org.adviser:
-            adviser_name = f"{org.adviser.first_name} {org.adviser.last_name}".strip()
-            if not adviser_name:
-                adviser_name = org.adviser.username
-
-        orgs_data.append({
-            'id': str(org.id),
-            'orgName': org.name,
-            'type': org_type,
-            'members': str(org.member_count),
-            'created': org.date_created.strftime('%b. %d, %Y') if org.date_created else 'N/A',
-            'description': org.description,
-            'isPublic': org.is_public,
-            'programs': ', '.join(programs_list) if programs_list else '',
-            'adviser': adviser_name
-        })
-    
-    return JsonResponse({'data': orgs_data})
+    organizations = organizations_queryset().select_related('adviser').prefetch_related('allowed_programs')
+    return table_response(ORGANIZATIONS_TABLE, organizations, request)
 
-@login_required
+DETAIL_MEMBER_ROLES = ('leader', 'officer', 'member', 'adviser')
+
+@admin_required
 def get_organization_details(request, org_id):
     """API endpoint to get detailed information for a specific organization."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
+    # Member counts per role are aggregated in the same query as the organization
+    role_counts = {
+        f'{role}_count': Count('members', filter=Q(members__role=role))
+        for role in DETAIL_MEMBER_ROLES
+    }
     try:
-        org = Organization.objects.select_related('adviser').prefetch_related('allowed_programs', 'members').get(id=org_id)
+        org = Organization.objects.select_related('adviser').prefetch_related(
+            'allowed_programs'
+        ).annotate(**role_counts).get(id=org_id)
     except Organization.DoesNotExist:
         return JsonResponse({'error': 'Organization not found'}, status=404)
 
-    # Determine organization type
-    org_type = 'Academic'
-    if org.tags:
-        if 'sports' in [tag.lower() for tag in org.tags]:
-            org_type = 'Sports'
-        elif 'cultural' in [tag.lower() for tag in org.tags]:
-            org_type = 'Cultural'
-        elif any(tag.lower() in ['special', 'interest'] for tag in org.tags):
-            org_type = 'Special Interest'
-
     # Collect allowed program names
     programs_list = [p.name for p in org.allowed_programs.all()]
 
@@ -434,20 +464,14 @@ def get_organization_details(request, org_id):
             'username': org.adviser.username
         }
 
-    # Count members by role
-    members_by_role = {
-        'leader': org.members.filter(role='leader').count(),
-        'officer': org.members.filter(role='officer').count(),
-        'member': org.members.filter(role='member').count(),
-        'adviser': org.members.filter(role='adviser').count()
-    }
+    members_by_role = {role: getattr(org, f'{role}_count') for role in DETAIL_MEMBER_ROLES}
     total_members = sum(members_by_role.values())
 
     details = {
         'id': str(org.id),
         'name': org.name,
         'description': org.description or '',
-        'type': org_type,
+        'type': org.org_type,
         'isPublic': org.is_public,
         'dateCreated': org.date_created.strftime('%B %d, %Y') if org.date_created else 'N/A',
         'programs': programs_list,
@@ -459,12 +483,33 @@ def get_organization_details(request, org_id):
 
     return JsonResponse(details)
 
-@login_required
+def serialize_organization_member_row(member):
+    return {
+        'id': str(member.id),
+        'organization': member.organization.name,
+        'student': member.student.username,
+        'role': member.get_role_display(),
+        'dateJoined': member.date_joined.strftime('%b. %d, %Y') if member.date_joined else 'N/A',
+        'status': 'Approved' if member.is_approved else 'Pending'
+    }
+
+
+ORGANIZATION_MEMBERS_TABLE = Table(
+    columns=[
+        Column('organization', 'organization__name', filter='icontains', search=True),
+        Column('student', 'student__username', filter='icontains', search=True),
+        Column('email', 'student__email', filter='icontains', search=True),
+        Column('role', 'role', filter='iexact'),
+        Column('dateJoined', 'date_joined'),
+        Column('status', sortable=False),
+    ],
+    default_sort='-dateJoined',
+    serialize=serialize_organization_member_row
+)
+
+@admin_required
 def get_organization_members_data(request):
     """API endpoint to get all organization members data, and add new members via POST."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'POST':
         try:
             data = json.loads(request.body.decode('utf-8'))
@@ -513,27 +558,12 @@ def get_organization_members_data(request):
     # GET: list members
     members = OrganizationMember.objects.filter(
         is_approved=True
-    ).select_related('organization', 'student').order_by('-date_joined')
-
-    members_data = []
-    for member in members:
-        members_data.append({
-            'id': str(member.id),
-            'organization': member.organization.name,
-            'student': member.student.username,
-            'role': member.get_role_display(),
-            'dateJoined': member.date_joined.strftime('%b. %d, %Y') if member.date_joined else 'N/A',
-            'status': 'Approved' if member.is_approved else 'Pending'
-        })
+    ).select_related('organization', 'student')
+    return table_response(ORGANIZATION_MEMBERS_TABLE, members, request)
 
-    return JsonResponse({'data': members_data})
-
-@login_required
+@admin_required
 def get_organization_member_details(request, member_id):
     """API endpoint to get detailed information for a specific organization member."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     try:
         member = OrganizationMember.objects.select_related(
             'organization',
@@ -587,12 +617,57 @@ def get_organization_member_details(request, member_id):
 
     return JsonResponse(details)
 
-@login_required
+def serialize_event_row(event):
+    return {
+        'id': str(event.id),
+        'eventName': event.title,
+        'organization': event.organization.name,
+        'date': event.event_date.strftime('%b. %d, %Y, %I:%M %p') if event.event_date else 'N/A',
+        'location': event.location or 'TBA',
+        'activityType': event.get_activity_type_display(),
+        'status': event.status
+    }
+
+
+def _event_status_filter(value):
+    # Mirrors OrganizationEvent.status, which assumes a two-hour event
+    now = timezone.now()
+    ended = now - timedelta(hours=2)
+    return choice_filter({
+        'cancelled': Q(cancelled=True),
+        'upcoming': Q(cancelled=False, event_date__gt=now),
+        'ongoing': Q(cancelled=False, event_date__lte=now, event_date__gt=ended),
+        'completed': Q(cancelled=False, event_date__lte=ended),
+    })(value)
+
+
+def event_status_expression():
+    """OrganizationEvent.status computed in SQL."""
+    now = timezone.now()
+    return Case(
+        When(cancelled=True, then=Value('Cancelled')),
+        When(event_date__gt=now, then=Value('Upcoming')),
+        When(event_date__gt=now - timedelta(hours=2), then=Value('Ongoing')),
+        default=Value('Completed')
+    )
+
+
+EVENTS_TABLE = Table(
+    columns=[
+        Column('eventName', 'title', filter='icontains', search=True),
+        Column('organization', 'organization__name', filter='icontains', search=True),
+        Column('date', 'event_date'),
+        Column('location', 'location', filter='icontains', search=True),
+        Column('activityType', 'activity_type', filter='iexact'),
+        Column('status', sortable=False, filter=_event_status_filter),
+    ],
+    default_sort='-date',
+    serialize=serialize_event_row
+)
+
+@admin_required
 def get_events_data(request):
     """API endpoint to get all organization events data, and add new events via POST."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'POST':
         try:
             data = json.loads(request.body.decode('utf-8'))
@@ -645,30 +720,17 @@ def get_events_data(request):
             created_by=request.user
         )
 
-        # Create notifications for all approved organization members
-        approved_members = OrganizationMember.objects.filter(
-            organization=org,
-            is_approved=True
-        ).select_related('student')
-
+        # Queue notifications for all approved organization members
         event_date_str = event_date.strftime("%B %d, %Y at %I:%M %p")
         message = f"📅 New event '{title}' has been created in {org.name}! Event date: {event_date_str}. Location: {location or 'TBA'}."
-        event_link = f"/event/{event.id}/"
-        
-        notifications = []
-        for member in approved_members:
-            notifications.append(Notification(
-                user=member.student,
-                message=message,
-                notification_type=Notification.TYPE_EVENT,
-                priority=Notification.PRIORITY_MEDIUM,
-                link=event_link
-            ))
-
-        # Bulk create notifications for efficiency
-        if notifications:
-            Notification.objects.bulk_create(notifications)
-            print(f"Created {len(notifications)} notifications for admin-created event: {event.title}")
+        enqueue_fanout(
+            NotificationJob.AUDIENCE_ORGANIZATION_MEMBERS,
+            message,
+            notification_type=Notification.TYPE_EVENT,
+            priority=Notification.PRIORITY_MEDIUM,
+            link=f"/event/{event.id}/",
+            organization_id=org.id
+        )
 
         # Sync to Supabase
         try:
@@ -684,7 +746,7 @@ def get_events_data(request):
                 'created_by_id': str(request.user.id),
                 'date_created': event.date_created.isoformat() if hasattr(event, 'date_created') else None
             }
-            supabase.table('event_organizationevent').insert(supabase_payload).execute()
+            get_supabase_client().table('event_organizationevent').insert(supabase_payload).execute()
         except Exception as e:
             # Log error, but don't block Django save
             print('Supabase sync error:', e)
@@ -692,27 +754,13 @@ def get_events_data(request):
         return JsonResponse({'success': True, 'id': str(event.id)})
 
     # GET: list events
-    events = OrganizationEvent.objects.select_related('organization').order_by('-event_date')
-    events_data = []
-    for event in events:
-        events_data.append({
-            'id': str(event.id),
-            'eventName': event.title,
-            'organization': event.organization.name,
-            'date': event.event_date.strftime('%b. %d, %Y, %I:%M %p') if event.event_date else 'N/A',
-            'location': event.location or 'TBA',
-            'activityType': event.get_activity_type_display(),
-            'status': event.status
-        })
-    return JsonResponse({'data': events_data})
+    events = OrganizationEvent.objects.select_related('organization')
+    return table_response(EVENTS_TABLE, events, request)
 
 
-@login_required
+@admin_required
 def get_event_details(request, event_id):
     """API endpoint to get detailed information for a specific organization event."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     try:
         event = OrganizationEvent.objects.select_related('organization', 'created_by').get(id=event_id)
     except OrganizationEvent.DoesNotExist:
@@ -723,9 +771,9 @@ def get_event_details(request, event_id):
 
     # Basic stats
     rsvp_counts = {
-        'going': event.rsvps.filter(status='going').count(),
-        'interested': event.rsvps.filter(status='interested').count(),
-        'not_going': event.rsvps.filter(status='not_going').count(),
+        'going': event.going_count,
+        'interested': event.interested_count,
+        'not_going': event.not_going_count,
     }
 
     details = {
@@ -744,40 +792,52 @@ def get_event_details(request, event_id):
     }
 
     return JsonResponse(details)
-@login_required
+def serialize_rsvp_row(rsvp):
+    org_name = ''
+    try:
+        org_name = rsvp.event.organization.name if (rsvp.event and rsvp.event.organization) else ''
+    except Exception:
+        org_name = ''
+
+    return {
+        'id': str(rsvp.id),
+        'eventName': rsvp.event.title,
+        'organization': org_name,
+        'student': rsvp.user.username,
+        'status': rsvp.get_status_display(),
+        'rsvpDate': rsvp.date_created.strftime('%b. %d, %Y') if rsvp.date_created else 'N/A'
+    }
+
+
+RSVPS_TABLE = Table(
+    columns=[
+        Column('eventName', 'event__title', filter='icontains', search=True),
+        Column('organization', 'event__organization__name', filter='icontains', search=True),
+        Column('student', 'user__username', filter='icontains', search=True),
+        Column('rsvpDate', 'date_created'),
+        Column('status', 'status', filter='iexact'),
+    ],
+    default_sort='-rsvpDate',
+    serialize=serialize_rsvp_row
+)
+
+@admin_required
 def get_rsvps_data(request):
     """API endpoint to get all event RSVPs data."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-    
     # include event's organization to avoid N+1 queries
-    rsvps = EventRSVP.objects.select_related('event__organization', 'user').order_by('-date_created')
-    
-    rsvps_data = []
-    for rsvp in rsvps:
-        org_name = ''
-        try:
-            org_name = rsvp.event.organization.name if (rsvp.event and rsvp.event.organization) else ''
-        except Exception:
-            org_name = ''
-
-        rsvps_data.append({
-            'id': str(rsvp.id),
-            'eventName': rsvp.event.title,
-            'organization': org_name,
-            'student': rsvp.user.username,
-            'status': rsvp.get_status_display(),
-            'rsvpDate': rsvp.date_created.strftime('%b. %d, %Y') if rsvp.date_created else 'N/A'
-        })
-    
-    return JsonResponse({'data': rsvps_data})
+    rsvps = EventRSVP.objects.select_related('event__organization', 'user')
+    return table_response(RSVPS_TABLE, rsvps, request)
 
-@login_required
+@admin_required
+@require_http_methods(["GET"])
+def get_analytics_data(request):
+    """API endpoint with pre-aggregated dashboard analytics (cached briefly)."""
+    refresh = request.GET.get('refresh') == '1'
+    return JsonResponse({'data': get_analytics(refresh=refresh)})
+
+@admin_required
 def get_rsvp_details(request, rsvp_id):
     """API endpoint to get detailed information for a specific RSVP."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     try:
         rsvp = EventRSVP.objects.select_related('event__organization', 'user', 'user__course').get(id=rsvp_id)
     except EventRSVP.DoesNotExist:
@@ -838,13 +898,35 @@ def get_rsvp_details(request, rsvp_id):
 
     return JsonResponse(details)
 
-@login_required
+def serialize_program_row(program):
+    return {
+        'id': str(program.id),
+        'programName': program.name,
+        'code': program.abbreviation,
+        'department': 'CCS',
+        'students': str(program.student_count),
+        'eligibleOrgs': str(program.eligible_org_count),
+        'activeMembers': str(program.active_member_count)
+    }
+
+
+PROGRAMS_TABLE = Table(
+    columns=[
+        Column('programName', 'name', filter='icontains', search=True),
+        Column('code', 'abbreviation', filter='icontains', search=True),
+        Column('department', sortable=False),
+        Column('students', 'student_count'),
+        Column('eligibleOrgs', 'eligible_org_count'),
+        Column('activeMembers', 'active_member_count'),
+    ],
+    default_sort='code',
+    serialize=serialize_program_row
+)
+
+@admin_required
 @require_http_methods(["GET", "POST"])
 def get_programs_data(request):
     """API endpoint to get all programs data, and add new programs via POST."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'POST':
         try:
             data = json.loads(request.body.decode('utf-8'))
@@ -879,31 +961,108 @@ def get_programs_data(request):
         return JsonResponse({'success': True, 'id': str(program.id)})
 
     # GET: list programs
-    programs = Program.objects.all().order_by('abbreviation')
-
-    programs_data = []
-    for program in programs:
-        # Count students enrolled in this program via FK (avoids invalid icontains lookups on FK)
-        student_count = User.objects.filter(course=program).count()
-
-        programs_data.append({
-            'id': str(program.id),
-            'programName': program.name,
-            'code': program.abbreviation,
-            'department': 'CCS',
-            'students': str(student_count)
-        })
+    return table_response(PROGRAMS_TABLE, ProgramStats.annotate(), request)
+
+
+def _users_export_queryset():
+    return User.objects.annotate(
+        role=Case(
+            When(is_superuser=True, then=Value('Admin')),
+            When(is_staff=True, then=Value('Staff')),
+            default=Value('Student')
+        ),
+        status=Case(When(is_active=True, then=Value('Active')), default=Value('Inactive'))
+    )
+
+
+def _organizations_export_queryset():
+    programs = ArraySubquery(
+        Program.objects.filter(organization=OuterRef('pk')).order_by('abbreviation').values('abbreviation')
+    )
+    return organizations_queryset().annotate(
+        programs=Func(programs, Value(', '), function='array_to_string', output_field=CharField())
+    )
+
+
+def _members_export_queryset():
+    return OrganizationMember.objects.filter(is_approved=True)
+
+
+def _events_export_queryset():
+    return OrganizationEvent.objects.annotate(event_status=event_status_expression())
+
+
+EXPORTS = {
+    'users': Export(USERS_TABLE, _users_export_queryset, [
+        ('id', 'id'),
+        ('studentId', 'student_id'),
+        ('email', 'email'),
+        ('firstName', 'first_name'),
+        ('lastName', 'last_name'),
+        ('course', 'course__abbreviation'),
+        ('yearLevel', 'year_level'),
+        ('role', 'role'),
+        ('status', 'status'),
+        ('dateJoined', 'date_joined'),
+    ]),
+    'organizations': Export(ORGANIZATIONS_TABLE, _organizations_export_queryset, [
+        ('id', 'id'),
+        ('orgName', 'name'),
+        ('type', 'org_type'),
+        ('programs', 'programs'),
+        ('members', 'member_count'),
+        ('created', 'date_created'),
+        ('isPublic', 'is_public'),
+        ('adviser', 'adviser__email'),
+    ]),
+    'members': Export(ORGANIZATION_MEMBERS_TABLE, _members_export_queryset, [
+        ('id', 'id'),
+        ('organization', 'organization__name'),
+        ('student', 'student__username'),
+        ('email', 'student__email'),
+        ('role', 'role'),
+        ('dateJoined', 'date_joined'),
+    ]),
+    'events': Export(EVENTS_TABLE, _events_export_queryset, [
+        ('id', 'id'),
+        ('eventName', 'title'),
+        ('organization', 'organization__name'),
+        ('date', 'event_date'),
+        ('location', 'location'),
+        ('activityType', 'activity_type'),
+        ('status', 'event_status'),
+        ('going', 'going_count'),
+        ('interested', 'interested_count'),
+        ('notGoing', 'not_going_count'),
+    ]),
+    'rsvps': Export(RSVPS_TABLE, EventRSVP.objects.all, [
+        ('id', 'id'),
+        ('eventName', 'event__title'),
+        ('organization', 'event__organization__name'),
+        ('student', 'user__username'),
+        ('status', 'status'),
+        ('rsvpDate', 'date_created'),
+    ]),
+}
+
+@admin_required
+@require_http_methods(["GET"])
+def export_data(request, dataset):
+    """API endpoint streaming a whole admin dataset as CSV or NDJSON, with the table filters applied."""
+    export = EXPORTS.get(dataset)
+    if export is None:
+        return JsonResponse({'error': 'Unknown dataset'}, status=404)
 
-    return JsonResponse({'data': programs_data})
+    try:
+        return export_response(export, request.GET, dataset)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
 
-@login_required
+@admin_required
 @require_http_methods(["DELETE", "PATCH", "PUT"])
 def delete_user(request, user_id):
     """API endpoint to delete a user by id."""
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     # Prevent deleting self via admin UI
     if request.method == 'DELETE':
         if str(request.user.id) == str(user_id):
@@ -916,7 +1075,7 @@ def delete_user(request, user_id):
 
             # Delete from Supabase auth first using service role key
             try:
-                supabase_admin.auth.admin.delete_user(str(user_id), should_soft_delete=False)
+                get_supabase_admin_client().auth.admin.delete_user(str(user_id), should_soft_delete=False)
                 print(f"Successfully deleted user {user_id} from Supabase auth")
             except Exception as e:
                 # Log the error but don't fail - the user might not exist in Supabase
@@ -975,18 +1134,16 @@ def delete_user(request, user_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
-@login_required
+@admin_required
 @require_http_methods(["DELETE", "PATCH", "PUT"])
 def delete_rsvp(request, rsvp_id):
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'DELETE':
         try:
             rsvp = EventRSVP.objects.filter(id=rsvp_id).first()
             if not rsvp:
                 return JsonResponse({'error': 'RSVP not found.'}, status=404)
-            rsvp.delete()
+            # Frees the spot for the next waitlisted user
+            cancel_rsvp(rsvp)
             return JsonResponse({'success': True})
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
@@ -1003,19 +1160,21 @@ def delete_rsvp(request, rsvp_id):
             return JsonResponse({'error': 'RSVP not found.'}, status=404)
 
         if 'status' in payload:
-            rsvp.status = payload.get('status')
-        rsvp.save()
+            new_status = payload.get('status')
+            if new_status not in EventRSVP.COUNTER_FIELDS:
+                return JsonResponse({'error': 'Invalid RSVP status.'}, status=400)
+            # Goes through the RSVP engine so capacity and the waitlist stay consistent
+            result = set_rsvp_status(rsvp.event_id, rsvp.user, new_status)
+            if result['status'] == 'waitlisted':
+                return JsonResponse({'error': 'Event is full; the user was added to the waitlist.'}, status=409)
         return JsonResponse({'success': True})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 
-@login_required
+@admin_required
 @require_http_methods(["DELETE", "PATCH", "PUT"])
 def delete_event(request, event_id):
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'DELETE':
         try:
             event = OrganizationEvent.objects.filter(id=event_id).first()
@@ -1037,33 +1196,39 @@ def delete_event(request, event_id):
         if not event:
             return JsonResponse({'error': 'Event not found.'}, status=404)
 
+        changed = []
         if 'eventName' in payload:
             event.title = payload.get('eventName')
+            changed.append('title')
         if 'location' in payload:
             event.location = payload.get('location')
+            changed.append('location')
         if 'description' in payload:
             event.description = payload.get('description')
+            changed.append('description')
         if 'date' in payload and payload.get('date'):
             dt = parse_datetime(payload.get('date')) or parse_date(payload.get('date'))
             if dt:
                 event.event_date = dt
+                changed.append('event_date')
         if 'activityType' in payload:
             event.activity_type = payload.get('activityType')
+            changed.append('activity_type')
         if 'cancelled' in payload:
             event.cancelled = bool(payload.get('cancelled'))
+            changed.append('cancelled')
 
-        event.save()
+        # Only the edited columns; the RSVP counters are maintained with F() updates
+        if changed:
+            event.save(update_fields=changed)
         return JsonResponse({'success': True})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 
-@login_required
+@admin_required
 @require_http_methods(["DELETE", "PATCH", "PUT"])
 def delete_org_member(request, member_id):
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'DELETE':
         try:
             member = OrganizationMember.objects.filter(id=member_id).first()
@@ -1095,12 +1260,9 @@ def delete_org_member(request, member_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
-@login_required
+@admin_required
 @require_http_methods(["DELETE", "PATCH", "PUT"])
 def delete_organization(request, org_id):
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'DELETE':
         try:
             org = Organization.objects.filter(id=org_id).first()
@@ -1148,12 +1310,9 @@ def delete_organization(request, org_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
-@login_required
+@admin_required
 @require_http_methods(["DELETE", "PATCH", "PUT"])
 def delete_program(request, program_id):
-    if not (request.user.is_superuser or request.user.is_staff):
-        return JsonResponse({'error': 'Unauthorized'}, status=403)
-
     if request.method == 'DELETE':
         try:
             program = Program.objects.filter(id=program_id).first()
@@ -1183,3 +1342,29 @@ def delete_program(request, program_id):
         return JsonResponse({'success': True})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
+
+
+@admin_required
+@require_http_methods(["POST"])
+def bulk_change(request, dataset):
+    """Delete, deactivate or update many rows of a dataset in one request.
+
+    Body: {"action": "delete" | "deactivate" | "update", "ids": [...],
+    "fields": {...}} (fields only for updates). Responds with a summary and
+    the outcome of every id.
+    """
+    target = BULK_TARGETS.get(dataset)
+    if target is None:
+        return JsonResponse({'error': 'Unknown dataset'}, status=404)
+
+    try:
+        payload = json.loads(request.body.decode('utf-8') or '{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    try:
+        return JsonResponse(run_bulk(target, request, payload))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
@@ -0,0 +1,56 @@
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.utils import ConnectionHandler
+from SOAR.db_connections import CONNECTION_MODES, apply_connection_mode
+
+class Command(BaseCommand):
+    help = 'Measure per-request database connection overhead for each DB_CONNECTION_MODE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode')
+        parser.add_argument(
+            '--mode',
+            action='append',
+            dest='modes',
+            choices=CONNECTION_MODES,
+            help='Only benchmark the given mode (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        base = settings.DATABASES['default']
+        if base['ENGINE'] != 'django.db.backends.postgresql':
+            self.stderr.write(self.style.ERROR('Connection modes only apply to PostgreSQL (set DATABASE_URL)'))
+            return
+
+        self.stdout.write(f"{'mode':<16}  {'mean':>8}  {'p95':>8}  {'first':>8}")
+        for mode in options['modes'] or CONNECTION_MODES:
+            # A separate alias per mode so pools are not shared with the app's own connection
+            alias = f'benchmark_{mode}'
+            connections = ConnectionHandler({
+                'default': base,
+                alias: apply_connection_mode(base, mode),
+            })
+            connection = connections[alias]
+            try:
+                timings = [self.simulate_request(connection) for _ in range(options['requests'])]
+            finally:
+                connection.close()
+                if connection.pool:
+                    connection.close_pool()
+
+            ms = sorted(t * 1000 for t in timings)
+            p95 = ms[int(len(ms) * 0.95) - 1]
+            self.stdout.write(
+                f"{mode:<16}  {statistics.mean(ms):>6.2f}ms  {p95:>6.2f}ms  {timings[0] * 1000:>6.2f}ms"
+            )
+
+    def simulate_request(self, connection):
+        # Mirrors django.db.close_old_connections(), which runs on request_started/request_finished
+        start = time.perf_counter()
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        connection.close_if_unusable_or_obsolete()
+        return time.perf_counter() - start
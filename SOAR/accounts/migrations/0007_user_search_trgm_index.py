@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 18:10
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_alter_user_course_alter_user_profile_picture'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Serves SOAR.accounts.search.search_users(); the expression must match search_name()
+        migrations.RunSQL(
+            "CREATE INDEX user_search_name_trgm_idx ON accounts_user "
+            "USING gin ((lower(first_name || ' ' || last_name || ' ' || username)) gin_trgm_ops);",
+            "DROP INDEX IF EXISTS user_search_name_trgm_idx;",
+        ),
+    ]
@@ -1,23 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 import uuid
-from decouple import config
-from django.core.exceptions import ImproperlyConfigured
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 import os
+from SOAR.supabase_client import get_supabase_client
 
-# Lazy-load Supabase to prevent Windows crashes
-def get_supabase_client():
-    try:
-        from supabase import create_client
-        SUPABASE_URL = config("SUPABASE_URL", default="")
-        SUPABASE_KEY = config("SUPABASE_KEY", default="")
-        if SUPABASE_URL and SUPABASE_KEY:
-            return create_client(SUPABASE_URL, SUPABASE_KEY)
-    except Exception as e:
-        print(f"Supabase initialization failed: {e}")
-    return None
 
 class SupabaseStorage:
     def __init__(self, bucket_name='user_profile'):
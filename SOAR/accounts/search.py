@@ -0,0 +1,81 @@
+import base64
+import json
+import re
+
+from django.core.exceptions import ValidationError
+from django.db.models import Case, F, Func, IntegerField, Q, TextField, Value, When
+
+# search_name() compiles to lower(first_name || ' ' || last_name || ' ' || username),
+# the expression accounts migration 0007 indexes with gin_trgm_ops, so that
+# LIKE '%word%' filters are served by the trigram index
+
+DEFAULT_SEARCH_PAGE_SIZE = 10
+MAX_SEARCH_PAGE_SIZE = 50
+
+
+def search_name():
+    """Normalized "first last username" text of a user, as indexed."""
+    return Func(
+        F('first_name'), F('last_name'), F('username'),
+        template='lower(%(expressions)s)',
+        arg_joiner=" || ' ' || ",
+        output_field=TextField()
+    )
+
+
+def search_users(queryset, term):
+    """Filter `queryset` to users whose name or username contains every word of `term`.
+
+    Users with a name part starting with the term rank first, then
+    alphabetical order; the order is total, so results can be paged with
+    cursors. Adds `search_name` and `match_rank` annotations. Returns
+    `queryset.none()` when the term has no words.
+    """
+    words = re.findall(r'\S+', term.lower())
+    if not words:
+        return queryset.none()
+    phrase = ' '.join(words)
+
+    queryset = queryset.annotate(search_name=search_name())
+    for word in words:
+        queryset = queryset.filter(search_name__contains=word)
+    return queryset.annotate(
+        match_rank=Case(
+            When(search_name__startswith=phrase, then=Value(0)),
+            When(search_name__contains=f' {phrase}', then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField()
+        )
+    ).order_by('match_rank', 'search_name', 'pk')
+
+
+def encode_search_cursor(user):
+    raw = json.dumps([user.match_rank, user.search_name, str(user.pk)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def after_search_cursor(queryset, cursor):
+    """Continue a search_users() queryset after the user a cursor points at.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        rank, name, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        pk = queryset.model._meta.pk.to_python(pk)
+    except (TypeError, ValueError, ValidationError):
+        raise ValueError("Invalid cursor")
+    return queryset.filter(
+        Q(match_rank__gt=rank) |
+        Q(match_rank=rank, search_name__gt=name) |
+        Q(match_rank=rank, search_name=name, pk__gt=pk)
+    )
+
+
+def search_page(queryset, term, cursor=None, page_size=DEFAULT_SEARCH_PAGE_SIZE):
+    """Return (users, next_cursor) for one page of search_users() results."""
+    users = search_users(queryset, term)
+    if cursor:
+        users = after_search_cursor(users, cursor)
+    users = list(users[:page_size + 1])
+    next_cursor = encode_search_cursor(users[page_size - 1]) if len(users) > page_size else None
+    return users[:page_size], next_cursor
@@ -1,3 +1,230 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from SOAR import search, supabase_client
+from SOAR.db_connections import apply_connection_mode
+from SOAR.event.models import OrganizationEvent
+from SOAR.organization.models import Organization, OrganizationMember
+from .models import SupabaseStorage, User
 
-# Create your tests here.
+
+class ConnectionModeTestCase(SimpleTestCase):
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': 'postgres',
+        'OPTIONS': {'connect_timeout': 10},
+    }
+
+    def test_persistent_mode(self):
+        """Test that persistent mode keeps connections open with health checks"""
+        database = apply_connection_mode(self.database, 'persistent', conn_max_age=30)
+        self.assertEqual(database['CONN_MAX_AGE'], 30)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', database['OPTIONS'])
+
+    def test_pool_mode(self):
+        """Test that pool mode enables psycopg pooling and leaves CONN_MAX_AGE at 0"""
+        database = apply_connection_mode(self.database, 'pool', pool_max_size=20)
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 20)
+        self.assertEqual(database['OPTIONS']['connect_timeout'], 10)
+        self.assertNotIn('pool', self.database['OPTIONS'])
+
+    def test_external_pooler_mode(self):
+        """Test that external pooler mode disables server-side cursors"""
+        database = apply_connection_mode(apply_connection_mode(self.database, 'pool'), 'external_pooler')
+        self.assertTrue(database['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertNotIn('pool', database['OPTIONS'])
+
+    def test_unknown_mode(self):
+        """Test that a typo in DB_CONNECTION_MODE fails loudly"""
+        with self.assertRaises(ImproperlyConfigured):
+            apply_connection_mode(self.database, 'pooled')
+
+
+class FakeBucket:
+    def __init__(self, name):
+        self.name = name
+
+    def get_public_url(self, path):
+        return f"https://storage.test/{self.name}/{path}"
+
+
+class FakeStorageClient:
+    def from_(self, bucket):
+        return FakeBucket(bucket)
+
+
+class FakeSupabase:
+    storage = FakeStorageClient()
+
+
+class SupabaseClientRegistryTestCase(SimpleTestCase):
+    def setUp(self):
+        supabase_client.clear_supabase_clients()
+        # A stub factory, so the registry is tested without Supabase credentials
+        self.created = []
+        patcher = mock.patch.object(supabase_client, '_create_client', side_effect=self._create_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        supabase_client.clear_supabase_clients()
+
+    def _create_client(self, role):
+        client = SimpleNamespace(role=role)
+        self.created.append(client)
+        return client
+
+    def test_client_is_created_once_per_process(self):
+        """Test that concurrent lookups share one lazily created client"""
+        barrier = threading.Barrier(8)
+        clients = []
+
+        def lookup():
+            barrier.wait()
+            clients.append(supabase_client.get_supabase_client())
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.created, [clients[0]])
+        self.assertTrue(all(client is clients[0] for client in clients))
+        self.assertIsNot(supabase_client.create_supabase_auth_client(), clients[0])
+        self.assertIsNot(supabase_client.get_supabase_admin_client(), clients[0])
+        self.assertEqual(len(self.created), 3)
+
+    def test_fork_resets_registry(self):
+        """Test that a forked worker builds its own client"""
+        parent_client = supabase_client.get_supabase_client()
+        supabase_client._reset_after_fork()
+        self.assertIsNot(supabase_client.get_supabase_client(), parent_client)
+        self.assertEqual(len(self.created), 2)
+
+    def test_override_hook(self):
+        """Test that a fake client can be swapped in for storage URLs"""
+        with supabase_client.override_supabase_client(FakeSupabase()):
+            self.assertEqual(
+                SupabaseStorage('user_profile').url('avatar.png'),
+                'https://storage.test/user_profile/avatar.png'
+            )
+        self.assertNotIsInstance(supabase_client.get_supabase_client(), FakeSupabase)
+
+
+class FakeSignInAuth:
+    def __init__(self, user):
+        self.user = user
+
+    def sign_in_with_password(self, credentials):
+        return SimpleNamespace(user=SimpleNamespace(id=self.user.id, email_confirmed_at='2025-01-01T00:00:00Z'))
+
+
+class FakeSignInClient:
+    def __init__(self, user):
+        self.auth = FakeSignInAuth(user)
+
+    def table(self, name):
+        raise AssertionError('Admin checks must not query Supabase tables')
+
+
+class LoginRedirectTestCase(TestCase):
+    def _login(self, user):
+        with supabase_client.override_supabase_client(FakeSignInClient(user)):
+            return self.client.post(reverse('login'), {'username': user.email, 'password': 'secret'})
+
+    def test_superuser_goes_to_admin_panel(self):
+        """Test that superusers are sent to the admin panel using the local user row"""
+        admin = User.objects.create_user(username='admin', email='admin@cit.edu', is_superuser=True)
+        self.assertRedirects(self._login(admin), reverse('admin_panel'), fetch_redirect_response=False)
+
+    def test_student_goes_to_index(self):
+        """Test that other users are sent to the home page"""
+        student = User.objects.create_user(username='student', email='student@cit.edu')
+        self.assertRedirects(self._login(student), reverse('index'), fetch_redirect_response=False)
+
+
+class GlobalSearchTestCase(TransactionTestCase):
+    # Sub-searches run on worker threads with their own connections, so the data must be committed
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='searcher', password='testpass123')
+        self.client.login(username='searcher', password='testpass123')
+        self.robotics = Organization.objects.create(name='Robotics Society', description='We build robots.')
+        self.chess = Organization.objects.create(name='Chess Club')
+        OrganizationMember.objects.create(organization=self.robotics, student=self.user, is_approved=True)
+
+        self.fellow = User.objects.create_user(username='rbuilder', first_name='Robin', last_name='Builder')
+        OrganizationMember.objects.create(organization=self.robotics, student=self.fellow, is_approved=True)
+        stranger = User.objects.create_user(username='rchess', first_name='Robin', last_name='Chess')
+        OrganizationMember.objects.create(organization=self.chess, student=stranger, is_approved=True)
+
+        tomorrow = timezone.now() + timedelta(days=1)
+        OrganizationEvent.objects.create(organization=self.robotics, title='Robot Workshop', event_date=tomorrow)
+        OrganizationEvent.objects.create(organization=self.robotics, title='Robot Retrospective', event_date=timezone.now() - timedelta(days=1))
+        OrganizationEvent.objects.create(organization=self.chess, title='Robot Chess Night', event_date=tomorrow)
+
+    def tearDown(self):
+        # Let cut-off searches finish before the test data is flushed, then release
+        # the workers' kept connections so the test database can be dropped
+        executor = search._executor
+        if executor is not None:
+            barrier = threading.Barrier(search.SEARCH_WORKERS)
+
+            def close_connection():
+                # Every worker holds one task at the barrier, so each closes its own connection
+                barrier.wait(timeout=5)
+                connection.close()
+
+            for _ in range(search.SEARCH_WORKERS):
+                executor.submit(close_connection)
+            executor.shutdown(wait=True)
+            search._executor = None
+
+    def test_grouped_results_follow_visibility(self):
+        """Test that events and members are limited to the user's organizations"""
+        data = self.client.get(reverse('global_search'), {'q': 'Robot'}).json()
+        self.assertEqual(data['query'], 'robot')
+        self.assertEqual([org['name'] for org in data['results']['organizations']], ['Robotics Society'])
+        self.assertEqual([event['title'] for event in data['results']['events']], ['Robot Workshop'])
+        self.assertEqual(data['timedOut'], [])
+
+        data = self.client.get(reverse('global_search'), {'q': 'robin'}).json()
+        self.assertEqual([member['username'] for member in data['results']['members']], ['rbuilder'])
+        self.assertEqual(self.client.get(reverse('global_search'), {'limit': 'x'}).status_code, 400)
+
+    def test_recent_queries_are_cached_per_user(self):
+        """Test that repeating a query is answered from the user's recent searches"""
+        first = search.global_search(self.user, 'robot')
+        self.assertFalse(first['cached'])
+        with mock.patch.dict(search.SEARCHES, {t: mock.Mock(side_effect=AssertionError) for t in search.SEARCH_TYPES}):
+            again = search.global_search(self.user, '  ROBOT ')
+        self.assertTrue(again['cached'])
+        self.assertEqual(again['results'], first['results'])
+        self.assertFalse(search.global_search(self.fellow, 'robot')['cached'])
+
+    def test_slow_searches_are_cut_off(self):
+        """Test that a type missing the latency budget is reported instead of awaited"""
+        def slow(user, term, limit):
+            time.sleep(0.5)
+            return []
+
+        with mock.patch.dict(search.SEARCHES, {'members': slow}):
+            started = time.monotonic()
+            data = search.global_search(self.user, 'robot', budget=0.1)
+            self.assertLess(time.monotonic() - started, 0.45)
+        self.assertEqual(data['timedOut'], ['members'])
+        self.assertEqual([org['name'] for org in data['results']['organizations']], ['Robotics Society'])
+        # Partial results are not remembered
+        self.assertFalse(search.global_search(self.user, 'robot')['cached'])
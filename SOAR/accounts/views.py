@@ -5,22 +5,14 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from .forms import StudentRegistrationForm, CustomLoginForm, UserProfileForm
 from .models import User
-from decouple import config
-from django.core.exceptions import ImproperlyConfigured
-
-# Lazy-load Supabase to prevent Windows crashes
-def get_supabase_client():
-    try:
-        from supabase import create_client
-        SUPABASE_URL = config('SUPABASE_URL', default="")
-        SUPABASE_KEY = config('SUPABASE_KEY', default="")
-        if SUPABASE_URL and SUPABASE_KEY:
-            return create_client(SUPABASE_URL, SUPABASE_KEY)
-    except Exception as e:
-        print(f"Supabase initialization failed: {e}")
-    return None
+from SOAR.supabase_client import create_supabase_auth_client
 from SOAR.organization.models import Organization, OrganizationMember, ROLE_MEMBER, Program
+from SOAR.organization.search import search_organizations
+from SOAR.organization.services import ProgramStats, eligible_organizations_q
+from SOAR.organization.tags import filter_by_tags, parse_tags, tag_facets
 from SOAR.event.models import OrganizationEvent, EventRSVP
+from SOAR.event.services import attach_rsvp_summary
+from SOAR.AdminSoar.permissions import is_admin
 from django.db.models import Q
 from django.views.decorators.http import require_http_methods, require_POST
 from django.shortcuts import get_object_or_404
@@ -41,28 +33,17 @@ def index(request):
     show_see_more = total_user_orgs > 3
 
     # Get upcoming events the user is attending (no 7-day cap)
-    user_events = OrganizationEvent.objects.filter(
-        rsvps__user=request.user,
-        rsvps__status='going',
-        event_date__gte=timezone.now()
-    ).distinct().order_by('event_date')
-
-    # Add RSVP data to each event
-    for event in user_events:
-        event.going_count = EventRSVP.objects.filter(event=event, status='going').count()
-        event.interested_count = EventRSVP.objects.filter(event=event, status='interested').count()
-        event.not_going_count = EventRSVP.objects.filter(event=event, status='not_going').count()
-        try:
-            user_rsvp = EventRSVP.objects.get(event=event, user=request.user)
-            event.user_rsvp_status = user_rsvp.status
-        except EventRSVP.DoesNotExist:
-            event.user_rsvp_status = None
-
-        # Get RSVPed users for attendee avatars (limit to 5 for display)
-        event.rsvp_users = EventRSVP.objects.filter(
-            event=event,
-            status='going'
-        ).select_related('user').order_by('date_created')[:5]
+    going_event_ids = EventRSVP.objects.filter(
+        user=request.user,
+        status='going'
+    ).values('event_id')
+    user_events = attach_rsvp_summary(
+        OrganizationEvent.objects.filter(
+            id__in=going_event_ids,
+            event_date__gte=timezone.now()
+        ).select_related('organization').order_by('event_date'),
+        user=request.user
+    )
 
     # Count total available organizations
     total_available_orgs = Organization.objects.count()
@@ -101,6 +82,10 @@ def index(request):
     }
     return render(request, "accounts/index.html", context)
 
+# Most used tags offered as filters on the browse page, besides the selected ones
+ORG_TAG_FACETS_SHOWN = 20
+
+
 @login_required
 def organizations_page(request):
     """Organizations page: show user's joined orgs and allow browsing/joining others."""
@@ -112,29 +97,40 @@ def organizations_page(request):
             "member_count": org.members.filter(is_approved=True).count()
         })
 
-    # Support simple search via ?q=... (searches name and description)
+    # Filter out organizations user is already a member of
+    joined = OrganizationMember.objects.filter(student=request.user, is_approved=True).values('organization_id')
+    all_orgs = Organization.objects.exclude(pk__in=joined)
+
+    # Support search via ?q=... (ranked full-text search over name, tags and description)
     q = request.GET.get('q', '').strip()
     if q:
-        # Only search by organization name (avoid matching description)
-        # Filter out organizations user is already a member of
-        all_orgs = Organization.objects.filter(
-            Q(name__icontains=q)
-        ).exclude(
-            members__student=request.user,
-            members__is_approved=True
-        ).distinct()
-    else:
-        # Filter out organizations user is already a member of
-        all_orgs = Organization.objects.exclude(
-            members__student=request.user,
-            members__is_approved=True
-        ).all()
+        all_orgs = search_organizations(all_orgs, q)
+
+    # Tag filter via ?tag=...&tag=... (organizations carrying every selected tag)
+    selected_tags = parse_tags(request.GET.getlist('tag'))
+    all_orgs = filter_by_tags(all_orgs, selected_tags)
+
+    # ?eligible=1 keeps only organizations the user's program may join
+    eligible_only = request.GET.get('eligible') == '1'
+    if eligible_only:
+        all_orgs = all_orgs.filter(eligible_organizations_q(request.user.course_id))
+    course_id = request.user.course_id
+    eligible_org_count = ProgramStats.for_program(course_id)['eligible_org_count'] if course_id else None
+    facets = [
+        {'tag': tag, 'count': count, 'selected': tag in selected_tags}
+        for tag, count in tag_facets()
+    ]
+    facets = [f for f in facets if f['selected']] + [f for f in facets if not f['selected']][:ORG_TAG_FACETS_SHOWN]
 
     return render(request, "organization/organizations_page.html", {
         "org_data": org_data,
         "all_orgs": all_orgs,
         "user_orgs": user_orgs,
         "q": q,
+        "selected_tags": selected_tags,
+        "tag_facets": facets,
+        "eligible_only": eligible_only,
+        "eligible_org_count": eligible_org_count,
     })
 
 @login_required
@@ -160,9 +156,6 @@ def profile(request):
 def members_management(request):
     return render(request, "accounts/members_management.html")
 
-SUPABASE_URL = config("SUPABASE_URL", default=None)
-# Remove duplicate initialization - using get_supabase_client() instead
-
 def register(request):
     if request.method == "POST":
         form = StudentRegistrationForm(request.POST)
@@ -182,7 +175,7 @@ def register(request):
                 return render(request, "accounts/register.html", {"form": form})
 
             try:
-                supabase = get_supabase_client()
+                supabase = create_supabase_auth_client()
                 if not supabase:
                     messages.error(request, "Supabase service is not available.")
                     return render(request, "accounts/register.html", {"form": form})
@@ -334,7 +327,7 @@ def login_view(request):
             email = username if username and '@' in username else f"{username}@cit.edu"
 
             try:
-                supabase = get_supabase_client()
+                supabase = create_supabase_auth_client()
                 if not supabase:
                     messages.error(request, "Authentication service is not available.")
                     return render(request, "accounts/login.html", {"form": form})
@@ -379,10 +372,8 @@ def login_view(request):
                         login(request, user_obj, backend='django.contrib.auth.backends.ModelBackend')
                         #messages.success(request, f"Welcome back, {user_obj.username}!")
 
-                        # Check if user is superuser from Supabase
-                        response = supabase.table('accounts_user').select('is_superuser').eq('id', str(user_obj.id)).execute()
-                        is_superuser = response.data[0]['is_superuser'] if response.data else False
-                        if is_superuser:
+                        # Superusers land on the admin panel; the flag comes from the local user row
+                        if is_admin(request, superuser=True):
                             return redirect('admin_panel')
                         else:
                             return redirect('index')
@@ -400,7 +391,7 @@ def login_view(request):
 def logout_view(request):
     # Sign out from Supabase first
     try:
-        supabase = get_supabase_client()
+        supabase = create_supabase_auth_client()
         if supabase:
             supabase.auth.sign_out()
     except Exception as e:
@@ -426,6 +417,12 @@ def organization_view(request):
 def join_org(request, org_id):
     organization = get_object_or_404(Organization, id=org_id)
     already_member = OrganizationMember.objects.filter(organization=organization, student=request.user).exists()
+    if not already_member and not organization.can_join(request.user):
+        message = f"{organization.name} is only open to students of its allowed programs."
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({'success': False, 'message': message}, status=403)
+        messages.error(request, message)
+        return redirect('index')
     if not already_member:
         OrganizationMember.objects.create(
             organization=organization,
@@ -0,0 +1,47 @@
+"""Database connection strategies, selected with the DB_CONNECTION_MODE environment variable.
+
+- ``close``: open a new connection for every request (Django's default).
+- ``persistent``: keep each worker's connection open for DB_CONN_MAX_AGE
+  seconds and check it is still alive before reusing it.
+- ``pool``: use Django's native psycopg connection pool (needs psycopg[pool]).
+- ``external_pooler``: for PgBouncer or the Supabase transaction pooler;
+  persistent connections to the pooler with server-side cursors disabled,
+  since they do not survive transaction-level pooling.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+CONNECTION_MODES = ('close', 'persistent', 'pool', 'external_pooler')
+
+
+def apply_connection_mode(database, mode, conn_max_age=60, pool_min_size=2, pool_max_size=10, pool_timeout=10):
+    """Return a copy of a DATABASES entry configured for the given connection mode."""
+    if mode not in CONNECTION_MODES:
+        raise ImproperlyConfigured(
+            f"DB_CONNECTION_MODE must be one of {', '.join(CONNECTION_MODES)}, got {mode!r}."
+        )
+
+    database = dict(database)
+    options = dict(database.get('OPTIONS', {}))
+    options.pop('pool', None)
+    database.update({
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        'DISABLE_SERVER_SIDE_CURSORS': False,
+    })
+
+    if mode in ('persistent', 'external_pooler'):
+        database['CONN_MAX_AGE'] = conn_max_age
+        database['CONN_HEALTH_CHECKS'] = True
+    if mode == 'external_pooler':
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    if mode == 'pool':
+        # The pool owns connection lifetime, so CONN_MAX_AGE must stay 0
+        database['CONN_HEALTH_CHECKS'] = True
+        options['pool'] = {
+            'min_size': pool_min_size,
+            'max_size': pool_max_size,
+            'timeout': pool_timeout,
+        }
+
+    database['OPTIONS'] = options
+    return database
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import OrganizationEvent, EventRSVP
+from .models import OrganizationEvent, EventRSVP, EventWaitlistEntry
 # Register your models here.
 @admin.register(OrganizationEvent)
 class OrganizationEventAdmin(admin.ModelAdmin):
@@ -10,4 +10,8 @@ class OrganizationEventAdmin(admin.ModelAdmin):
 class EventRSVPAdmin(admin.ModelAdmin):
     list_display = ('user', 'event', 'status', 'date_created')
     search_fields = ('user__username', 'event__title', 'status')
-    list_filter = ('status', 'date_created')
\ No newline at end of file
+    list_filter = ('status', 'date_created')
+@admin.register(EventWaitlistEntry)
+class EventWaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event', 'date_created')
+    search_fields = ('user__username', 'event__title')
@@ -5,3 +5,6 @@ class EventConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'SOAR.event'
     app_label = 'event'
+
+    def ready(self):
+        from . import signals
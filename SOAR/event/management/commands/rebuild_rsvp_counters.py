@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from SOAR.event.models import OrganizationEvent
+from SOAR.event.services import rebuild_rsvp_counters
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized RSVP counters on every event from the EventRSVP table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            action='append',
+            dest='event_ids',
+            help='Only rebuild the given event id (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        events = OrganizationEvent.objects.all()
+        if options['event_ids']:
+            events = events.filter(id__in=options['event_ids'])
+
+        with transaction.atomic():
+            # Lock the rows so concurrent RSVPs wait for the rebuild instead of being overwritten
+            list(events.select_for_update().values_list('id', flat=True))
+            updated = rebuild_rsvp_counters(events)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt RSVP counters for {updated} event(s)'))
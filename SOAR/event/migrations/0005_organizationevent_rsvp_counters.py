@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+COUNTER_FIELDS = {
+    'going': 'going_count',
+    'interested': 'interested_count',
+    'not_going': 'not_going_count',
+}
+
+
+def populate_rsvp_counters(apps, schema_editor):
+    OrganizationEvent = apps.get_model('event', 'OrganizationEvent')
+    EventRSVP = apps.get_model('event', 'EventRSVP')
+
+    def status_count(status):
+        counts = EventRSVP.objects.filter(
+            event=OuterRef('pk'),
+            status=status
+        ).order_by().values('event').annotate(total=Count('id')).values('total')
+        return Coalesce(Subquery(counts), 0)
+
+    OrganizationEvent.objects.update(**{
+        field: status_count(status)
+        for status, field in COUNTER_FIELDS.items()
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0004_organizationevent_cancelled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organizationevent',
+            name='going_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='organizationevent',
+            name='interested_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='organizationevent',
+            name='not_going_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_rsvp_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0006_eventwaitlistentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizationevent',
+            index=models.Index(fields=['organization', 'event_date'], name='event_org_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventrsvp',
+            index=models.Index(fields=['event', 'status', 'date_created'], name='eventrsvp_event_status_idx'),
+        ),
+    ]
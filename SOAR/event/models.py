@@ -25,9 +25,33 @@ class OrganizationEvent(models.Model):
     attachments_url = models.URLField(blank=True, null=True)
     cancelled = models.BooleanField(default=False)
 
+    # Denormalized RSVP totals, kept in sync by SOAR.event.signals
+    going_count = models.PositiveIntegerField(default=0)
+    interested_count = models.PositiveIntegerField(default=0)
+    not_going_count = models.PositiveIntegerField(default=0)
+
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     date_created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Org calendars and upcoming-event lists: WHERE organization_id = ? ORDER BY event_date
+            models.Index(fields=['organization', 'event_date'], name='event_org_date_idx'),
+        ]
+
+    # Written only by the F() updates in SOAR.event.signals and rebuild_rsvp_counters
+    COUNTER_COLUMNS = ('going_count', 'interested_count', 'not_going_count')
+
+    def save(self, *args, **kwargs):
+        # A full save of a loaded instance would write its stale counters back
+        # over RSVPs counted since it was read, so leave them out
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_COLUMNS
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def status(self):
         from django.utils import timezone
@@ -59,9 +83,42 @@ class EventRSVP(models.Model):
     status = models.CharField(max_length=20, choices=RSVP_STATUS_CHOICES)
     date_created = models.DateTimeField(auto_now_add=True)
 
+    # Maps an RSVP status to the OrganizationEvent counter column it contributes to
+    COUNTER_FIELDS = {
+        'going': 'going_count',
+        'interested': 'interested_count',
+        'not_going': 'not_going_count',
+    }
+
     class Meta:
         app_label = 'event'
         unique_together = ('event', 'user')  # A user can only RSVP once per event
+        indexes = [
+            # Attendee lists: WHERE event_id = ? AND status = ? ORDER BY date_created
+            models.Index(fields=['event', 'status', 'date_created'], name='eventrsvp_event_status_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so counter updates know what changed
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        return instance
 
     def __str__(self):
         return f"{self.user.username} - {self.get_status_display()} ({self.event.title})"
+
+class EventWaitlistEntry(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event = models.ForeignKey('OrganizationEvent', on_delete=models.CASCADE, related_name='waitlist')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='event_waitlist_entries')
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'event'
+        unique_together = ('event', 'user')
+        ordering = ['date_created', 'id']  # First come, first served
+
+    def __str__(self):
+        return f"{self.user.username} waitlisted for {self.event.title}"
@@ -0,0 +1,29 @@
+from django.contrib.postgres.search import SearchRank, SearchVector
+from django.db.models import F
+
+from SOAR.organization.search import SEARCH_CONFIG, prefix_query
+
+
+def event_search_vector():
+    """Weighted document for an event: title (A), location (B), description (C)."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('location', weight='B', config=SEARCH_CONFIG) +
+        SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def search_events(queryset, term):
+    """Filter `queryset` to events matching `term`, best matches first, then soonest.
+
+    The document is computed per row rather than stored, so callers should
+    narrow the queryset first (e.g. to upcoming events of the user's
+    organizations, which the organization/date index serves). Adds a `rank`
+    annotation.
+    """
+    query = prefix_query(term)
+    if query is None:
+        return queryset.none()
+    return queryset.annotate(document=event_search_vector()).filter(document=query).annotate(
+        rank=SearchRank(F('document'), query)
+    ).order_by('-rank', 'event_date')
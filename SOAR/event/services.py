@@ -0,0 +1,176 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from SOAR.event.models import OrganizationEvent, EventRSVP, EventWaitlistEntry
+from SOAR.notification.models import Notification
+
+# Number of attendee avatars shown on event cards
+DEFAULT_ATTENDEE_LIMIT = 5
+
+
+def with_rsvp_summary(queryset, user=None):
+    """Annotate an event queryset with the viewer's RSVP status.
+
+    RSVP totals are read from the denormalized counter columns on the event.
+    """
+    if user is not None and user.is_authenticated:
+        user_rsvp = EventRSVP.objects.filter(event=OuterRef('pk'), user=user).values('status')[:1]
+        queryset = queryset.annotate(user_rsvp_status=Subquery(user_rsvp))
+    return queryset
+
+
+def get_attendees_by_event(event_ids, limit=DEFAULT_ATTENDEE_LIMIT):
+    """Return the first `limit` 'going' RSVPs per event, keyed by event id, in one query."""
+    event_ids = list(event_ids)
+    attendees = {event_id: [] for event_id in event_ids}
+    if not event_ids or limit <= 0:
+        return attendees
+
+    rsvps = EventRSVP.objects.filter(
+        event_id__in=event_ids,
+        status='going'
+    ).annotate(
+        position=Window(
+            expression=RowNumber(),
+            partition_by=[F('event_id')],
+            order_by=[F('date_created').asc(), F('id').asc()],
+        )
+    ).filter(position__lte=limit).select_related('user').order_by('event_id', 'position')
+
+    for rsvp in rsvps:
+        attendees[rsvp.event_id].append(rsvp)
+    return attendees
+
+
+def attach_rsvp_summary(queryset, user=None, attendee_limit=DEFAULT_ATTENDEE_LIMIT):
+    """Evaluate an event queryset and attach RSVP data for templates.
+
+    Each event gets `going_count`, `interested_count`, `not_going_count`,
+    `user_rsvp_status` and `rsvp_users` (first going RSVPs, with users loaded).
+    Runs two queries regardless of the number of events.
+    """
+    events = list(with_rsvp_summary(queryset, user=user))
+    attendees = get_attendees_by_event([event.id for event in events], limit=attendee_limit)
+    for event in events:
+        if not hasattr(event, 'user_rsvp_status'):
+            event.user_rsvp_status = None
+        event.rsvp_users = attendees[event.id]
+    return events
+
+
+def rebuild_rsvp_counters(queryset=None):
+    """Recompute the RSVP counter columns from EventRSVP rows in a single UPDATE."""
+    if queryset is None:
+        queryset = OrganizationEvent.objects.all()
+
+    def status_count(status):
+        counts = EventRSVP.objects.filter(
+            event=OuterRef('pk'),
+            status=status
+        ).order_by().values('event').annotate(total=Count('id')).values('total')
+        return Coalesce(Subquery(counts), 0)
+
+    return queryset.update(**{
+        field: status_count(status)
+        for status, field in EventRSVP.COUNTER_FIELDS.items()
+    })
+
+
+def get_waitlist_position(event, user):
+    """Return the 1-based waitlist position of a user, or None if not waitlisted."""
+    entry = EventWaitlistEntry.objects.filter(event=event, user=user).first()
+    if not entry:
+        return None
+    ahead = EventWaitlistEntry.objects.filter(event=event).filter(
+        Q(date_created__lt=entry.date_created) |
+        Q(date_created=entry.date_created, id__lt=entry.id)
+    ).count()
+    return ahead + 1
+
+
+def promote_from_waitlist(event):
+    """Move waitlisted users into free 'going' spots, oldest first.
+
+    Must be called inside a transaction holding the event row lock.
+    Returns the list of promoted users.
+    """
+    event.refresh_from_db(fields=['going_count', 'max_participants'])
+    entries = event.waitlist.select_related('user')
+    if event.max_participants:
+        free_spots = event.max_participants - event.going_count
+        if free_spots <= 0:
+            return []
+        entries = entries[:free_spots]
+    entries = list(entries)
+    if not entries:
+        return []
+
+    for entry in entries:
+        EventRSVP.objects.update_or_create(event=event, user=entry.user, defaults={'status': 'going'})
+    EventWaitlistEntry.objects.filter(id__in=[entry.id for entry in entries]).delete()
+
+    message = f"🎉 A spot opened up! You are now going to '{event.title}' in {event.organization.name}."
+    Notification.objects.bulk_create([
+        Notification(
+            user=entry.user,
+            message=message,
+            notification_type=Notification.TYPE_EVENT,
+            priority=Notification.PRIORITY_HIGH,
+            link=f"/event/{event.id}/"
+        )
+        for entry in entries
+    ])
+    return [entry.user for entry in entries]
+
+
+def set_rsvp_status(event_id, user, status):
+    """Record a user's RSVP with capacity enforced under a lock on the event row.
+
+    A 'going' RSVP for a full event puts the user on the waitlist instead.
+    Leaving 'going' frees a spot, which is handed to the waitlist in order.
+    Returns a dict with the resulting `status` ('waitlisted' when queued),
+    `waitlist_position` and the list of `promoted` users.
+    """
+    with transaction.atomic():
+        event = OrganizationEvent.objects.select_for_update().get(id=event_id)
+        rsvp = EventRSVP.objects.filter(event=event, user=user).first()
+        previous_status = rsvp.status if rsvp else None
+
+        is_full = event.max_participants and event.going_count >= event.max_participants
+        if status == 'going' and previous_status != 'going' and is_full:
+            EventWaitlistEntry.objects.get_or_create(event=event, user=user)
+            return {
+                'status': 'waitlisted',
+                'waitlist_position': get_waitlist_position(event, user),
+                'promoted': [],
+            }
+
+        if rsvp is None:
+            EventRSVP.objects.create(event=event, user=user, status=status)
+        elif previous_status != status:
+            rsvp.status = status
+            rsvp.save(update_fields=['status'])
+
+        # Any explicit answer replaces an earlier waitlist request
+        EventWaitlistEntry.objects.filter(event=event, user=user).delete()
+
+        promoted = []
+        if previous_status == 'going' and status != 'going':
+            promoted = promote_from_waitlist(event)
+
+    return {'status': status, 'waitlist_position': None, 'promoted': promoted}
+
+
+def cancel_rsvp(rsvp):
+    """Delete an RSVP and hand a freed 'going' spot to the waitlist."""
+    with transaction.atomic():
+        event = OrganizationEvent.objects.select_for_update().get(id=rsvp.event_id)
+        # Re-read under the lock: the status may have changed, or the row gone, since `rsvp` was loaded
+        rsvp = EventRSVP.objects.filter(pk=rsvp.pk).first()
+        if rsvp is None:
+            return
+        was_going = rsvp.status == 'going'
+        rsvp.delete()
+        if was_going:
+            promote_from_waitlist(event)
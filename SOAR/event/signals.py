@@ -0,0 +1,42 @@
+# event/signals.py
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import OrganizationEvent, EventRSVP
+
+
+def adjust_rsvp_counters(event_id, increment=None, decrement=None):
+    """Atomically move one RSVP between the counter columns of an event."""
+    changes = {}
+    if increment in EventRSVP.COUNTER_FIELDS:
+        field = EventRSVP.COUNTER_FIELDS[increment]
+        changes[field] = F(field) + 1
+    if decrement in EventRSVP.COUNTER_FIELDS:
+        field = EventRSVP.COUNTER_FIELDS[decrement]
+        changes[field] = F(field) - 1
+    if changes:
+        OrganizationEvent.objects.filter(id=event_id).update(**changes)
+
+
+@receiver(pre_save, sender=EventRSVP)
+def remember_previous_rsvp_status(sender, instance, raw=False, **kwargs):
+    # Instances not loaded through the ORM (e.g. built with an explicit pk) need a lookup
+    if raw or instance._state.adding or hasattr(instance, '_loaded_status'):
+        return
+    instance._loaded_status = EventRSVP.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=EventRSVP)
+def update_counters_on_rsvp_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_status = None if created else getattr(instance, '_loaded_status', None)
+    if previous_status != instance.status:
+        adjust_rsvp_counters(instance.event_id, increment=instance.status, decrement=previous_status)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=EventRSVP)
+def update_counters_on_rsvp_delete(sender, instance, **kwargs):
+    # Also runs for cascade deletes (event, user) since signals are sent per collected row
+    adjust_rsvp_counters(instance.event_id, decrement=getattr(instance, '_loaded_status', instance.status))
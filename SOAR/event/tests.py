@@ -1,3 +1,322 @@
-from django.test import TestCase
+import threading
+import unittest
+from datetime import timedelta
+from io import StringIO
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from SOAR.notification.models import Notification
+from SOAR.organization.models import Organization, OrganizationMember, ROLE_LEADER
+from .models import OrganizationEvent, EventRSVP, EventWaitlistEntry
+from .services import attach_rsvp_summary, set_rsvp_status, cancel_rsvp
 
-# Create your tests here.
+User = get_user_model()
+
+
+class RSVPSummaryTestCase(TestCase):
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer', password='testpass123')
+        self.organization = Organization.objects.create(name='Test Organization', is_public=True)
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='testpass123')
+            for i in range(8)
+        ]
+
+    def _create_event(self, title):
+        return OrganizationEvent.objects.create(
+            organization=self.organization,
+            title=title,
+            event_date=timezone.now() + timedelta(days=1)
+        )
+
+    def test_counts_status_and_attendees(self):
+        """Test that counts, viewer status and attendee preview are attached to each event"""
+        event = self._create_event('Workshop')
+        for user in self.users[:6]:
+            EventRSVP.objects.create(event=event, user=user, status='going')
+        EventRSVP.objects.create(event=event, user=self.users[6], status='interested')
+        EventRSVP.objects.create(event=event, user=self.users[7], status='not_going')
+        EventRSVP.objects.create(event=event, user=self.viewer, status='interested')
+        empty_event = self._create_event('Meeting')
+
+        events = attach_rsvp_summary(
+            OrganizationEvent.objects.filter(organization=self.organization).order_by('title'),
+            user=self.viewer
+        )
+        summary = {e.id: e for e in events}
+
+        self.assertEqual(summary[event.id].going_count, 6)
+        self.assertEqual(summary[event.id].interested_count, 2)
+        self.assertEqual(summary[event.id].not_going_count, 1)
+        self.assertEqual(summary[event.id].user_rsvp_status, 'interested')
+        self.assertEqual(
+            [rsvp.user for rsvp in summary[event.id].rsvp_users],
+            self.users[:5]
+        )
+        self.assertEqual(summary[empty_event.id].going_count, 0)
+        self.assertIsNone(summary[empty_event.id].user_rsvp_status)
+        self.assertEqual(summary[empty_event.id].rsvp_users, [])
+
+    def test_query_count_is_constant(self):
+        """Test that the summary uses the same number of queries for any number of events"""
+        for i in range(20):
+            event = self._create_event(f'Event {i}')
+            for user in self.users[:3]:
+                EventRSVP.objects.create(event=event, user=user, status='going')
+
+        queryset = OrganizationEvent.objects.filter(organization=self.organization)
+        with self.assertNumQueries(2):
+            events = attach_rsvp_summary(queryset, user=self.viewer)
+            for event in events:
+                for rsvp in event.rsvp_users:
+                    rsvp.user.username
+
+
+class RSVPCounterTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Test Organization', is_public=True)
+        self.event = OrganizationEvent.objects.create(
+            organization=self.organization,
+            title='Workshop',
+            event_date=timezone.now() + timedelta(days=1)
+        )
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other = User.objects.create_user(username='otheruser', password='testpass123')
+
+    def assertCounters(self, going, interested, not_going):
+        self.event.refresh_from_db()
+        self.assertEqual(
+            (self.event.going_count, self.event.interested_count, self.event.not_going_count),
+            (going, interested, not_going)
+        )
+
+    def test_counters_follow_create_update_and_delete(self):
+        """Test that counters track RSVP creation, status changes and deletion"""
+        rsvp = EventRSVP.objects.create(event=self.event, user=self.user, status='going')
+        EventRSVP.objects.create(event=self.event, user=self.other, status='interested')
+        self.assertCounters(1, 1, 0)
+
+        rsvp = EventRSVP.objects.get(id=rsvp.id)
+        rsvp.status = 'not_going'
+        rsvp.save()
+        self.assertCounters(0, 1, 1)
+
+        rsvp.delete()
+        self.assertCounters(0, 1, 0)
+
+    def test_counters_follow_cascade_delete(self):
+        """Test that deleting a user removes their RSVP from the counters"""
+        EventRSVP.objects.create(event=self.event, user=self.user, status='going')
+        EventRSVP.objects.create(event=self.event, user=self.other, status='going')
+        self.user.delete()
+        self.assertCounters(1, 0, 0)
+
+    def test_saving_a_stale_event_keeps_counters(self):
+        """Test that saving an event loaded before an RSVP does not overwrite its counters"""
+        stale = OrganizationEvent.objects.get(id=self.event.id)
+        EventRSVP.objects.create(event=self.event, user=self.user, status='going')
+        stale.title = 'Renamed Workshop'
+        stale.save()
+        self.assertCounters(1, 0, 0)
+        self.assertEqual(self.event.title, 'Renamed Workshop')
+
+    def test_rebuild_command_repairs_drift(self):
+        """Test that rebuild_rsvp_counters recomputes counters from RSVP rows"""
+        EventRSVP.objects.create(event=self.event, user=self.user, status='going')
+        OrganizationEvent.objects.filter(id=self.event.id).update(going_count=7, not_going_count=3)
+
+        call_command('rebuild_rsvp_counters', stdout=StringIO())
+        self.assertCounters(1, 0, 0)
+
+
+class RSVPWaitlistTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Test Organization', is_public=True)
+        self.event = OrganizationEvent.objects.create(
+            organization=self.organization,
+            title='Workshop',
+            event_date=timezone.now() + timedelta(days=1),
+            max_participants=1
+        )
+        self.first = User.objects.create_user(username='first', password='testpass123')
+        self.second = User.objects.create_user(username='second', password='testpass123')
+        self.third = User.objects.create_user(username='third', password='testpass123')
+
+    def test_full_event_waitlists_in_order(self):
+        """Test that RSVPs beyond capacity are queued in arrival order"""
+        self.assertEqual(set_rsvp_status(self.event.id, self.first, 'going')['status'], 'going')
+
+        second = set_rsvp_status(self.event.id, self.second, 'going')
+        third = set_rsvp_status(self.event.id, self.third, 'going')
+        self.assertEqual((second['status'], second['waitlist_position']), ('waitlisted', 1))
+        self.assertEqual((third['status'], third['waitlist_position']), ('waitlisted', 2))
+        self.assertFalse(EventRSVP.objects.filter(event=self.event, user=self.second).exists())
+
+    def test_dropping_out_promotes_next_in_line(self):
+        """Test that leaving 'going' promotes the oldest waitlisted user and notifies them"""
+        set_rsvp_status(self.event.id, self.first, 'going')
+        set_rsvp_status(self.event.id, self.second, 'going')
+        set_rsvp_status(self.event.id, self.third, 'going')
+
+        result = set_rsvp_status(self.event.id, self.first, 'not_going')
+
+        self.assertEqual(result['promoted'], [self.second])
+        self.assertEqual(EventRSVP.objects.get(event=self.event, user=self.second).status, 'going')
+        self.assertEqual(list(self.event.waitlist.values_list('user', flat=True)), [self.third.id])
+        self.assertTrue(Notification.objects.filter(user=self.second, link=f"/event/{self.event.id}/").exists())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.going_count, 1)
+
+    def test_cancel_rsvp_promotes(self):
+        """Test that deleting a going RSVP hands the spot to the waitlist"""
+        set_rsvp_status(self.event.id, self.first, 'going')
+        set_rsvp_status(self.event.id, self.second, 'going')
+
+        cancel_rsvp(EventRSVP.objects.get(event=self.event, user=self.first))
+
+        self.assertEqual(EventRSVP.objects.get(event=self.event, user=self.second).status, 'going')
+        self.assertFalse(EventWaitlistEntry.objects.exists())
+
+    def test_cancel_rsvp_reads_status_under_lock(self):
+        """Test that cancelling a stale RSVP uses its current status and ignores rows already gone"""
+        set_rsvp_status(self.event.id, self.first, 'interested')
+        stale = EventRSVP.objects.get(event=self.event, user=self.first)
+        set_rsvp_status(self.event.id, self.first, 'going')
+        set_rsvp_status(self.event.id, self.second, 'going')
+
+        cancel_rsvp(stale)
+        cancel_rsvp(stale)
+
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.going_count, self.event.interested_count), (1, 0))
+        self.assertEqual(EventRSVP.objects.get(event=self.event, user=self.second).status, 'going')
+
+    def test_other_answer_leaves_waitlist(self):
+        """Test that answering 'interested' removes a pending waitlist request"""
+        set_rsvp_status(self.event.id, self.first, 'going')
+        set_rsvp_status(self.event.id, self.second, 'going')
+
+        set_rsvp_status(self.event.id, self.second, 'interested')
+
+        self.assertFalse(EventWaitlistEntry.objects.filter(user=self.second).exists())
+        self.assertEqual(EventRSVP.objects.get(event=self.event, user=self.second).status, 'interested')
+
+    def test_raising_capacity_promotes(self):
+        """Test that editing an event to a larger capacity admits waitlisted users"""
+        leader = User.objects.create_user(username='leader', password='testpass123')
+        OrganizationMember.objects.create(organization=self.organization, student=leader, role=ROLE_LEADER, is_approved=True)
+        set_rsvp_status(self.event.id, self.first, 'going')
+        set_rsvp_status(self.event.id, self.second, 'going')
+
+        self.client.login(username='leader', password='testpass123')
+        self.client.post(reverse('edit_event', args=[self.event.id]), {
+            'title': 'Bigger Workshop', 'description': '', 'date': '2099-01-01', 'time': '10:00',
+            'location': 'Hall', 'type': 'workshop', 'max_participants': '2',
+        })
+
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.title, self.event.max_participants), ('Bigger Workshop', 2))
+        self.assertEqual(EventRSVP.objects.get(event=self.event, user=self.second).status, 'going')
+        self.assertEqual(self.event.going_count, 2)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class RSVPConcurrencyTestCase(TransactionTestCase):
+    THREADS = 20
+    CAPACITY = 5
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Test Organization', is_public=True)
+        self.event = OrganizationEvent.objects.create(
+            organization=self.organization,
+            title='Popular Workshop',
+            event_date=timezone.now() + timedelta(days=1),
+            max_participants=self.CAPACITY
+        )
+        self.clients = []
+        for i in range(self.THREADS):
+            user = User.objects.create_user(username=f'student{i}', password='testpass123')
+            OrganizationMember.objects.create(organization=self.organization, student=user, is_approved=True)
+            client = Client()
+            client.force_login(user)
+            self.clients.append(client)
+
+    def test_concurrent_rsvps_never_overbook(self):
+        """Test that N simultaneous 'going' RSVPs fill exactly max_participants spots"""
+        url = reverse('rsvp_event', kwargs={'event_id': self.event.id})
+        barrier = threading.Barrier(self.THREADS)
+        responses = []
+
+        def rsvp(client):
+            try:
+                barrier.wait()
+                response = client.post(url, {'status': 'going'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+                responses.append(response.json())
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=rsvp, args=(client,)) for client in self.clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(responses), self.THREADS)
+        self.assertEqual(sum(1 for r in responses if r.get('success')), self.CAPACITY)
+        self.assertEqual(sum(1 for r in responses if r.get('waitlisted')), self.THREADS - self.CAPACITY)
+        self.assertEqual(EventRSVP.objects.filter(event=self.event, status='going').count(), self.CAPACITY)
+        self.assertEqual(self.event.waitlist.count(), self.THREADS - self.CAPACITY)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.going_count, self.CAPACITY)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'EXPLAIN plans are PostgreSQL-specific')
+class QueryIndexTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.organization = Organization.objects.create(name='Test Organization', is_public=True)
+        self.event = OrganizationEvent.objects.create(
+            organization=self.organization,
+            title='Workshop',
+            event_date=timezone.now() + timedelta(days=1)
+        )
+        # The test tables are tiny, so make the planner prefer any usable index
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_key_queries_use_indexes(self):
+        """Test that the hot view queries are answered by the composite and partial indexes"""
+        self.assertUsesIndex(
+            Notification.objects.filter(user=self.user)[:10],
+            'notification_user_created_idx'
+        )
+        self.assertUsesIndex(
+            Notification.objects.filter(user=self.user, is_read=False),
+            'notification_user_unread_idx'
+        )
+        self.assertUsesIndex(
+            OrganizationMember.objects.filter(student=self.user, is_approved=True),
+            'orgmember_student_approved_idx'
+        )
+        self.assertUsesIndex(
+            OrganizationMember.objects.filter(organization=self.organization, role=ROLE_LEADER),
+            'orgmember_org_role_idx'
+        )
+        self.assertUsesIndex(
+            EventRSVP.objects.filter(event=self.event, status='going').order_by('date_created'),
+            'eventrsvp_event_status_idx'
+        )
+        self.assertUsesIndex(
+            OrganizationEvent.objects.filter(
+                organization=self.organization,
+                event_date__gte=timezone.now()
+            ).order_by('event_date'),
+            'event_org_date_idx'
+        )
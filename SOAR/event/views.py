@@ -1,19 +1,10 @@
 from django.shortcuts import render
-from django.conf import settings
 import uuid
-
-# Lazy-load Supabase to prevent Windows crashes
-def get_supabase_client():
-    try:
-        from supabase import create_client
-        if hasattr(settings, 'SUPABASE_URL') and hasattr(settings, 'SUPABASE_KEY'):
-            return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    except Exception as e:
-        print(f"Supabase initialization failed: {e}")
-    return None
+from SOAR.supabase_client import get_supabase_client
 
 from django.utils.text import slugify
-from SOAR.notification.models import Notification
+from SOAR.notification.models import Notification, NotificationJob
+from SOAR.notification.jobs import enqueue_fanout
 
 def upload_to_supabase(file, org_id, org_name):
     # Get Supabase client
@@ -53,12 +44,14 @@ def upload_to_supabase(file, org_id, org_name):
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from SOAR.event.models import OrganizationEvent, EventRSVP
+from SOAR.event.services import attach_rsvp_summary, set_rsvp_status, promote_from_waitlist
 from SOAR.organization.models import Organization, OrganizationMember
 from datetime import datetime
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.views.decorators.http import require_POST
+from django.db import transaction
 from django.utils import timezone
 
 @login_required
@@ -71,50 +64,33 @@ def global_event_page(request):
     ).values_list('organization', flat=True))
 
     # Get upcoming events ONLY from organizations the user has joined
-    all_events = list(OrganizationEvent.objects.filter(
-        event_date__gte=timezone.now(),
-        organization_id__in=user_organization_ids
-    ).order_by('event_date').prefetch_related('organization__allowed_programs'))
+    all_events = attach_rsvp_summary(
+        OrganizationEvent.objects.filter(
+            event_date__gte=timezone.now(),
+            organization_id__in=user_organization_ids
+        ).order_by('event_date').select_related('organization').prefetch_related('organization__allowed_programs'),
+        user=request.user
+    )
 
     # Create event data dictionary
     events_data = {}
     for event in all_events:
-        going_count = EventRSVP.objects.filter(event=event, status='going').count()
-        interested_count = EventRSVP.objects.filter(event=event, status='interested').count()
-        not_going_count = EventRSVP.objects.filter(event=event, status='not_going').count()
         is_user_member = event.organization.id in user_organization_ids
-
-        user_rsvp_status = None
-        if is_user_member:
-            try:
-                user_rsvp = EventRSVP.objects.get(event=event, user=request.user)
-                user_rsvp_status = user_rsvp.status
-            except EventRSVP.DoesNotExist:
-                pass
-
-        # Get RSVPed users for attendee avatars (limit to 5 for display)
-        rsvp_users = EventRSVP.objects.filter(
-            event=event,
-            status='going'
-        ).select_related('user').order_by('date_created')[:5]
+        if not is_user_member:
+            event.user_rsvp_status = None
 
         events_data[str(event.id)] = {
             'event': event,
-            'going_count': going_count,
-            'interested_count': interested_count,
-            'not_going_count': not_going_count,
-            'user_rsvp_status': user_rsvp_status,
+            'going_count': event.going_count,
+            'interested_count': event.interested_count,
+            'not_going_count': event.not_going_count,
+            'user_rsvp_status': event.user_rsvp_status,
             'is_user_member': is_user_member,
-            'rsvp_users': rsvp_users
+            'rsvp_users': event.rsvp_users
         }
 
         # Set attributes on event object for template compatibility
-        event.going_count = going_count
-        event.interested_count = interested_count
-        event.not_going_count = not_going_count
-        event.user_rsvp_status = user_rsvp_status
         event.is_user_member = is_user_member
-        event.rsvp_users = rsvp_users
 
     # Get events only from joined organizations for the calendar
     calendar_events = [event for event in all_events if event.organization.id in user_organization_ids]
@@ -233,29 +209,17 @@ def create_event(request, org_id):
             total_events = OrganizationEvent.objects.count()
             print(f"Total events in database: {total_events}")  # Debug log
 
-            # Create notifications for all approved organization members
-            approved_members = OrganizationMember.objects.filter(
-                organization=organization,
-                is_approved=True
-            ).select_related('student')
-
+            # Queue notifications for all approved organization members; notification_worker writes them
             event_date_str = event_datetime.strftime("%B %d, %Y at %I:%M %p")
             message = f"📅 New event '{title}' has been created in {organization.name}! Event date: {event_date_str}. Location: {location}."
-            event_link = f"/event/{event.id}/"  # Link to event detail page
-            
-            notifications = []
-            for member in approved_members:
-                notifications.append(Notification(
-                    user=member.student,
-                    message=message,
-                    notification_type=Notification.TYPE_EVENT,
-                    priority=Notification.PRIORITY_MEDIUM,
-                    link=event_link
-                ))
-
-            # Bulk create notifications for efficiency
-            Notification.objects.bulk_create(notifications)
-            print(f"Created {len(notifications)} notifications for event: {event.title}")  # Debug log
+            enqueue_fanout(
+                NotificationJob.AUDIENCE_ORGANIZATION_MEMBERS,
+                message,
+                notification_type=Notification.TYPE_EVENT,
+                priority=Notification.PRIORITY_MEDIUM,
+                link=f"/event/{event.id}/",  # Link to event detail page
+                organization_id=organization.id
+            )
 
         except Exception as e:
             print(f"Event creation error: {str(e)}")  # Debug log
@@ -299,9 +263,9 @@ def event_detail(request, event_id):
             pass
     
     # Get RSVP counts
-    going_count = event.rsvps.filter(status='going').count()
-    interested_count = event.rsvps.filter(status='interested').count()
-    not_going_count = event.rsvps.filter(status='not_going').count()
+    going_count = event.going_count
+    interested_count = event.interested_count
+    not_going_count = event.not_going_count
     
     # Check if event is full
     is_full = event.max_participants and going_count >= event.max_participants
@@ -344,33 +308,28 @@ def rsvp_event(request, event_id):
                 return JsonResponse({'success': False, 'error': 'Invalid status'}, status=400)
             return redirect('orgpage', org_id=event.organization.id)
 
-        # Check if max participants reached for 'going' status
-        if status == 'going' and event.max_participants:
-            current_going_count = event.rsvps.filter(status='going').count()
-            if current_going_count >= event.max_participants:
-                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    return JsonResponse({
-                        'success': False,
-                        'error': f'Maximum participants reached ({event.max_participants}). Cannot RSVP as going.'
-                    }, status=400)
-                # For non-AJAX requests, redirect back
-                return redirect('orgpage', org_id=event.organization.id)
-
-        # Get or create RSVP
-        rsvp, created = EventRSVP.objects.get_or_create(
-            user=request.user,
-            event=event,
-            defaults={'status': status}
-        )
-
-        if not created:
-            rsvp.status = status
-            rsvp.save()
+        # Capacity is enforced under a row lock; a full event queues the user on the waitlist
+        result = set_rsvp_status(event.id, request.user, status)
+        if result['status'] == 'waitlisted':
+            message = (
+                f"Maximum participants reached ({event.max_participants}). "
+                f"You have been added to the waitlist (position {result['waitlist_position']})."
+            )
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': False,
+                    'waitlisted': True,
+                    'waitlist_position': result['waitlist_position'],
+                    'error': message
+                }, status=202)
+            # For non-AJAX requests, redirect back
+            return redirect('orgpage', org_id=event.organization.id)
 
         # Get updated counts
-        going_count = event.rsvps.filter(status='going').count()
-        interested_count = event.rsvps.filter(status='interested').count()
-        not_going_count = event.rsvps.filter(status='not_going').count()
+        event.refresh_from_db(fields=['going_count', 'interested_count', 'not_going_count'])
+        going_count = event.going_count
+        interested_count = event.interested_count
+        not_going_count = event.not_going_count
 
         # Get updated attendee list for avatars
         rsvp_users = event.rsvps.filter(status='going').select_related('user').order_by('date_created')[:5]
@@ -466,25 +425,34 @@ def edit_event(request, event_id):
         max_participants = request.POST.get('max_participants') or None
         
         try:
-            event_datetime = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+            event_datetime = timezone.make_aware(datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M"))
         except Exception:
             return redirect('orgpage', org_id=organization.id)
         
-        # Handle file upload if present
+        changes = {
+            'title': title,
+            'description': description,
+            'event_date': event_datetime,
+            'location': location,
+            'activity_type': activity_type,
+            'max_participants': max_participants,
+        }
+
+        # Handle file upload if present (before taking the row lock)
         if 'attachment' in request.FILES:
             file = request.FILES['attachment']
             attachment_url = upload_to_supabase(file, organization.id, organization.name)
             if attachment_url:
-                event.attachments_url = attachment_url
-        
-        # Update event fields
-        event.title = title
-        event.description = description
-        event.event_date = event_datetime
-        event.location = location
-        event.activity_type = activity_type
-        event.max_participants = max_participants
-        event.save()
+                changes['attachments_url'] = attachment_url
+
+        # Lock the row so the capacity change cannot race with set_rsvp_status
+        with transaction.atomic():
+            locked_event = OrganizationEvent.objects.select_for_update().get(id=event.id)
+            for field, value in changes.items():
+                setattr(locked_event, field, value)
+            locked_event.save(update_fields=list(changes))
+            # A raised (or removed) capacity lets waitlisted users in
+            promote_from_waitlist(locked_event)
         
         return redirect('orgpage', org_id=organization.id)
     
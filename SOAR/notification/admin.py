@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import NotificationJob
 
-# Register your models here.
+@admin.register(NotificationJob)
+class NotificationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'audience', 'notification_type', 'status', 'processed', 'total', 'attempts', 'date_created')
+    list_filter = ('status', 'audience', 'notification_type')
+    readonly_fields = ('processed', 'total', 'last_user_id', 'attempts', 'started_at', 'finished_at', 'error')
@@ -5,3 +5,6 @@ class NotificationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     app_label = 'notification'
     name = 'SOAR.notification'
+
+    def ready(self):
+        from . import signals
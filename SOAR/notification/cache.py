@@ -0,0 +1,63 @@
+from collections import Counter
+from django.core.cache import cache
+from django.db import transaction
+
+# Cached unread counts expire so any drift (e.g. raw SQL writes) heals on its own
+UNREAD_COUNT_TIMEOUT = 60 * 10
+
+
+def unread_count_key(user_id):
+    return f"notification:unread:{user_id}"
+
+
+def get_unread_count(user_id):
+    """Return the user's unread notification count, hitting the database only on a cache miss."""
+    key = unread_count_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        from .models import Notification
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        # add() never overwrites a value written concurrently by an increment
+        cache.add(key, count, UNREAD_COUNT_TIMEOUT)
+    return count
+
+
+def forget_unread_count(user_id):
+    """Drop the cached count once the transaction commits, so the next read recomputes it.
+
+    Safer than writing a known value: rows committed by a concurrent fan-out
+    after the caller's write would otherwise be missed.
+    """
+    transaction.on_commit(lambda: cache.delete(unread_count_key(user_id)))
+
+
+def adjust_unread_counts(deltas):
+    """Apply {user_id: delta} to the cached counts that are currently populated.
+
+    Users without a cached count are skipped; their next read recomputes it.
+    Inside a transaction the change waits for the commit, so a rollback
+    leaves the cache untouched.
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: _apply_unread_deltas(deltas))
+
+
+def _apply_unread_deltas(deltas):
+    keys = {unread_count_key(user_id): delta for user_id, delta in deltas.items()}
+    for key in cache.get_many(list(keys)):
+        try:
+            if cache.incr(key, keys[key]) < 0:
+                cache.delete(key)
+        except ValueError:
+            # Expired between get_many() and incr()
+            pass
+
+
+def adjust_unread_count(user_id, delta):
+    adjust_unread_counts({user_id: delta})
+
+
+def record_new_notifications(notifications):
+    """Count freshly created unread notifications against their recipients."""
+    adjust_unread_counts(Counter(n.user_id for n in notifications if not n.is_read))
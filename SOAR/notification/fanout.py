@@ -0,0 +1,70 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import adjust_unread_counts
+from .models import Notification
+
+# Recipients inserted per INSERT ... SELECT statement
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _insert_notifications(recipients, message, notification_type, priority, link):
+    """Insert one notification per row of the `recipients` User queryset with a single statement.
+
+    Returns the list of recipient ids written, which is needed to keep the
+    cached unread counts in step.
+    """
+    opts = Notification._meta
+    qn = connection.ops.quote_name
+    columns = ['user', 'message', 'date_created', 'is_read', 'notification_type', 'priority', 'link']
+    column_sql = ', '.join(qn(opts.get_field(name).column) for name in columns)
+
+    select_sql, select_params = recipients.order_by().values('id').query.sql_with_params()
+    sql = (
+        f"INSERT INTO {qn(opts.db_table)} ({column_sql}) "
+        f"SELECT recipients.id, %s, %s, %s, %s, %s, %s FROM ({select_sql}) recipients "
+        f"RETURNING {qn(opts.get_field('user').column)}"
+    )
+    params = [message, timezone.now(), False, notification_type, priority, link, *select_params]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def fanout_notifications(recipients, message, notification_type=Notification.TYPE_GENERAL,
+                         priority=Notification.PRIORITY_MEDIUM, link=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE, start_after=None, on_chunk=None):
+    """Notify every user in the `recipients` queryset without loading users into Python.
+
+    Recipients are split into ranges of `chunk_size` ids, and each range is
+    written by one `INSERT ... SELECT` in its own transaction. `on_chunk(count,
+    last_id)` runs inside that transaction, so callers can record progress
+    atomically with the rows; pass the recorded id back as `start_after` to
+    resume. Returns the number of notifications created.
+    """
+    recipients = recipients.order_by('id')
+    total = 0
+    while True:
+        chunk = recipients
+        if start_after is not None:
+            chunk = chunk.filter(id__gt=start_after)
+        # The chunk's upper bound is the chunk_size-th remaining id (None on the last chunk)
+        bound = list(chunk.values_list('id', flat=True)[chunk_size - 1:chunk_size])
+        upper = bound[0] if bound else None
+        if upper is not None:
+            chunk = chunk.filter(id__lte=upper)
+
+        with transaction.atomic():
+            user_ids = _insert_notifications(chunk, message, notification_type, priority, link)
+            if not user_ids:
+                break
+            last_id = upper if upper is not None else max(user_ids)
+            if on_chunk:
+                on_chunk(len(user_ids), last_id)
+        adjust_unread_counts({user_id: 1 for user_id in user_ids})
+
+        total += len(user_ids)
+        start_after = last_id
+        if upper is None:
+            break
+    return total
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .fanout import DEFAULT_CHUNK_SIZE, fanout_notifications
+from .models import Notification, NotificationJob
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = DEFAULT_CHUNK_SIZE
+
+# A running job whose worker has not reported progress for this long is picked up again
+STALE_AFTER = timedelta(minutes=10)
+
+
+def _active_users(exclude_user_id=None):
+    users = User.objects.filter(is_active=True)
+    if exclude_user_id:
+        users = users.exclude(id=exclude_user_id)
+    return users
+
+
+def _program_users(program_ids, exclude_user_id=None):
+    return _active_users(exclude_user_id).filter(course_id__in=program_ids)
+
+
+def _organization_members(organization_id, exclude_user_id=None):
+    users = User.objects.filter(
+        organizations_joined__organization_id=organization_id,
+        organizations_joined__is_approved=True
+    )
+    if exclude_user_id:
+        users = users.exclude(id=exclude_user_id)
+    return users
+
+
+AUDIENCES = {
+    NotificationJob.AUDIENCE_ACTIVE_USERS: _active_users,
+    NotificationJob.AUDIENCE_PROGRAMS: _program_users,
+    NotificationJob.AUDIENCE_ORGANIZATION_MEMBERS: _organization_members,
+}
+
+
+def get_recipients(job):
+    """Return the User queryset a job fans out to."""
+    return AUDIENCES[job.audience](**job.audience_params)
+
+
+def enqueue_fanout(audience, message, notification_type=Notification.TYPE_GENERAL,
+                   priority=Notification.PRIORITY_MEDIUM, link=None, **audience_params):
+    """Queue a notification for every user in `audience` and return the job.
+
+    `audience_params` are stored as JSON and passed to the audience builder,
+    so pass ids rather than model instances.
+    """
+    if audience not in AUDIENCES:
+        raise ValueError(f"Unknown audience: {audience}")
+    return NotificationJob.objects.create(
+        audience=audience,
+        audience_params=audience_params,
+        message=message,
+        notification_type=notification_type,
+        priority=priority,
+        link=link,
+    )
+
+
+def claim_next_job():
+    """Lock and mark the oldest runnable job as running, or return None.
+
+    Uses SKIP LOCKED so several workers can poll the same table.
+    """
+    stale = timezone.now() - STALE_AFTER
+    with transaction.atomic():
+        job = NotificationJob.objects.select_for_update(skip_locked=True).filter(
+            Q(status=NotificationJob.STATUS_PENDING) |
+            Q(status=NotificationJob.STATUS_RUNNING, date_updated__lt=stale)
+        ).order_by('date_created', 'id').first()
+        if job is None:
+            return None
+        job.status = NotificationJob.STATUS_RUNNING
+        job.attempts = F('attempts') + 1
+        if job.started_at is None:
+            job.started_at = timezone.now()
+        job.save(update_fields=['status', 'attempts', 'started_at', 'date_updated'])
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Write a job's notifications in chunks of `batch_size` recipients.
+
+    Each chunk is inserted and recorded as progress in one transaction, so a
+    job interrupted part-way resumes after the last committed chunk without
+    duplicating rows. `progress(job)` is called as each chunk is recorded.
+    """
+    recipients = get_recipients(job)
+    if job.total is None:
+        job.total = recipients.count()
+        job.save(update_fields=['total', 'date_updated'])
+
+    def record_chunk(count, last_id):
+        job.processed += count
+        job.last_user_id = last_id
+        job.save(update_fields=['processed', 'last_user_id', 'date_updated'])
+        if progress:
+            progress(job)
+
+    fanout_notifications(
+        recipients,
+        job.message,
+        notification_type=job.notification_type,
+        priority=job.priority,
+        link=job.link,
+        chunk_size=batch_size,
+        start_after=job.last_user_id,
+        on_chunk=record_chunk
+    )
+
+    job.status = NotificationJob.STATUS_DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'date_updated'])
+    return job
+
+
+def fail_job(job, error):
+    """Mark a job as failed with the given error message."""
+    job.status = NotificationJob.STATUS_FAILED
+    job.error = str(error)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at', 'date_updated'])
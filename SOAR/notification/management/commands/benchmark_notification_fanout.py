@@ -0,0 +1,60 @@
+import time
+import uuid
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from SOAR.notification.fanout import DEFAULT_CHUNK_SIZE, fanout_notifications
+from SOAR.notification.models import Notification
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = (
+        'Compare per-object bulk_create fan-out with INSERT ... SELECT fan-out. '
+        'All rows are created inside a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'sizes',
+            nargs='*',
+            type=int,
+            default=[1000, 10000, 100000],
+            help='Recipient counts to benchmark'
+        )
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'recipients':>10}  {'bulk_create':>12}  {'insert_select':>13}  {'speedup':>7}")
+        for size in options['sizes']:
+            with transaction.atomic():
+                batch = uuid.uuid4().hex[:8]
+                User.objects.bulk_create([
+                    User(username=f'bench-{batch}-{i}', password='!', is_active=True)
+                    for i in range(size)
+                ], batch_size=5000)
+                recipients = User.objects.filter(username__startswith=f'bench-{batch}-')
+
+                legacy = self.timed(lambda: self.legacy_fanout(recipients))
+                set_based = self.timed(lambda: fanout_notifications(
+                    recipients, 'Benchmark', chunk_size=options['chunk_size']
+                ))
+                transaction.set_rollback(True)
+
+            self.stdout.write(f"{size:>10}  {legacy:>11.2f}s  {set_based:>12.2f}s  {legacy / set_based:>6.1f}x")
+
+    def timed(self, func):
+        savepoint = transaction.savepoint()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        transaction.savepoint_rollback(savepoint)
+        return elapsed
+
+    def legacy_fanout(self, recipients):
+        # What the views did before: load every User, build every Notification in Python
+        notifications = [
+            Notification(user=user, message='Benchmark', notification_type=Notification.TYPE_GENERAL)
+            for user in recipients
+        ]
+        Notification.objects.bulk_create(notifications)
@@ -0,0 +1,61 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+from SOAR.notification.jobs import DEFAULT_BATCH_SIZE, claim_next_job, fail_job, run_job
+
+class Command(BaseCommand):
+    help = 'Process queued notification fan-out jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling for new jobs'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of recipients written per transaction'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            # A long-running loop never sees request_finished; drop broken or expired connections here
+            close_old_connections()
+            try:
+                job = claim_next_job()
+            except DatabaseError as e:
+                if options['once']:
+                    raise
+                self.stderr.write(self.style.ERROR(f'Could not claim a job: {e}'))
+                time.sleep(options['sleep'])
+                continue
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f'Job {job.id}: fanning out to {job.get_audience_display().lower()}')
+            try:
+                run_job(job, batch_size=options['batch_size'], progress=self.report_progress)
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f'Job {job.id} failed: {e}'))
+                try:
+                    fail_job(job, e)
+                except DatabaseError as db_error:
+                    # Most likely a lost connection; the job stays running and is reclaimed once stale
+                    self.stderr.write(self.style.ERROR(f'Could not record the failure of job {job.id}: {db_error}'))
+                    time.sleep(options['sleep'])
+                continue
+            self.stdout.write(self.style.SUCCESS(f'Job {job.id}: created {job.processed} notification(s)'))
+
+    def report_progress(self, job):
+        self.stdout.write(f'Job {job.id}: {job.processed}/{job.total}')
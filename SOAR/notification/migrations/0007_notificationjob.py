@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:39
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0006_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('audience', models.CharField(choices=[('active_users', 'All active users'), ('programs', 'Active users in programs'), ('organization_members', 'Approved organization members')], max_length=50)),
+                ('audience_params', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('message', models.TextField()),
+                ('notification_type', models.CharField(choices=[('system', 'System Announcement'), ('membership', 'Membership'), ('event', 'Event'), ('organization', 'Organization'), ('general', 'General')], default='general', max_length=50)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], default='medium', max_length=20)),
+                ('link', models.CharField(blank=True, max_length=500, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(blank=True, null=True)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('last_user_id', models.UUIDField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['date_created', 'id'],
+                'indexes': [models.Index(fields=['status', 'date_created'], name='notificationjob_queue_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,16 @@
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from .cache import record_new_notifications
+
+
+class NotificationQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create() skips post_save, so keep the unread-count cache in step here
+        created = super().bulk_create(objs, *args, **kwargs)
+        record_new_notifications(created)
+        return created
+
 
 class Notification(models.Model):
     # Notification Types
@@ -50,9 +61,21 @@ class Notification(models.Model):
         help_text="Optional link to related content"
     )
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         app_label = 'notification'
         ordering = ['-date_created']
+        indexes = [
+            # Notification list: WHERE user_id = ? ORDER BY date_created DESC
+            models.Index(fields=['user', '-date_created'], name='notification_user_created_idx'),
+            # Unread badge, unread tab and mark-all-read only touch unread rows
+            models.Index(
+                fields=['user', '-date_created'],
+                condition=models.Q(is_read=False),
+                name='notification_user_unread_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Notification for {self.user.username}: {self.message[:50]}..."
@@ -78,3 +101,67 @@ class Notification(models.Model):
             self.TYPE_GENERAL: 'from-gray-500 to-gray-600',
         }
         return colors.get(self.notification_type, 'from-gray-500 to-gray-600')
+
+
+class NotificationJob(models.Model):
+    """A queued notification fan-out, processed by the `notification_worker` command."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    # Recipient sets a job can target, resolved by SOAR.notification.jobs
+    AUDIENCE_ACTIVE_USERS = 'active_users'
+    AUDIENCE_PROGRAMS = 'programs'
+    AUDIENCE_ORGANIZATION_MEMBERS = 'organization_members'
+
+    AUDIENCE_CHOICES = [
+        (AUDIENCE_ACTIVE_USERS, 'All active users'),
+        (AUDIENCE_PROGRAMS, 'Active users in programs'),
+        (AUDIENCE_ORGANIZATION_MEMBERS, 'Approved organization members'),
+    ]
+
+    audience = models.CharField(max_length=50, choices=AUDIENCE_CHOICES)
+    audience_params = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    message = models.TextField()
+    notification_type = models.CharField(
+        max_length=50,
+        choices=Notification.NOTIFICATION_TYPES,
+        default=Notification.TYPE_GENERAL
+    )
+    priority = models.CharField(
+        max_length=20,
+        choices=Notification.PRIORITY_LEVELS,
+        default=Notification.PRIORITY_MEDIUM
+    )
+    link = models.CharField(max_length=500, blank=True, null=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    processed = models.PositiveIntegerField(default=0)
+    # Keyset position of the last recipient written, so a restarted job resumes where it stopped
+    last_user_id = models.UUIDField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_updated = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'notification'
+        ordering = ['date_created', 'id']
+        indexes = [
+            models.Index(fields=['status', 'date_created'], name='notificationjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_audience_display()} fan-out ({self.status}, {self.processed}/{self.total or '?'})"
@@ -0,0 +1,77 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+from .models import Notification
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+# Server-side filters for the notification tabs
+TAB_FILTERS = {
+    'all': Q(),
+    'unread': Q(is_read=False),
+    'system': Q(notification_type=Notification.TYPE_SYSTEM, is_read=False),
+    'event': Q(notification_type=Notification.TYPE_EVENT, is_read=False),
+    'organization': Q(
+        notification_type__in=[Notification.TYPE_MEMBERSHIP, Notification.TYPE_ORGANIZATION],
+        is_read=False
+    ),
+}
+
+
+def encode_cursor(notification):
+    """Return an opaque cursor pointing just after `notification`."""
+    raw = f"{notification.date_created.isoformat()}|{notification.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the (date_created, id) pair encoded in a cursor.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_created, notification_id = raw.split('|')
+        return datetime.fromisoformat(date_created), int(notification_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Parse a requested page size, falling back to `default` and capping at MAX_PAGE_SIZE."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def get_notification_page(user, tab='all', cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Return one page of a user's notifications, newest first.
+
+    Pages are keyed on (date_created, id), so fetching a page costs the same
+    however deep into the history it is. Returns a dict with the
+    `notifications` list and the `next_cursor` (None on the last page).
+    Raises ValueError for an unknown tab or a malformed cursor.
+    """
+    if tab not in TAB_FILTERS:
+        raise ValueError(f"Unknown tab: {tab}")
+
+    notifications = Notification.objects.filter(user=user).filter(TAB_FILTERS[tab])
+    if cursor:
+        date_created, notification_id = decode_cursor(cursor)
+        notifications = notifications.filter(
+            Q(date_created__lt=date_created) |
+            Q(date_created=date_created, id__lt=notification_id)
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    page = list(notifications.order_by('-date_created', '-id')[:limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1])
+    return {'notifications': page, 'next_cursor': next_cursor}
@@ -0,0 +1,15 @@
+# notification/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .cache import adjust_unread_count
+from .models import Notification
+
+@receiver(post_save, sender=Notification)
+def count_new_unread_notification(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not instance.is_read:
+        adjust_unread_count(instance.user_id, 1)
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_unread_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_count(instance.user_id, -1)
@@ -1,3 +1,282 @@
+from io import StringIO
+from unittest import mock
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, transaction
+from django.urls import reverse
+from django.utils import timezone
+from .cache import get_unread_count
+from .pagination import MAX_PAGE_SIZE
+from SOAR.organization.models import Organization, OrganizationMember
+from .fanout import fanout_notifications
+from .jobs import enqueue_fanout, get_recipients, run_job
+from .models import Notification, NotificationJob
 
-# Create your tests here.
+User = get_user_model()
+
+
+class UnreadCountCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def _notify(self, count=1):
+        return Notification.objects.bulk_create([
+            Notification(user=self.user, message=f'Message {i}') for i in range(count)
+        ])
+
+    def test_polling_endpoint_uses_cache(self):
+        """Test that a warm unread count is served without querying notifications"""
+        self._notify(3)
+        self.assertEqual(get_unread_count(self.user.id), 3)
+
+        url = reverse('get_unread_count_api')
+        self.client.get(url)  # warm session/user lookups
+        with self.assertNumQueries(2):  # session + user only
+            response = self.client.get(url)
+        self.assertEqual(response.json()['unread_count'], 3)
+
+    def test_count_is_updated_incrementally(self):
+        """Test that fan-out, create, mark-read and delete keep the cached count exact"""
+        first, second = self._notify(2)
+        self.assertEqual(get_unread_count(self.user.id), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._notify(2)
+            Notification.objects.create(user=self.user, message='Direct')
+        self.assertEqual(cache.get(f'notification:unread:{self.user.id}'), 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('mark_notification_read', args=[first.id]))
+        self.assertEqual(get_unread_count(self.user.id), 4)
+        # Marking an already-read notification must not decrement again
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.post(reverse('mark_notification_read', args=[first.id]))
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_unread_count(self.user.id), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('delete_notification', args=[second.id]))
+        self.assertEqual(get_unread_count(self.user.id), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('mark_all_notifications_read'))
+        self.assertIsNone(cache.get(f'notification:unread:{self.user.id}'))
+        self.assertEqual(get_unread_count(self.user.id), 0)
+        self.assertEqual(Notification.objects.filter(user=self.user, is_read=False).count(), 0)
+
+    def test_rolled_back_notifications_are_not_counted(self):
+        """Test that the cached count only changes once the notification is committed"""
+        self.assertEqual(get_unread_count(self.user.id), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._notify(2)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(cache.get(f'notification:unread:{self.user.id}'), 0)
+
+
+class NotificationPaginationTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.notifications = Notification.objects.bulk_create([
+            Notification(user=self.user, message=f'Message {i}', is_read=i % 2 == 0)
+            for i in range(25)
+        ])
+        # Give several rows the same timestamp so the id tie-breaker is exercised
+        Notification.objects.filter(user=self.user).update(date_created=timezone.now())
+
+    def _walk(self, **params):
+        url = reverse('get_notifications_api')
+        ids, cursor = [], None
+        while True:
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            data = self.client.get(url, query).json()
+            ids.extend(n['id'] for n in data['notifications'])
+            cursor = data['next_cursor']
+            if not cursor:
+                return ids
+
+    def test_cursor_walks_every_notification_once(self):
+        """Test that following next_cursor returns each notification exactly once, newest first"""
+        ids = self._walk(limit=7)
+        expected = sorted((n.id for n in self.notifications), reverse=True)
+        self.assertEqual(ids, expected)
+
+    def test_tab_filter_is_applied_server_side(self):
+        """Test that the unread tab only pages through unread notifications"""
+        ids = self._walk(tab='unread', limit=5)
+        unread = Notification.objects.filter(user=self.user, is_read=False)
+        self.assertEqual(set(ids), set(unread.values_list('id', flat=True)))
+        self.assertEqual(len(ids), 12)
+
+    def test_page_size_is_capped(self):
+        """Test that an oversized limit is clamped to MAX_PAGE_SIZE"""
+        Notification.objects.bulk_create([
+            Notification(user=self.user, message='Extra') for _ in range(MAX_PAGE_SIZE)
+        ])
+        data = self.client.get(reverse('get_notifications_api'), {'limit': 100000}).json()
+        self.assertEqual(len(data['notifications']), MAX_PAGE_SIZE)
+        self.assertIsNotNone(data['next_cursor'])
+
+    def test_invalid_cursor_and_tab_are_rejected(self):
+        """Test that malformed cursors and unknown tabs return 400"""
+        url = reverse('get_notifications_api')
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'tab': 'bogus'}).status_code, 400)
+
+    def test_page_renders_first_page_and_loads_more(self):
+        """Test that the page renders one page per tab and AJAX returns the next fragment"""
+        response = self.client.get(reverse('notifications'))
+        self.assertEqual(len(response.context['all_page']['notifications']), 20)
+        cursor = response.context['all_page']['next_cursor']
+        self.assertIsNotNone(cursor)
+
+        response = self.client.get(
+            reverse('notifications'),
+            {'tab': 'all', 'cursor': cursor},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        data = response.json()
+        self.assertIsNone(data['next_cursor'])
+        self.assertEqual(data['html'].count('data-notification-id='), 5)
+
+
+class NotificationFanoutTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='testpass123')
+            for i in range(5)
+        ]
+
+    def test_fanout_inserts_one_row_per_recipient(self):
+        """Test that INSERT ... SELECT fan-out covers every chunk and keeps cached counts exact"""
+        self.assertEqual(get_unread_count(self.users[0].id), 0)
+        chunks = []
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = fanout_notifications(
+                User.objects.all(),
+                'Welcome',
+                notification_type=Notification.TYPE_SYSTEM,
+                link='/home/',
+                chunk_size=2,
+                on_chunk=lambda count, last_id: chunks.append(count)
+            )
+
+        self.assertEqual(created, 5)
+        self.assertEqual(chunks, [2, 2, 1])
+        self.assertEqual(
+            set(Notification.objects.values_list('user_id', flat=True)),
+            {user.id for user in self.users}
+        )
+        notification = Notification.objects.get(user=self.users[0])
+        self.assertEqual((notification.notification_type, notification.link), (Notification.TYPE_SYSTEM, '/home/'))
+        self.assertFalse(notification.is_read)
+        self.assertEqual(cache.get(f'notification:unread:{self.users[0].id}'), 1)
+
+    def test_fanout_resumes_after_id(self):
+        """Test that start_after skips recipients already written"""
+        ordered = sorted(self.users, key=lambda user: user.id)
+        created = fanout_notifications(User.objects.all(), 'Hello', start_after=ordered[1].id)
+        self.assertEqual(created, 3)
+        self.assertFalse(Notification.objects.filter(user__in=ordered[:2]).exists())
+
+
+class NotificationJobTestCase(TestCase):
+    WORKER = 'SOAR.notification.management.commands.notification_worker'
+
+    def setUp(self):
+        self.sender = User.objects.create_user(username='sender', password='testpass123')
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='testpass123')
+            for i in range(5)
+        ]
+        User.objects.create_user(username='inactive', password='testpass123', is_active=False)
+
+    def test_worker_fans_out_in_chunks(self):
+        """Test that the worker writes one notification per recipient and reports progress"""
+        job = enqueue_fanout(
+            NotificationJob.AUDIENCE_ACTIVE_USERS,
+            'New organization',
+            notification_type=Notification.TYPE_ORGANIZATION,
+            link='/organization/1/',
+            exclude_user_id=self.sender.id
+        )
+        self.assertFalse(Notification.objects.exists())
+
+        out = StringIO()
+        # The test transaction holds the connection, so the worker must not recycle it
+        with mock.patch(f'{self.WORKER}.close_old_connections'):
+            call_command('notification_worker', '--once', '--batch-size', '2', stdout=out)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NotificationJob.STATUS_DONE)
+        self.assertEqual((job.processed, job.total), (5, 5))
+        self.assertEqual(
+            set(Notification.objects.values_list('user_id', flat=True)),
+            {user.id for user in self.users}
+        )
+        self.assertIn('4/5', out.getvalue())
+
+    def test_worker_survives_database_errors(self):
+        """Test that a lost connection while claiming or failing a job is logged instead of stopping the worker"""
+        job = enqueue_fanout(NotificationJob.AUDIENCE_ACTIVE_USERS, 'Hello', exclude_user_id=self.sender.id)
+        claims = iter([OperationalError('server closed the connection'), job, None])
+
+        def claim():
+            outcome = next(claims)
+            if isinstance(outcome, Exception):
+                raise outcome
+            if outcome is None:
+                raise KeyboardInterrupt
+            return outcome
+
+        err = StringIO()
+        with mock.patch(f'{self.WORKER}.close_old_connections') as close_old_connections, \
+                mock.patch(f'{self.WORKER}.claim_next_job', side_effect=claim), \
+                mock.patch(f'{self.WORKER}.run_job', side_effect=RuntimeError('boom')), \
+                mock.patch(f'{self.WORKER}.fail_job', side_effect=OperationalError('gone')), \
+                mock.patch(f'{self.WORKER}.time.sleep'), \
+                self.assertRaises(KeyboardInterrupt):
+            call_command('notification_worker', stdout=StringIO(), stderr=err)
+
+        self.assertEqual(close_old_connections.call_count, 3)
+        self.assertIn('Could not claim a job', err.getvalue())
+        self.assertIn(f'Could not record the failure of job {job.id}', err.getvalue())
+
+    def test_interrupted_job_resumes_without_duplicates(self):
+        """Test that a job restarted after a partial run only writes the remaining recipients"""
+        job = enqueue_fanout(NotificationJob.AUDIENCE_ACTIVE_USERS, 'Hello', exclude_user_id=self.sender.id)
+
+        class Interrupted(Exception):
+            pass
+
+        def stop_during_second_chunk(job):
+            if job.processed > 3:
+                raise Interrupted
+
+        with self.assertRaises(Interrupted):
+            run_job(job, batch_size=3, progress=stop_during_second_chunk)
+        self.assertEqual(Notification.objects.count(), 3)
+
+        run_job(NotificationJob.objects.get(id=job.id), batch_size=3)
+        self.assertEqual(Notification.objects.count(), 5)
+        self.assertEqual(Notification.objects.values('user_id').distinct().count(), 5)
+
+    def test_organization_members_audience(self):
+        """Test that the member audience only includes approved members"""
+        organization = Organization.objects.create(name='Test Organization', is_public=True)
+        OrganizationMember.objects.create(organization=organization, student=self.users[0], is_approved=True)
+        OrganizationMember.objects.create(organization=organization, student=self.users[1], is_approved=False)
+
+        job = enqueue_fanout(NotificationJob.AUDIENCE_ORGANIZATION_MEMBERS, 'Event', organization_id=organization.id)
+        job.refresh_from_db()
+        self.assertEqual(list(get_recipients(job)), [self.users[0]])
@@ -1,34 +1,48 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.template.loader import render_to_string
 from django.views.decorators.http import require_POST, require_GET
 from django.utils import timezone
 from datetime import timedelta
 from .models import Notification
+from .cache import get_unread_count, adjust_unread_count, forget_unread_count
+from .pagination import get_notification_page, parse_page_size
+
+def mark_read(notification_id, user):
+    """Mark one notification read; only the request that actually flips it decrements the count."""
+    updated = Notification.objects.filter(id=notification_id, user=user, is_read=False).update(is_read=True)
+    if updated == 1:
+        adjust_unread_count(user.id, -1)
 
 @login_required
 def notifications_view(request):
-    """Display user's notifications."""
-    notifications = Notification.objects.filter(user=request.user)
-    unread_count = notifications.filter(is_read=False).count()
+    """Display user's notifications, one page per tab.
 
-    # Group notifications by type for tabs (only unread)
-    all_notifications = notifications.order_by('-date_created')
-    unread_notifications = notifications.filter(is_read=False)
-    system_notifications = notifications.filter(notification_type=Notification.TYPE_SYSTEM, is_read=False)
-    event_notifications = notifications.filter(notification_type=Notification.TYPE_EVENT, is_read=False)
-    organization_notifications = notifications.filter(
-        notification_type__in=[Notification.TYPE_MEMBERSHIP, Notification.TYPE_ORGANIZATION],
-        is_read=False
-    )
+    AJAX requests with a `tab` and `cursor` get the next page rendered as an
+    HTML fragment for the "load more" button.
+    """
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        tab = request.GET.get('tab', 'all')
+        try:
+            page = get_notification_page(
+                request.user,
+                tab=tab,
+                cursor=request.GET.get('cursor'),
+                limit=parse_page_size(request.GET.get('limit'))
+            )
+        except ValueError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        html = render_to_string('notification/notification_items.html', {
+            'notifications': page['notifications'],
+            'tab': tab,
+        }, request=request)
+        return JsonResponse({'status': 'success', 'html': html, 'next_cursor': page['next_cursor']})
 
     context = {
-        'all_notifications': all_notifications,
-        'unread_notifications': unread_notifications,
-        'system_notifications': system_notifications,
-        'event_notifications': event_notifications,
-        'organization_notifications': organization_notifications,
-        'unread_count': unread_count,
+        'all_page': get_notification_page(request.user, tab='all'),
+        'unread_page': get_notification_page(request.user, tab='unread'),
+        'unread_count': get_unread_count(request.user.id),
         'hide_header': True,
     }
     return render(request, 'notification/notifications.html', context)
@@ -41,7 +55,7 @@ def notification_detail_view(request, notification_id):
     # Mark as read when viewed
     if not notification.is_read:
         notification.is_read = True
-        notification.save()
+        mark_read(notification.id, request.user)
     
     # Prepare event data if this is an event notification
     event_data = None
@@ -78,12 +92,19 @@ def notification_detail_view(request, notification_id):
 @login_required
 @require_GET
 def get_notifications_api(request):
-    """API endpoint to fetch recent notifications for dropdown."""
-    limit = int(request.GET.get('limit', 10))
-    notifications = Notification.objects.filter(user=request.user)[:limit]
-    
+    """API endpoint to fetch notifications for the dropdown, one page at a time."""
+    try:
+        page = get_notification_page(
+            request.user,
+            tab=request.GET.get('tab', 'all'),
+            cursor=request.GET.get('cursor'),
+            limit=parse_page_size(request.GET.get('limit'), default=10)
+        )
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
     notifications_data = []
-    for notif in notifications:
+    for notif in page['notifications']:
         notifications_data.append({
             'id': notif.id,
             'message': notif.message,
@@ -97,11 +118,12 @@ def get_notifications_api(request):
             'time_ago': get_time_ago(notif.date_created)
         })
     
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
+    unread_count = get_unread_count(request.user.id)
     
     return JsonResponse({
         'notifications': notifications_data,
         'unread_count': unread_count,
+        'next_cursor': page['next_cursor'],
         'status': 'success'
     })
 
@@ -109,7 +131,7 @@ def get_notifications_api(request):
 @require_GET
 def get_unread_count_api(request):
     """API endpoint to get unread notification count."""
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
+    unread_count = get_unread_count(request.user.id)
     return JsonResponse({
         'unread_count': unread_count,
         'status': 'success'
@@ -119,12 +141,11 @@ def get_unread_count_api(request):
 @require_POST
 def mark_notification_read(request, notification_id):
     """Mark a specific notification as read."""
-    notification = get_object_or_404(Notification, id=notification_id, user=request.user)
-    notification.is_read = True
-    notification.save()
+    get_object_or_404(Notification, id=notification_id, user=request.user)
+    mark_read(notification_id, request.user)
     
     # Return updated unread count
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
+    unread_count = get_unread_count(request.user.id)
     
     return JsonResponse({
         'status': 'success',
@@ -136,9 +157,10 @@ def mark_notification_read(request, notification_id):
 def mark_all_notifications_read(request):
     """Mark all user's notifications as read."""
     Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    forget_unread_count(request.user.id)
     return JsonResponse({
         'status': 'success',
-        'unread_count': 0
+        'unread_count': get_unread_count(request.user.id)
     })
 
 @login_required
@@ -146,10 +168,10 @@ def mark_all_notifications_read(request):
 def delete_notification(request, notification_id):
     """Delete a specific notification."""
     notification = get_object_or_404(Notification, id=notification_id, user=request.user)
-    notification.delete()
+    notification.delete()  # post_delete adjusts the cached unread count
     
     # Return updated unread count
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
+    unread_count = get_unread_count(request.user.id)
     
     return JsonResponse({
         'status': 'success',
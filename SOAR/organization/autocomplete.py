@@ -0,0 +1,116 @@
+import bisect
+import re
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+
+from .models import Organization, Program
+
+# Organization and program names are autocompleted from a sorted in-memory
+# index built once per process. Each index is tagged with a version stamp
+# kept in the default cache; SOAR.organization.signals replaces the stamp
+# after a name changes, and every worker rebuilds on its next lookup. That
+# reaches other processes only when the cache is shared (Redis); with the
+# per-process LocMemCache they see the change once their index is older
+# than NAME_INDEX_MAX_AGE.
+
+AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+
+# Seconds a built index is used before it is rebuilt even without a new version stamp
+NAME_INDEX_MAX_AGE = 60 * 5
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def normalize_name(name):
+    """Lowercase words of a name joined by single spaces, punctuation dropped."""
+    return ' '.join(re.findall(r'\w+', (name or '').lower()))
+
+
+class PrefixIndex:
+    """Sorted array of normalized name keys, searched by prefix with bisect.
+
+    Every word of every name is a key, so "club" finds "Chess Club"; entries
+    whose name starts with the prefix rank before those matching a later
+    word, then entries keep their original order.
+    """
+
+    def __init__(self, entries, names):
+        self.entries = list(entries)
+        keys = []
+        for position, entry in enumerate(self.entries):
+            for name in names(entry):
+                words = normalize_name(name).split(' ')
+                for start in range(len(words)):
+                    keys.append((' '.join(words[start:]), start > 0, position))
+        keys.sort()
+        self._keys = keys
+        self._texts = [text for text, _, _ in keys]
+
+    def search(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """Entries with a name or name word starting with `prefix`; the first `limit` entries for an empty prefix."""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return self.entries[:limit]
+        later_word = {}
+        for index in range(bisect.bisect_left(self._texts, prefix), len(self._keys)):
+            text, is_later_word, position = self._keys[index]
+            if not text.startswith(prefix):
+                break
+            later_word[position] = later_word.get(position, True) and is_later_word
+        ranked = sorted(later_word, key=lambda position: (later_word[position], position))
+        return [self.entries[position] for position in ranked[:limit]]
+
+
+# kind: (rows to index, names of a row)
+INDEX_SOURCES = {
+    'organizations': (
+        lambda: Organization.objects.order_by('name').values('id', 'name'),
+        lambda row: [row['name']],
+    ),
+    'programs': (
+        lambda: Program.objects.order_by('name').values('id', 'abbreviation', 'name'),
+        lambda row: [row['abbreviation'], row['name']],
+    ),
+}
+
+
+def _version_key(kind):
+    return f"organization:name_index_version:{kind}"
+
+
+def index_version(kind):
+    """Return the current version stamp of a name index."""
+    return cache.get_or_set(_version_key(kind), uuid.uuid4().hex, None)
+
+
+def bump_index_version(kind):
+    """Make every process rebuild a name index on its next lookup."""
+    cache.set(_version_key(kind), uuid.uuid4().hex, None)
+
+
+def get_index(kind):
+    """Return this process's PrefixIndex for 'organizations' or 'programs', rebuilding it if stale."""
+    version = index_version(kind)
+
+    def is_current(built):
+        return built is not None and built[0] == version and time.monotonic() - built[1] < NAME_INDEX_MAX_AGE
+
+    built = _indexes.get(kind)
+    if not is_current(built):
+        with _lock:
+            built = _indexes.get(kind)
+            if not is_current(built):
+                rows, names = INDEX_SOURCES[kind]
+                # Tagged with the version read before loading, so a change during the build triggers another
+                built = (version, time.monotonic(), PrefixIndex(rows(), names))
+                _indexes[kind] = built
+    return built[2]
+
+
+def autocomplete(kind, prefix, limit=AUTOCOMPLETE_LIMIT):
+    return get_index(kind).search(prefix, limit)
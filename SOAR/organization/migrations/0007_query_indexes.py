@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0006_alter_organization_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizationmember',
+            index=models.Index(fields=['student', 'is_approved'], name='orgmember_student_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organizationmember',
+            index=models.Index(fields=['organization', 'role'], name='orgmember_org_role_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+# Tag rules as of this migration, checked in order; anything else is Academic
+ORG_TYPE_TAGS = [
+    ('Sports', {'sports'}),
+    ('Cultural', {'cultural'}),
+    ('Special Interest', {'special', 'interest'}),
+]
+
+
+def derive_org_type(tags):
+    lowered = {tag.strip().lower() for tag in tags or [] if tag and tag.strip()}
+    for org_type, type_tags in ORG_TYPE_TAGS:
+        if lowered & type_tags:
+            return org_type
+    return 'Academic'
+
+
+def fill_org_type(apps, schema_editor):
+    Organization = apps.get_model('organization', 'Organization')
+    organizations = list(Organization.objects.only('id', 'tags'))
+    for organization in organizations:
+        organization.org_type = derive_org_type(organization.tags)
+    Organization.objects.bulk_update(organizations, ['org_type'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='org_type',
+            field=models.CharField(choices=[('Sports', 'Sports'), ('Cultural', 'Cultural'), ('Special Interest', 'Special Interest'), ('Academic', 'Academic')], default='Academic', editable=False, max_length=30),
+        ),
+        migrations.RunPython(fill_org_type, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['org_type'], name='organization_type_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Func, TextField, Value
+
+
+def fill_search_vector(apps, schema_editor):
+    # The document as of this migration: name (A), tags (B), description (C)
+    tags = Func(F('tags'), Value(' '), function='array_to_string', output_field=TextField())
+    document = (
+        SearchVector('name', weight='A', config='english') +
+        SearchVector(tags, weight='B', config='english') +
+        SearchVector('description', weight='C', config='english')
+    )
+    Organization = apps.get_model('organization', 'Organization')
+    Organization.objects.update(search_vector=document)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0008_organization_org_type'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='organization',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='organization',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='organization_search_idx'),
+        ),
+        # Serves the typo-tolerant `name % query` match; kept out of the model so
+        # databases without pg_trgm can still be created from the models
+        migrations.RunSQL(
+            'CREATE INDEX organization_name_trgm_idx ON organization_organization USING gin (name gin_trgm_ops);',
+            'DROP INDEX IF EXISTS organization_name_trgm_idx;',
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:40
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def fill_normalized_tags(apps, schema_editor):
+    Organization = apps.get_model('organization', 'Organization')
+    organizations = list(Organization.objects.only('id', 'tags'))
+    for organization in organizations:
+        # Stripped, lowercased, deduplicated and sorted, as normalized at the time of this migration
+        organization.normalized_tags = sorted({tag.strip().lower() for tag in organization.tags or [] if tag and tag.strip()})
+    Organization.objects.bulk_update(organizations, ['normalized_tags'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0009_organization_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='normalized_tags',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=30), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.RunPython(fill_normalized_tags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='organization',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['normalized_tags'], name='organization_tags_idx'),
+        ),
+    ]
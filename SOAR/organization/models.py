@@ -1,9 +1,12 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from SOAR.organization.validators import validate_image_file_type, validate_image_file_size
-from SOAR.accounts.models import organization_profile_upload_path, OrganizationSupabaseStorage
+from SOAR.accounts.models import User, organization_profile_upload_path, OrganizationSupabaseStorage
 
 class Program(models.Model):
     abbreviation = models.CharField(max_length=10, unique=True)
@@ -12,6 +15,38 @@ class Program(models.Model):
     def __str__(self):
         return self.abbreviation
 
+# Organization types derived from tags, checked in order; anything else is Academic
+ORG_TYPE_DEFAULT = 'Academic'
+ORG_TYPE_TAGS = [
+    ('Sports', {'sports'}),
+    ('Cultural', {'cultural'}),
+    ('Special Interest', {'special', 'interest'}),
+]
+ORG_TYPES = [org_type for org_type, _ in ORG_TYPE_TAGS] + [ORG_TYPE_DEFAULT]
+
+
+def normalize_tags(tags):
+    """Return `tags` stripped, lowercased and deduplicated, in sorted order."""
+    return sorted({tag.strip().lower() for tag in tags or [] if tag and tag.strip()})
+
+
+def derive_org_type(tags):
+    """Return the organization type implied by `tags` (case-insensitive)."""
+    lowered = set(normalize_tags(tags))
+    for org_type, type_tags in ORG_TYPE_TAGS:
+        if lowered & type_tags:
+            return org_type
+    return ORG_TYPE_DEFAULT
+
+
+# Invalidated by SOAR.organization.signals; the timeout only bounds drift from raw writes
+ALLOWED_PROGRAMS_TIMEOUT = 60 * 60
+
+
+def allowed_programs_key(organization_id):
+    return f"organization:allowed_programs:{organization_id}"
+
+
 class Organization(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255, unique=True)
@@ -51,9 +86,60 @@ class Organization(models.Model):
 
     date_created = models.DateTimeField(auto_now_add=True)
 
+    # Derived from tags on every save so listings can filter and group on an indexed column
+    org_type = models.CharField(
+        max_length=30,
+        choices=[(org_type, org_type) for org_type in ORG_TYPES],
+        default=ORG_TYPE_DEFAULT,
+        editable=False
+    )
+
+    # Lowercased copy of tags, derived on every save; GIN-indexed for overlap/contains filters
+    normalized_tags = ArrayField(models.CharField(max_length=30), blank=True, default=list, editable=False)
+
+    # Weighted name/tags/description document, kept current by SOAR.organization.signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['org_type'], name='organization_type_idx'),
+            GinIndex(fields=['search_vector'], name='organization_search_idx'),
+            GinIndex(fields=['normalized_tags'], name='organization_tags_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.org_type = derive_org_type(self.tags)
+        self.normalized_tags = normalize_tags(self.tags)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'tags' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'org_type', 'normalized_tags'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
+    def allowed_program_ids(self):
+        """Ids of the programs allowed to join, as a cached frozenset."""
+        key = allowed_programs_key(self.pk)
+        program_ids = cache.get(key)
+        if program_ids is None:
+            program_ids = frozenset(self.allowed_programs.values_list('id', flat=True))
+            cache.set(key, program_ids, ALLOWED_PROGRAMS_TIMEOUT)
+        return program_ids
+
+    def can_join(self, user):
+        """Whether `user` is eligible to join: anyone for a public organization,
+        otherwise only students of an allowed program. Membership is not checked.
+        """
+        return self.is_public or (user.course_id is not None and user.course_id in self.allowed_program_ids())
+
+    def eligible_users(self, queryset=None):
+        """Filter users (all by default) to those eligible to join, on the indexed course_id column."""
+        queryset = User.objects.all() if queryset is None else queryset
+        if self.is_public:
+            return queryset
+        return queryset.filter(course_id__in=self.allowed_program_ids())
+
 ROLE_ADVISER = "adviser"
 ROLE_MEMBER = "member"
 ROLE_OFFICER = "officer"
@@ -75,6 +161,12 @@ class OrganizationMember(models.Model):
 
     class Meta:
         unique_together = ('organization', 'student')
+        indexes = [
+            # "My organizations": WHERE student_id = ? AND is_approved
+            models.Index(fields=['student', 'is_approved'], name='orgmember_student_approved_idx'),
+            # Leader/officer lookups: WHERE organization_id = ? AND role = ?
+            models.Index(fields=['organization', 'role'], name='orgmember_org_role_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.organization.name} ({self.role})"
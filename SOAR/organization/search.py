@@ -0,0 +1,79 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import connections
+from django.db.models import F, FloatField, Func, Q, TextField, Value
+
+# Text search configuration used both for the stored vectors and for queries
+SEARCH_CONFIG = 'english'
+
+# Fields that feed Organization.search_vector
+SEARCH_FIELDS = ('name', 'description', 'tags')
+
+_trigram_available = {}
+
+
+def search_vector_expression():
+    """Weighted document for an organization: name (A), tags (B), description (C)."""
+    tags = Func(F('tags'), Value(' '), function='array_to_string', output_field=TextField())
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG) +
+        SearchVector(tags, weight='B', config=SEARCH_CONFIG) +
+        SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recompute the stored search vector of every organization in `queryset` with one UPDATE."""
+    return queryset.update(search_vector=search_vector_expression())
+
+
+def has_trigram(using='default'):
+    """Whether the pg_trgm extension is installed on the database (checked once per process)."""
+    if using not in _trigram_available:
+        connection = connections[using]
+        if connection.vendor != 'postgresql':
+            _trigram_available[using] = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                _trigram_available[using] = cursor.fetchone() is not None
+    return _trigram_available[using]
+
+
+def prefix_query(term):
+    """tsquery matching every word of `term`, the last one as a prefix, for search-as-you-type.
+
+    Returns None when the term has no searchable words.
+    """
+    words = re.findall(r'\w+', term.lower())
+    if not words:
+        return None
+    raw = ' & '.join(f"'{word}'" for word in words[:-1])
+    last = f"'{words[-1]}':*"
+    raw = f"{raw} & {last}" if raw else last
+    return SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_organizations(queryset, term):
+    """Filter `queryset` to organizations matching `term`, best matches first.
+
+    Matches on the stored, GIN-indexed search vector (name weighted above
+    tags above description, the last word treated as a prefix) and, when
+    pg_trgm is installed, on name similarity (the `%` operator, served by
+    the trigram index) so that misspelled queries still find the
+    organization. Word matches come first by rank, then typo matches by
+    similarity. Adds `rank` and `similarity` annotations.
+    """
+    query = prefix_query(term)
+    if query is None:
+        return queryset.none()
+
+    queryset = queryset.annotate(rank=SearchRank(F('search_vector'), query))
+    match = Q(search_vector=query)
+    if has_trigram(queryset.db):
+        queryset = queryset.annotate(similarity=TrigramSimilarity('name', term))
+        match |= Q(name__trigram_similar=term)
+    else:
+        queryset = queryset.annotate(similarity=Value(0.0, output_field=FloatField()))
+    return queryset.filter(match).order_by('-rank', '-similarity', 'name')
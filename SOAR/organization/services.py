@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.db.models import Exists, F, Func, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from SOAR.accounts.models import User
+from .models import Organization, OrganizationMember, Program
+
+PROGRAM_STATS_KEY = "organization:program_stats"
+
+# Invalidated by SOAR.organization.signals; the timeout only bounds drift from raw writes
+PROGRAM_STATS_TIMEOUT = 60 * 10
+
+
+def eligible_organizations_q(program_id):
+    """Organizations a student of `program_id` may join: public ones and private ones allowing the program.
+
+    The allowed programs are matched in a subquery, so filtering never
+    repeats an organization.
+    """
+    allowing = Organization.allowed_programs.through.objects.filter(program_id=program_id).values('organization_id')
+    return Q(is_public=True) | Q(pk__in=allowing)
+
+
+def eligible_invitees(organization, queryset=None):
+    """Users who may be added to `organization`, as a filter applied inside the query.
+
+    Excludes current members and requests; for private organizations keeps
+    only users whose program is allowed.
+    """
+    return organization.eligible_users(queryset).exclude(
+        Exists(OrganizationMember.objects.filter(organization=organization, student=OuterRef('pk')))
+    )
+
+
+def _count(queryset):
+    """Correlated COUNT(*) subquery for annotating one number per outer row."""
+    counted = queryset.order_by().annotate(total=Func(F('pk'), function='COUNT')).values('total')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+class ProgramStats:
+    """Per-program counts shared by the admin API and the organization pages.
+
+    `student_count`: users enrolled in the program.
+    `eligible_org_count`: organizations those students may join.
+    `active_member_count`: approved memberships held by those students.
+
+    `annotate()` adds the counts to any Program queryset as one query with
+    correlated subqueries (so sorting and paging stay in SQL); `get()` returns
+    the same numbers for every program as a cached map.
+    """
+
+    FIELDS = ('student_count', 'eligible_org_count', 'active_member_count')
+
+    @staticmethod
+    def annotate(queryset=None):
+        queryset = Program.objects.all() if queryset is None else queryset
+        program = OuterRef('pk')
+        private_orgs = Organization.allowed_programs.through.objects.filter(
+            program_id=program,
+            organization__is_public=False
+        )
+        return queryset.annotate(
+            student_count=_count(User.objects.filter(course_id=program)),
+            eligible_org_count=_count(Organization.objects.filter(is_public=True)) + _count(private_orgs),
+            active_member_count=_count(OrganizationMember.objects.filter(student__course_id=program, is_approved=True)),
+        )
+
+    @classmethod
+    def get(cls):
+        """Return {program_id: {field: count}} for all programs, hitting the database only on a cache miss."""
+        stats = cache.get(PROGRAM_STATS_KEY)
+        if stats is None:
+            stats = {
+                row['pk']: {field: row[field] for field in cls.FIELDS}
+                for row in cls.annotate().values('pk', *cls.FIELDS)
+            }
+            cache.set(PROGRAM_STATS_KEY, stats, PROGRAM_STATS_TIMEOUT)
+        return stats
+
+    @classmethod
+    def for_program(cls, program_id):
+        """Counts for one program; zeros for an unknown id."""
+        return cls.get().get(program_id, dict.fromkeys(cls.FIELDS, 0))
+
+    @staticmethod
+    def invalidate():
+        cache.delete(PROGRAM_STATS_KEY)
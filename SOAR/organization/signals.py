@@ -1,7 +1,14 @@
 # organization/signals.py
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
-from .models import Organization, OrganizationMember
+from SOAR.accounts.models import User
+from .autocomplete import bump_index_version
+from .models import Organization, OrganizationMember, Program, allowed_programs_key
+from .search import SEARCH_FIELDS, update_search_vectors
+from .services import ProgramStats
+from .tags import invalidate_tag_facets
 
 @receiver(post_save, sender=Organization)
 def add_adviser_as_member(sender, instance, created, **kwargs):
@@ -14,3 +21,101 @@ def add_adviser_as_member(sender, instance, created, **kwargs):
                 'is_approved': True,
             }
         )
+
+
+@receiver(post_save, sender=Organization)
+def refresh_search_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS)):
+        return
+    update_search_vectors(Organization.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_tag_facets_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'tags' in update_fields:
+        invalidate_tag_facets()
+
+
+@receiver(post_delete, sender=Organization)
+def invalidate_tag_facets_on_delete(sender, instance, **kwargs):
+    invalidate_tag_facets()
+
+
+def _invalidate_program_stats(**kwargs):
+    # After commit, so no request re-caches the old counts before the change is visible
+    transaction.on_commit(ProgramStats.invalidate)
+
+
+# Program stats count students, public/private organizations and approved memberships
+for model in (Program, Organization, OrganizationMember):
+    post_save.connect(_invalidate_program_stats, sender=model, dispatch_uid=f'program_stats_{model.__name__}_save')
+    post_delete.connect(_invalidate_program_stats, sender=model, dispatch_uid=f'program_stats_{model.__name__}_delete')
+m2m_changed.connect(
+    _invalidate_program_stats,
+    sender=Organization.allowed_programs.through,
+    dispatch_uid='program_stats_allowed_programs'
+)
+
+
+@receiver(post_save, sender=User)
+def invalidate_program_stats_for_user(sender, instance, created, update_fields=None, **kwargs):
+    # Logins save only last_login; only a new user or a possible course change matters
+    if created or update_fields is None or 'course' in update_fields:
+        _invalidate_program_stats()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_program_stats_for_deleted_user(sender, instance, **kwargs):
+    _invalidate_program_stats()
+
+
+def _invalidate_allowed_programs(organization_ids):
+    keys = [allowed_programs_key(organization_id) for organization_id in organization_ids]
+    # After commit, so no request re-caches the old programs before the change is visible
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(m2m_changed, sender=Organization.allowed_programs.through)
+def invalidate_allowed_programs(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            _invalidate_allowed_programs([instance.pk])
+    elif action == 'pre_clear':
+        # pk_set is not sent for a clear from the program side; collect the organizations first
+        _invalidate_allowed_programs(instance.organization_set.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        _invalidate_allowed_programs(pk_set)
+
+
+@receiver(pre_delete, sender=Program)
+def invalidate_allowed_programs_for_program(sender, instance, **kwargs):
+    # The through rows are removed by cascade, which sends no m2m_changed
+    _invalidate_allowed_programs(instance.organization_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Organization)
+def forget_allowed_programs(sender, instance, **kwargs):
+    _invalidate_allowed_programs([instance.pk])
+
+
+def _bump_name_index(kind):
+    # After commit, so no worker rebuilds from data that is not visible yet
+    transaction.on_commit(lambda: bump_index_version(kind))
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_organization_names(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not (created or update_fields is None or 'name' in update_fields):
+        return
+    _bump_name_index('organizations')
+
+
+@receiver(post_delete, sender=Organization)
+def invalidate_deleted_organization_name(sender, instance, **kwargs):
+    _bump_name_index('organizations')
+
+
+@receiver(post_save, sender=Program)
+@receiver(post_delete, sender=Program)
+def invalidate_program_names(sender, instance, **kwargs):
+    _bump_name_index('programs')
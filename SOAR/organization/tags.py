@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.db import connections
+
+from .models import Organization, normalize_tags
+
+TAG_FACETS_KEY = "organization:tag_facets"
+
+# Invalidated by SOAR.organization.signals; the timeout only bounds drift from raw writes
+TAG_FACETS_TIMEOUT = 60 * 10
+
+# 'any': organizations with at least one of the tags; 'all': organizations with every tag
+TAG_MATCHES = ('any', 'all')
+
+
+def parse_tags(values):
+    """Normalized tags from request values, each of which may hold several comma-separated tags."""
+    return normalize_tags(tag for value in values for tag in value.split(','))
+
+
+def filter_by_tags(queryset, tags, match='all'):
+    """Filter `queryset` to organizations tagged with any or all of `tags`.
+
+    Compares against the GIN-indexed `normalized_tags` column (`&&` for
+    'any', `@>` for 'all'). An empty tag list leaves the queryset unchanged.
+    Raises ValueError for an unknown `match`.
+    """
+    if match not in TAG_MATCHES:
+        raise ValueError(f"match must be one of: {', '.join(TAG_MATCHES)}")
+    tags = normalize_tags(tags)
+    if not tags:
+        return queryset
+    if match == 'any':
+        return queryset.filter(normalized_tags__overlap=tags)
+    return queryset.filter(normalized_tags__contains=tags)
+
+
+def count_tags(queryset):
+    """Return [(tag, organization count)] for the organizations in `queryset`, most used first.
+
+    One grouped query over the unnested tag arrays.
+    """
+    inner, params = queryset.order_by().values('normalized_tags').query.sql_with_params()
+    sql = (
+        f"SELECT tag, COUNT(*) AS total FROM ({inner}) AS orgs, unnest(orgs.normalized_tags) AS tag "
+        "GROUP BY tag ORDER BY total DESC, tag"
+    )
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(tag, total) for tag, total in cursor.fetchall()]
+
+
+def tag_facets():
+    """Tag counts over every organization, hitting the database only on a cache miss."""
+    facets = cache.get(TAG_FACETS_KEY)
+    if facets is None:
+        facets = count_tags(Organization.objects.all())
+        cache.set(TAG_FACETS_KEY, facets, TAG_FACETS_TIMEOUT)
+    return facets
+
+
+def invalidate_tag_facets():
+    cache.delete(TAG_FACETS_KEY)
@@ -1,8 +1,14 @@
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from .models import Organization, OrganizationMember, ROLE_MEMBER, ROLE_LEADER, ROLE_ADVISER
+from django.core.cache import cache
+from .models import Organization, OrganizationMember, Program, ROLE_MEMBER, ROLE_LEADER, ROLE_ADVISER, derive_org_type
+from .search import has_trigram, search_organizations
+from .autocomplete import autocomplete, index_version
+from .services import ProgramStats
+from .tags import count_tags, filter_by_tags, tag_facets
 import json
+from unittest import mock, skipUnless
 
 User = get_user_model()
 
@@ -179,3 +185,355 @@ class LeaveOrganizationTestCase(TestCase):
         response = self.client.post(url)
 
         self.assertEqual(response.status_code, 404)
+
+
+class OrganizationTypeTestCase(TestCase):
+    def test_type_follows_tags(self):
+        """Test that org_type is derived from tags whenever the organization is saved"""
+        org = Organization.objects.create(name='Dance Troupe', tags=['Cultural', 'Sports'])
+        self.assertEqual(org.org_type, 'Sports')
+
+        org.tags = ['interest']
+        org.save(update_fields=['tags'])
+        org.refresh_from_db()
+        self.assertEqual(org.org_type, 'Special Interest')
+
+        org.tags = []
+        org.save()
+        self.assertEqual(Organization.objects.get(pk=org.pk).org_type, 'Academic')
+
+    def test_derive_org_type(self):
+        """Test the tag precedence used for organization types"""
+        self.assertEqual(derive_org_type(['CULTURAL', 'special']), 'Cultural')
+        self.assertEqual(derive_org_type(None), 'Academic')
+
+
+class ProgramStatsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.bsit = Program.objects.create(abbreviation='BSIT', name='Information Technology')
+        self.bscs = Program.objects.create(abbreviation='BSCS', name='Computer Science')
+        self.students = [
+            User.objects.create_user(username=f'it{i}', course=self.bsit) for i in range(3)
+        ] + [User.objects.create_user(username='cs0', course=self.bscs)]
+        self.public_org = Organization.objects.create(name='Open Club', is_public=True)
+        self.private_org = Organization.objects.create(name='IT Guild', is_public=False)
+        self.private_org.allowed_programs.set([self.bsit])
+        OrganizationMember.objects.create(organization=self.public_org, student=self.students[0], is_approved=True)
+        OrganizationMember.objects.create(organization=self.private_org, student=self.students[0], is_approved=True)
+        OrganizationMember.objects.create(organization=self.private_org, student=self.students[1], is_approved=False)
+
+    def test_annotate_counts_in_one_query(self):
+        """Test that student, eligible organization and active member counts come from one query"""
+        with self.assertNumQueries(1):
+            programs = {p.abbreviation: p for p in ProgramStats.annotate()}
+        self.assertEqual(
+            (programs['BSIT'].student_count, programs['BSIT'].eligible_org_count, programs['BSIT'].active_member_count),
+            (3, 2, 2)
+        )
+        self.assertEqual(
+            (programs['BSCS'].student_count, programs['BSCS'].eligible_org_count, programs['BSCS'].active_member_count),
+            (1, 1, 0)
+        )
+
+    def test_cached_map_is_invalidated(self):
+        """Test that the cached stats map is reused until a counted row changes"""
+        self.assertEqual(ProgramStats.for_program(self.bscs.pk)['eligible_org_count'], 1)
+        with self.assertNumQueries(0):
+            ProgramStats.get()
+
+        # The cached map is dropped once the change commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private_org.allowed_programs.add(self.bscs)
+        self.assertEqual(ProgramStats.for_program(self.bscs.pk)['eligible_org_count'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='cs1', course=self.bscs)
+        self.assertEqual(ProgramStats.for_program(self.bscs.pk)['student_count'], 2)
+
+        # A login only saves last_login, which cannot change any count
+        ProgramStats.get()
+        self.students[3].save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            ProgramStats.get()
+
+    def test_browse_page_eligible_filter(self):
+        """Test that the browse page can keep only organizations open to the user's program"""
+        self.public_org.allowed_programs.set([self.bsit, self.bscs])
+        self.client.force_login(self.students[3])
+
+        response = self.client.get(reverse('organizations_page'), {'eligible': '1'})
+        self.assertEqual([org.name for org in response.context['all_orgs']], ['Open Club'])
+        self.assertEqual(response.context['eligible_org_count'], 1)
+
+        response = self.client.get(reverse('organizations_page'))
+        self.assertEqual(sorted(org.name for org in response.context['all_orgs']), ['IT Guild', 'Open Club'])
+
+
+class OrganizationSearchTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='testpass123')
+        self.client.login(username='searcher', password='testpass123')
+        self.robotics = Organization.objects.create(name='Robotics Society', description='We build robots.')
+        self.chess = Organization.objects.create(name='Chess Club', description='Weekly robotics-free games.')
+        self.dance = Organization.objects.create(name='Dance Troupe', tags=['cultural', 'performing'])
+
+    def _names(self, term):
+        return [org.name for org in search_organizations(Organization.objects.all(), term)]
+
+    def test_ranked_weighted_search(self):
+        """Test that name matches outrank description matches and tags are searchable"""
+        self.assertEqual(self._names('robotics'), ['Robotics Society', 'Chess Club'])
+        self.assertEqual(self._names('performing'), ['Dance Troupe'])
+        # The last word is matched as a prefix for search-as-you-type
+        self.assertEqual(self._names('soc'), ['Robotics Society'])
+        self.assertEqual(self._names('!!'), [])
+
+    def test_vector_follows_edits(self):
+        """Test that the stored search vector is refreshed when searchable fields change"""
+        self.chess.description = 'Strategy and tournaments.'
+        self.chess.save(update_fields=['description'])
+        self.assertEqual(self._names('tournament'), ['Chess Club'])
+        self.assertEqual(self._names('robotics'), ['Robotics Society'])
+
+    @skipUnless(has_trigram(), 'pg_trgm is not installed')
+    def test_typo_tolerance(self):
+        """Test that misspelled names still match through trigram similarity"""
+        self.assertIn('Robotics Society', self._names('robotiks society'))
+
+    def test_search_api_and_page(self):
+        """Test the live search API and the organizations page search"""
+        data = self.client.get('/organization/organizations/search/', {'q': 'robot'}).json()
+        self.assertEqual([org['name'] for org in data], ['Robotics Society', 'Chess Club'])
+        self.assertEqual(self.client.get('/organization/organizations/search/', {'q': ''}).json(), [])
+
+        OrganizationMember.objects.create(organization=self.robotics, student=self.user, is_approved=True)
+        response = self.client.get(reverse('organizations_page'), {'q': 'robotics'})
+        self.assertEqual([org.name for org in response.context['all_orgs']], ['Chess Club'])
+
+
+class OrganizationTagsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='browser', password='testpass123')
+        self.client.login(username='browser', password='testpass123')
+        self.dance = Organization.objects.create(name='Dance Troupe', tags=['Cultural', 'Performing ', 'cultural'])
+        self.choir = Organization.objects.create(name='Choir', tags=['performing', 'Music'])
+        self.chess = Organization.objects.create(name='Chess Club', tags=['Strategy'])
+
+    def _names(self, tags, match='all'):
+        return sorted(org.name for org in filter_by_tags(Organization.objects.all(), tags, match))
+
+    def test_tags_are_normalized(self):
+        """Test that tags are stored lowercased and deduplicated alongside the originals"""
+        self.assertEqual(self.dance.normalized_tags, ['cultural', 'performing'])
+        self.chess.tags = ['Board Games']
+        self.chess.save(update_fields=['tags'])
+        self.chess.refresh_from_db()
+        self.assertEqual(self.chess.normalized_tags, ['board games'])
+
+    def test_overlap_and_contains_filters(self):
+        """Test filtering by any or all of several tags, ignoring case"""
+        self.assertEqual(self._names(['PERFORMING', 'strategy'], match='any'), ['Chess Club', 'Choir', 'Dance Troupe'])
+        self.assertEqual(self._names(['performing', 'Music']), ['Choir'])
+        self.assertEqual(self._names([]), ['Chess Club', 'Choir', 'Dance Troupe'])
+        with self.assertRaises(ValueError):
+            self._names(['music'], match='some')
+
+    def test_facet_counts_cached_and_invalidated(self):
+        """Test that facet counts come from one grouped query and follow tag edits"""
+        expected = [('performing', 2), ('cultural', 1), ('music', 1), ('strategy', 1)]
+        with self.assertNumQueries(1):
+            self.assertEqual(tag_facets(), expected)
+        with self.assertNumQueries(0):
+            tag_facets()
+        self.assertEqual(count_tags(Organization.objects.filter(name='Choir')), [('music', 1), ('performing', 1)])
+
+        self.chess.delete()
+        self.assertNotIn(('strategy', 1), tag_facets())
+
+    def test_tag_filter_api_and_page(self):
+        """Test the tag filters of the organization API and the browse page"""
+        data = self.client.get('/organization/organizations/', {'tags': 'performing,cultural'}).json()
+        self.assertEqual([org['name'] for org in data], ['Dance Troupe'])
+        response = self.client.get('/organization/organizations/', {'tags': 'music', 'match': 'some'})
+        self.assertEqual(response.status_code, 400)
+        data = self.client.get('/organization/organizations/tags/').json()
+        self.assertEqual(data[0], {'tag': 'performing', 'count': 2})
+
+        response = self.client.get(reverse('organizations_page'), {'tag': ['Performing', 'music']})
+        self.assertEqual([org.name for org in response.context['all_orgs']], ['Choir'])
+        self.assertEqual(response.context['selected_tags'], ['music', 'performing'])
+        self.assertTrue(response.context['tag_facets'][0]['selected'])
+
+
+class NameAutocompleteTestCase(TestCase):
+    def setUp(self):
+        for name in ('Chess Club', 'Choir', 'Robotics Society', 'Club House'):
+            Organization.objects.create(name=name)
+        self.bsit = Program.objects.create(abbreviation='BSIT', name='Information Technology')
+        Program.objects.create(abbreviation='BSCS', name='Computer Science')
+        # Fresh version stamps, so no index built by an earlier test is reused
+        cache.clear()
+
+    def _names(self, kind, prefix):
+        return [entry['name'] for entry in autocomplete(kind, prefix)]
+
+    def test_prefix_lookups(self):
+        """Test that names match on any word, whole-name prefixes first"""
+        self.assertEqual(self._names('organizations', 'CH'), ['Chess Club', 'Choir'])
+        self.assertEqual(self._names('organizations', 'club'), ['Club House', 'Chess Club'])
+        self.assertEqual(self._names('organizations', 'x'), [])
+        self.assertEqual(self._names('programs', 'bs'), ['Computer Science', 'Information Technology'])
+        self.assertEqual(self._names('programs', 'tech'), ['Information Technology'])
+        # Answered from memory once built; only the version stamp is read from the cache
+        with self.assertNumQueries(0):
+            self._names('organizations', 'rob')
+
+    def test_rebuilt_after_name_changes(self):
+        """Test that saves and deletes replace the version stamp once committed"""
+        self._names('organizations', 'ch')
+        version = index_version('organizations')
+        chess = Organization.objects.get(name='Chess Club')
+        with self.captureOnCommitCallbacks(execute=True):
+            chess.description = 'Weekly games'
+            chess.save(update_fields=['description'])
+        self.assertEqual(index_version('organizations'), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Organization.objects.create(name='Chess Masters')
+        self.assertEqual(self._names('organizations', 'chess'), ['Chess Club', 'Chess Masters'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bsit.delete()
+        self.assertEqual(self._names('programs', 'bs'), ['Computer Science'])
+
+    def test_rebuilt_after_max_age(self):
+        """Test that an index is rebuilt once it is too old, even if no stamp change reached this process"""
+        self._names('organizations', 'ch')
+        Organization.objects.filter(name='Choir').update(name='Chorale')
+        self.assertEqual(self._names('organizations', 'chor'), [])
+
+        with mock.patch('SOAR.organization.autocomplete.NAME_INDEX_MAX_AGE', 0):
+            self.assertEqual(self._names('organizations', 'chor'), ['Chorale'])
+
+    def test_autocomplete_endpoints(self):
+        """Test the organization autocomplete API and the program lookup"""
+        User.objects.create_user(username='picker', password='testpass123')
+        self.client.login(username='picker', password='testpass123')
+        data = self.client.get('/organization/organizations/autocomplete/', {'q': 'ch', 'limit': 1}).json()
+        self.assertEqual([org['name'] for org in data], ['Chess Club'])
+
+        data = self.client.get(reverse('get_programs'), {'q': 'comp'}).json()
+        self.assertEqual([program['abbreviation'] for program in data], ['BSCS'])
+        self.assertEqual(len(self.client.get(reverse('get_programs')).json()), 2)
+
+
+class InviteSearchTestCase(TestCase):
+    def setUp(self):
+        self.bsit = Program.objects.create(abbreviation='BSIT', name='Information Technology')
+        bscs = Program.objects.create(abbreviation='BSCS', name='Computer Science')
+        self.officer = User.objects.create_user(username='officer', password='testpass123', course=self.bsit)
+        self.client.login(username='officer', password='testpass123')
+        self.org = Organization.objects.create(name='IT Guild', is_public=False)
+        self.org.allowed_programs.set([self.bsit])
+        OrganizationMember.objects.create(organization=self.org, student=self.officer, role=ROLE_LEADER, is_approved=True)
+
+        for first, last, username, course in [
+            ('Joanna', 'Lee', 'jlee', self.bsit),
+            ('Anna', 'Smith', 'asmith', self.bsit),
+            ('Mark', 'Annable', 'mannable', self.bsit),
+            ('Annie', 'Cruz', 'acruz', bscs),
+            ('Hanna', 'Go', 'hgo', None),
+        ]:
+            User.objects.create_user(username=username, first_name=first, last_name=last, course=course)
+        self.url = f'/organization/organizations/{self.org.id}/users/search/'
+
+    def test_prefix_matches_rank_first_and_eligibility_applies(self):
+        """Test that name-part prefix matches come first and ineligible users are left out"""
+        data = self.client.get(self.url, {'q': 'ANN'}).json()
+        self.assertEqual([user['username'] for user in data['results']], ['asmith', 'mannable', 'jlee'])
+        self.assertEqual(data['results'][0]['program'], 'BSIT')
+        self.assertFalse(data['hasNext'])
+
+        # Every word must match somewhere in the name or username
+        data = self.client.get(self.url, {'q': 'smith an'}).json()
+        self.assertEqual([user['username'] for user in data['results']], ['asmith'])
+        self.assertEqual(self.client.get(self.url, {'q': 'officer'}).json()['results'], [])
+
+    def test_cursor_paging(self):
+        """Test that cursors walk through every result exactly once"""
+        seen, cursor = [], ''
+        while True:
+            data = self.client.get(self.url, {'q': 'ann', 'page_size': 1, 'cursor': cursor}).json()
+            seen += [user['username'] for user in data['results']]
+            if not data['hasNext']:
+                break
+            cursor = data['nextCursor']
+        self.assertEqual(seen, ['asmith', 'mannable', 'jlee'])
+        self.assertEqual(self.client.get(self.url, {'q': 'ann', 'cursor': 'garbage'}).status_code, 400)
+
+    def test_public_organization_invites_any_program(self):
+        """Test that public organizations can invite users from any program"""
+        self.org.is_public = True
+        self.org.save()
+        data = self.client.get(self.url, {'q': 'ann', 'page_size': 10}).json()
+        self.assertEqual(
+            [user['username'] for user in data['results']],
+            ['asmith', 'acruz', 'mannable', 'hgo', 'jlee']
+        )
+
+
+class JoinEligibilityTestCase(TestCase):
+    def setUp(self):
+        self.bsit = Program.objects.create(abbreviation='BSIT', name='Information Technology')
+        self.bscs = Program.objects.create(abbreviation='BSCS', name='Computer Science')
+        self.it_student = User.objects.create_user(username='itstudent', password='testpass123', course=self.bsit)
+        self.cs_student = User.objects.create_user(username='csstudent', password='testpass123', course=self.bscs)
+        self.no_program = User.objects.create_user(username='noprogram', password='testpass123')
+        self.org = Organization.objects.create(name='IT Guild', is_public=False)
+        self.org.allowed_programs.set([self.bsit])
+
+    def test_can_join_uses_allowed_program_ids(self):
+        """Test that only students of allowed programs can join a private organization"""
+        self.assertTrue(self.org.can_join(self.it_student))
+        self.assertFalse(self.org.can_join(self.cs_student))
+        self.assertFalse(self.org.can_join(self.no_program))
+        self.assertEqual(set(self.org.eligible_users()), {self.it_student})
+
+        public_org = Organization.objects.create(name='Open Club', is_public=True)
+        self.assertTrue(public_org.can_join(self.no_program))
+        self.assertEqual(public_org.eligible_users().count(), User.objects.count())
+
+    def test_allowed_program_ids_are_cached_and_invalidated(self):
+        """Test that the cached program ids follow changes from either side of the relation"""
+        self.assertEqual(self.org.allowed_program_ids(), {self.bsit.id})
+        with self.assertNumQueries(0):
+            self.assertFalse(self.org.can_join(self.cs_student))
+
+        # The cached ids are dropped once the change commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.org.allowed_programs.add(self.bscs)
+        self.assertTrue(self.org.can_join(self.cs_student))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bscs.organization_set.clear()
+        self.assertFalse(self.org.can_join(self.cs_student))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bsit.delete()
+        self.assertEqual(self.org.allowed_program_ids(), frozenset())
+
+    def test_join_refused_for_ineligible_program(self):
+        """Test that joining a private organization requires an allowed program"""
+        self.client.login(username='csstudent', password='testpass123')
+        url = reverse('join_org', args=[self.org.id])
+        response = self.client.post(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(response.json()['success'])
+        self.assertFalse(OrganizationMember.objects.filter(organization=self.org, student=self.cs_student).exists())
+
+        self.client.login(username='itstudent', password='testpass123')
+        response = self.client.post(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertTrue(response.json()['success'])
+        self.assertTrue(OrganizationMember.objects.filter(organization=self.org, student=self.it_student).exists())
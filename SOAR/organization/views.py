@@ -1,6 +1,7 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
@@ -10,25 +11,19 @@ from django.http import JsonResponse
 import json
 from .models import Organization, OrganizationMember, Program, ROLE_MEMBER, ROLE_OFFICER, ROLE_LEADER, ROLE_ADVISER
 from SOAR.accounts.models import User
-from SOAR.event.models import OrganizationEvent, EventRSVP
+from SOAR.accounts.search import DEFAULT_SEARCH_PAGE_SIZE, MAX_SEARCH_PAGE_SIZE, search_page
+from SOAR.event.models import OrganizationEvent
+from SOAR.event.services import attach_rsvp_summary
+from .autocomplete import AUTOCOMPLETE_LIMIT, MAX_AUTOCOMPLETE_LIMIT, autocomplete, get_index
 from .forms import OrganizationEditForm
+from .search import search_organizations
+from .services import eligible_invitees
+from .tags import filter_by_tags, parse_tags, tag_facets
 from .serializers import OrganizationSerializer, OrganizationMemberSerializer, ProgramSerializer
 from .permissions import IsOrgOfficerOrAdviser
 from django.core.mail import send_mail
 from decouple import config
 
-# Lazy-load Supabase to prevent Windows crashes
-def get_supabase_client():
-    try:
-        from supabase import create_client
-        SUPABASE_URL = config("SUPABASE_URL", default="")
-        SUPABASE_KEY = config("SUPABASE_KEY", default="")
-        if SUPABASE_URL and SUPABASE_KEY:
-            return create_client(SUPABASE_URL, SUPABASE_KEY)
-    except Exception as e:
-        print(f"Supabase initialization failed: {e}")
-    return None
-
 
 def organization_detail(request, org_id):
     organization = get_object_or_404(Organization, id=org_id)
@@ -39,6 +34,11 @@ def organization_detail(request, org_id):
     })
 
 
+def _autocomplete_limit(value):
+    """Parse an autocomplete ?limit=. Raises ValueError if it is not a number."""
+    return max(1, min(int(value), MAX_AUTOCOMPLETE_LIMIT)) if value else AUTOCOMPLETE_LIMIT
+
+
 # ==============================
 # ORGANIZATION VIEWSET
 # ==============================
@@ -47,6 +47,31 @@ class OrganizationViewSet(viewsets.ModelViewSet):
     serializer_class = OrganizationSerializer
     permission_classes = [IsAuthenticated]
 
+    def filter_queryset(self, queryset):
+        """List and search accept ?tags=a,b (or repeated ?tags=) with ?match=all|any."""
+        queryset = super().filter_queryset(queryset)
+        if self.action in ('list', 'search'):
+            tags = parse_tags(self.request.query_params.getlist('tags'))
+            try:
+                queryset = filter_by_tags(queryset, tags, self.request.query_params.get('match', 'all'))
+            except ValueError as e:
+                raise ValidationError({'error': str(e)})
+        return queryset
+
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request):
+        """Organization names starting with ?q= (or with a word starting with it), from the in-memory index."""
+        try:
+            limit = _autocomplete_limit(request.query_params.get('limit'))
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(autocomplete('organizations', request.query_params.get('q', ''), limit))
+
+    @action(detail=False, methods=['get'], url_path='tags')
+    def tags(self, request):
+        """Tag facet counts over all organizations, most used first."""
+        return Response([{'tag': tag, 'count': count} for tag, count in tag_facets()])
+
     @action(detail=True, methods=['get'], url_path='members')
     def members(self, request, pk=None):
         org = self.get_object()
@@ -61,49 +86,59 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         serializer = OrganizationMemberSerializer(members, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """Ranked organization search for the live search box (?q=..., optional ?limit=)."""
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 50))
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        if not query:
+            return Response([])
+
+        organizations = search_organizations(self.filter_queryset(self.get_queryset()), query)[:limit]
+        return Response([
+            {
+                'id': str(org.id),
+                'name': org.name,
+                'description': org.description,
+                'tags': org.tags,
+                'isPublic': org.is_public,
+                'rank': round(org.rank, 4),
+            }
+            for org in organizations
+        ])
+
     @action(detail=True, methods=['get'], url_path='users/search')
     def users_search(self, request, pk=None):
+        """Users who can be invited, best matches first (?q=..., ?cursor=, ?page_size=)."""
         org = self.get_object()
         query = request.query_params.get('q', '').strip()
-
-        # Base queryset: all users
-        users = User.objects.all()
-
-        # If organization is private, filter by allowed programs
-        if not org.is_public:
-            allowed_programs = org.allowed_programs.all()
-            program_names = [p.name for p in allowed_programs]
-            program_abbrevs = [p.abbreviation for p in allowed_programs]
-            users = users.filter(
-                Q(course__in=program_names) | Q(course__in=program_abbrevs)
-            )
-
-        # Exclude users who are already members of this organization
-        existing_member_ids = org.members.values_list('student_id', flat=True)
-        users = users.exclude(id__in=existing_member_ids)
-
-        # Apply search query
-        if query:
-            users = users.filter(
-                Q(username__icontains=query) |
-                Q(first_name__icontains=query) |
-                Q(last_name__icontains=query)
+        page_size = request.query_params.get('page_size')
+        try:
+            page_size = max(1, min(int(page_size), MAX_SEARCH_PAGE_SIZE)) if page_size else DEFAULT_SEARCH_PAGE_SIZE
+            users, next_cursor = search_page(
+                eligible_invitees(org).select_related('course'),
+                query,
+                cursor=request.query_params.get('cursor'),
+                page_size=page_size
             )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Serialize with basic user info
-        user_data = users.values('id', 'username', 'first_name', 'last_name', 'email', 'course')[:50]  # Limit to 50 results
         results = []
-        for user in user_data:
-            full_name = f"{user['first_name']} {user['last_name']}".strip()
+        for user in users:
+            full_name = f"{user.first_name} {user.last_name}".strip()
             results.append({
-                'id': str(user['id']),
-                'name': full_name or user['username'],
-                'username': user['username'],
-                'email': user['email'],
-                'program': user['course'] or '',
+                'id': str(user.id),
+                'name': full_name or user.username,
+                'username': user.username,
+                'email': user.email,
+                'program': user.course.abbreviation if user.course else '',
             })
 
-        return Response(results)
+        return Response({'results': results, 'nextCursor': next_cursor, 'hasNext': next_cursor is not None})
 
 
 # ==============================
@@ -147,6 +182,9 @@ class OrganizationMemberViewSet(viewsets.ModelViewSet):
         if OrganizationMember.objects.filter(student=user, organization=organization).exists():
             return Response({'error': 'User is already a member of this organization'}, status=status.HTTP_400_BAD_REQUEST)
 
+        if not organization.can_join(user):
+            return Response({'error': "User's program is not allowed to join this organization"}, status=status.HTTP_400_BAD_REQUEST)
+
         # Create the member
         member = OrganizationMember.objects.create(
             organization=organization,
@@ -345,24 +383,10 @@ def orgpage(request, org_id):
             user_role = org_member.role
         except OrganizationMember.DoesNotExist:
             user_role = None
-    activities = OrganizationEvent.objects.filter(organization=organization).order_by('-date_created')
-
-    # Add RSVP data to each event
-    for event in activities:
-        event.going_count = EventRSVP.objects.filter(event=event, status='going').count()
-        event.interested_count = EventRSVP.objects.filter(event=event, status='interested').count()
-        event.not_going_count = EventRSVP.objects.filter(event=event, status='not_going').count()
-        try:
-            user_rsvp = EventRSVP.objects.get(event=event, user=request.user)
-            event.user_rsvp_status = user_rsvp.status
-        except EventRSVP.DoesNotExist:
-            event.user_rsvp_status = None
-
-        # Get RSVPed users for attendee avatars (limit to 5 for display)
-        event.rsvp_users = EventRSVP.objects.filter(
-            event=event,
-            status='going'
-        ).select_related('user').order_by('date_created')[:5]
+    activities = attach_rsvp_summary(
+        OrganizationEvent.objects.filter(organization=organization).select_related('created_by').order_by('-date_created'),
+        user=request.user
+    )
 
     return render(request, 'organization/orgpage.html', {
         'organization': organization,
@@ -406,13 +430,7 @@ def organization_profile(request, org_id):
     except OrganizationMember.DoesNotExist:
         is_member = False
         # Check if can join
-        can_join = organization.is_public
-        if not can_join:
-            allowed_programs = organization.allowed_programs.all()
-            program_names = [p.name for p in allowed_programs]
-            program_abbrevs = [p.abbreviation for p in allowed_programs]
-            if user.course and (user.course in program_names or user.course in program_abbrevs):
-                can_join = True
+        can_join = organization.can_join(user)
 
     if request.method == 'POST':
         name = (request.POST.get('org_name') or organization.name).strip()
@@ -468,7 +486,7 @@ def organization_editprofile(request, org_id):
         messages.error(request, "You do not have permission to edit this organization's profile.")
         return redirect('organization_profile', org_id=organization.id)
 
-    programs = list(Program.objects.values('id', 'name', 'abbreviation'))
+    programs = get_index('programs').entries
 
     if request.method == 'POST':
         print("=== ORGANIZATION EDIT PROFILE POST REQUEST ===")
@@ -690,8 +708,15 @@ from django.http import JsonResponse
 from .models import Program
 
 def get_programs(request):
-    programs = Program.objects.values('id', 'abbreviation', 'name')
-    return JsonResponse(list(programs), safe=False)
+    """All programs, or with ?q= those whose code or name starts with it (optional ?limit=)."""
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse(get_index('programs').entries, safe=False)
+    try:
+        limit = _autocomplete_limit(request.GET.get('limit'))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+    return JsonResponse(autocomplete('programs', query, limit), safe=False)
 
 
 @login_required
@@ -710,19 +735,12 @@ def calendar_view(request, org_id):
         messages.error(request, 'You are not a member of this organization.')
         return redirect('home')
 
-    # Fetch events for the organization
-    events = OrganizationEvent.objects.filter(organization=organization).order_by('event_date')
-
-    # Add RSVP data to each event
-    for event in events:
-        event.going_count = EventRSVP.objects.filter(event=event, status='going').count()
-        event.interested_count = EventRSVP.objects.filter(event=event, status='interested').count()
-        event.not_going_count = EventRSVP.objects.filter(event=event, status='not_going').count()
-        try:
-            user_rsvp = EventRSVP.objects.get(event=event, user=request.user)
-            event.user_rsvp_status = user_rsvp.status
-        except EventRSVP.DoesNotExist:
-            event.user_rsvp_status = None
+    # Fetch events for the organization with RSVP data
+    events = attach_rsvp_summary(
+        OrganizationEvent.objects.filter(organization=organization).order_by('event_date'),
+        user=request.user,
+        attendee_limit=0
+    )
 
     # Serialize events for JavaScript
     events_data = []
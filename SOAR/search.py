@@ -0,0 +1,207 @@
+"""Global search across organizations, events and members.
+
+Each result type is searched by its own sub-query, run concurrently on a
+shared thread pool. Every worker thread has its own database connection,
+which is kept or closed after each sub-query the same way Django treats
+request connections (CONN_MAX_AGE, or handed back in the 'pool' mode). The
+whole search gets SEARCH_BUDGET seconds: types that have not answered by
+then are reported in `timedOut` instead of holding up the response, and
+on PostgreSQL each sub-query also carries a matching statement_timeout
+so abandoned work is cancelled on the server. Complete results are kept
+in a small per-user LRU of recent queries.
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from SOAR.accounts.models import User
+from SOAR.accounts.search import search_users
+from SOAR.event.models import OrganizationEvent
+from SOAR.event.search import search_events
+from SOAR.organization.models import Organization, OrganizationMember
+from SOAR.organization.search import search_organizations
+
+SEARCH_TYPES = ('organizations', 'events', 'members')
+
+SEARCH_RESULTS_PER_TYPE = 5
+MAX_SEARCH_RESULTS_PER_TYPE = 20
+
+# Seconds the whole search may take before unfinished types are cut off
+SEARCH_BUDGET = 0.5
+
+# Searches this process runs at once. A sub-query cut off by the budget
+# still holds its thread until it returns or its statement_timeout fires,
+# so later searches queue behind it and spend their own budget waiting.
+CONCURRENT_SEARCHES = 2
+
+# Threads shared by all searches in this process, one per type per concurrent search
+SEARCH_WORKERS = CONCURRENT_SEARCHES * len(SEARCH_TYPES)
+
+# Recent queries remembered per user, and for how long
+RECENT_SEARCHES = 10
+RECENT_SEARCHES_TIMEOUT = 60
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            # Concurrent first searches must not each start a pool of threads
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix='search')
+    return _executor
+
+
+def normalize_query(term):
+    return ' '.join(re.findall(r'\S+', term.lower()))
+
+
+def _joined_organizations(user):
+    return OrganizationMember.objects.filter(student=user, is_approved=True).values('organization_id')
+
+
+def _search_organizations(user, term, limit):
+    organizations = search_organizations(Organization.objects.all(), term)[:limit]
+    return [
+        {
+            'id': str(org.id),
+            'name': org.name,
+            'description': org.description,
+            'tags': org.tags,
+            'isPublic': org.is_public,
+            'rank': round(org.rank, 4),
+            'link': f"/organization/organization/{org.id}/profile/",
+        }
+        for org in organizations
+    ]
+
+
+def _search_events(user, term, limit):
+    # Same visibility as global_event_page: upcoming events of organizations the user has joined
+    events = OrganizationEvent.objects.filter(
+        event_date__gte=timezone.now(),
+        organization_id__in=_joined_organizations(user)
+    ).select_related('organization')
+    return [
+        {
+            'id': str(event.id),
+            'title': event.title,
+            'organization': event.organization.name,
+            'date': event.event_date.isoformat(),
+            'location': event.location,
+            'cancelled': event.cancelled,
+            'rank': round(event.rank, 4),
+            'link': f"/event/{event.id}/",
+        }
+        for event in search_events(events, term)[:limit]
+    ]
+
+
+def _search_members(user, term, limit):
+    # Approved members of any organization the user has joined
+    fellows = User.objects.filter(
+        Exists(OrganizationMember.objects.filter(
+            student=OuterRef('pk'),
+            is_approved=True,
+            organization_id__in=_joined_organizations(user)
+        ))
+    ).exclude(pk=user.pk).select_related('course')
+    return [
+        {
+            'id': str(member.id),
+            'name': f"{member.first_name} {member.last_name}".strip() or member.username,
+            'username': member.username,
+            'program': member.course.abbreviation if member.course else '',
+        }
+        for member in search_users(fellows, term)[:limit]
+    ]
+
+
+SEARCHES = {
+    'organizations': _search_organizations,
+    'events': _search_events,
+    'members': _search_members,
+}
+
+
+def _run_search(search, user, term, limit, budget):
+    """Run one sub-search on this worker's own connection, bounded by the budget."""
+    try:
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SET LOCAL statement_timeout = {max(1, int(budget * 1000))}")
+            return search(user, term, limit)
+    finally:
+        # Worker threads outlive requests, so the request_finished cleanup never runs here
+        connection.close_if_unusable_or_obsolete()
+
+
+def _recent_key(user_id):
+    return f"search:recent:{user_id}"
+
+
+def _recent_lookup(user_id, key):
+    recent = cache.get(_recent_key(user_id)) or []
+    for index, (cached_key, results) in enumerate(recent):
+        if cached_key == key:
+            if index:
+                recent.insert(0, recent.pop(index))
+                cache.set(_recent_key(user_id), recent, RECENT_SEARCHES_TIMEOUT)
+            return results
+    return None
+
+
+def _recent_store(user_id, key, results):
+    recent = [entry for entry in cache.get(_recent_key(user_id)) or [] if entry[0] != key]
+    recent.insert(0, (key, results))
+    cache.set(_recent_key(user_id), recent[:RECENT_SEARCHES], RECENT_SEARCHES_TIMEOUT)
+
+
+def global_search(user, term, limit=SEARCH_RESULTS_PER_TYPE, budget=None):
+    """Search every result type for `user` and return the grouped response.
+
+    Returns {'query', 'results': {type: [...]}, 'timedOut': [types], 'cached'}.
+    Results within a type are ranked best first and capped at `limit`.
+    """
+    budget = SEARCH_BUDGET if budget is None else budget
+    term = normalize_query(term)
+    response = {'query': term, 'results': {search_type: [] for search_type in SEARCH_TYPES}, 'timedOut': [], 'cached': False}
+    if not term:
+        return response
+
+    key = (term, limit)
+    results = _recent_lookup(user.pk, key)
+    if results is not None:
+        response.update(results=results, cached=True)
+        return response
+
+    executor = _get_executor()
+    futures = {
+        executor.submit(_run_search, SEARCHES[search_type], user, term, limit, budget): search_type
+        for search_type in SEARCH_TYPES
+    }
+    done, _ = wait(futures, timeout=budget)
+    for future, search_type in futures.items():
+        if future not in done:
+            # Only drops a sub-search still queued; a running one keeps its worker (see CONCURRENT_SEARCHES)
+            future.cancel()
+            response['timedOut'].append(search_type)
+            continue
+        try:
+            response['results'][search_type] = future.result()
+        except DatabaseError:
+            # Most likely cancelled by statement_timeout
+            response['timedOut'].append(search_type)
+
+    if not response['timedOut']:
+        _recent_store(user.pk, key, response['results'])
+    return response
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 import dj_database_url
 from dotenv import load_dotenv
+from SOAR.db_connections import apply_connection_mode
 
 # Load .env
 load_dotenv()
@@ -24,6 +25,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # Third-party
     "rest_framework",
@@ -82,15 +84,23 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 # DATABASE (Supabase or fallback SQLite)
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection strategy for Postgres: close, persistent, pool or external_pooler (see SOAR/db_connections.py)
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE", "persistent")
+
 if DATABASE_URL:
-    DATABASES = {
-        "default": dj_database_url.parse(DATABASE_URL, conn_max_age=0, ssl_require=True)
-    }
-    # Add connection pooling settings for Supabase
-    DATABASES['default']['OPTIONS'] = {
+    database = dj_database_url.parse(DATABASE_URL, ssl_require=True)
+    database['OPTIONS'] = {
         'connect_timeout': 10,
     }
-    DATABASES['default']['CONN_MAX_AGE'] = 0  # Close connections immediately after request
+    DATABASES = {
+        "default": apply_connection_mode(
+            database,
+            DB_CONNECTION_MODE,
+            conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            pool_min_size=int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            pool_max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        )
+    }
 else:
     DATABASES = {
         "default": {
@@ -99,6 +109,25 @@ else:
         }
     }
 
+# CACHE (Redis-compatible server in production, in-process memory otherwise)
+# Invalidation signals (e.g. the name autocomplete version stamps) only reach
+# other processes through a shared cache; run several workers with REDIS_URL set.
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
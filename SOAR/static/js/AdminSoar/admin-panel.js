@@ -16,7 +16,11 @@ const sectionData = {
             ['role'],
             ['status']
         ],
+        // Server-side sort keys per column (null = not sortable)
+        sortKeys: ['studentId', 'email', 'course', 'yearLevel', null, 'status'],
         apiEndpoint: '/admin-panel/api/users/',
+        exportName: 'users',
+        bulkName: 'users',
         formFields: [
             { name: 'studentId', label: 'School ID', type: 'text', required: false },
             { name: 'email', label: 'Email', type: 'email', required: true },
@@ -42,7 +46,10 @@ const sectionData = {
             ['rsvpDate'],
             ['status'],
         ],
+        sortKeys: ['eventName', 'organization', 'student', 'rsvpDate', 'status'],
         apiEndpoint: '/admin-panel/api/rsvps/',
+        exportName: 'rsvps',
+        bulkName: 'rsvps',
         formFields: [
             { name: 'eventName', label: 'Event Name', type: 'text', required: false, readonly: true },
             { name: 'organization', label: 'Organization', type: 'text', required: false, readonly: true },
@@ -66,7 +73,10 @@ const sectionData = {
             ['activityType'],
             ['status']
         ],
+        sortKeys: ['eventName', 'organization', 'date', 'location', 'activityType', null],
         apiEndpoint: '/admin-panel/api/events/',
+        exportName: 'events',
+        bulkName: 'events',
         formFields: [
             { name: 'eventName', label: 'Event Name', type: 'text', required: true },
             { name: 'organization', label: 'Organization', type: 'select', options: [], required: true },
@@ -89,7 +99,10 @@ const sectionData = {
             ['dateJoined'],
             ['status']
         ],
+        sortKeys: ['organization', 'student', 'role', 'dateJoined', null],
         apiEndpoint: '/admin-panel/api/organization-members/',
+        exportName: 'members',
+        bulkName: 'members',
         formFields: [
             { name: 'organization', label: 'Organization', type: 'select', options: [], required: true },
             { name: 'student', label: 'Student (Email)', type: 'text', required: true },
@@ -113,7 +126,10 @@ const sectionData = {
             ['created'],
             ['adviser']
         ],
+        sortKeys: ['orgName', null, 'type', 'members', 'created', null],
         apiEndpoint: '/admin-panel/api/organizations/',
+        exportName: 'organizations',
+        bulkName: 'organizations',
         formFields: [
             { name: 'orgName', label: 'Organization Name', type: 'text', required: false },
             { name: 'description', label: 'Description', type: 'textarea', required: false },
@@ -126,15 +142,19 @@ const sectionData = {
     programs: {
         title: 'Select program to change',
         addButton: 'ADD PROGRAM',
-        columns: ['PROGRAM NAME', 'CODE', 'DEPARTMENT', 'STUDENTS'],
+        columns: ['PROGRAM NAME', 'CODE', 'DEPARTMENT', 'STUDENTS', 'ELIGIBLE ORGS', 'ACTIVE MEMBERS'],
         // Exact backend keys from get_programs_data in AdminSoar.views.py
         fields: [
             ['programName'],
             ['code'],
             ['department'],
             ['students'],
+            ['eligibleOrgs'],
+            ['activeMembers'],
         ],
+        sortKeys: ['programName', 'code', null, 'students', 'eligibleOrgs', 'activeMembers'],
         apiEndpoint: '/admin-panel/api/programs/',
+        bulkName: 'programs',
         formFields: [
             { name: 'programName', label: 'Program Name', type: 'text', required: false },
             { name: 'code', label: 'Program Code', type: 'text', required: false }
@@ -155,6 +175,23 @@ const sectionData = {
 let currentSection = 'users';
 let deleteItemId = null;
 
+// Paging, sorting and search state for the current table; applied server-side
+const PAGE_SIZE = 50;
+let tableState = { page: 1, sort: '', search: '', total: 0, totalIsEstimate: false, hasNext: false };
+
+function resetTableState() {
+    tableState = { page: 1, sort: '', search: '', total: 0, totalIsEstimate: false, hasNext: false };
+}
+
+// Build a table API URL from protocol parameters (page, page_size, sort, search, filter[...])
+function tableUrl(endpoint, params) {
+    const query = new URLSearchParams();
+    for (const [key, value] of Object.entries(params)) {
+        if (value !== undefined && value !== null && value !== '') query.set(key, value);
+    }
+    return `${endpoint}?${query.toString()}`;
+}
+
 // Fetch data from API
 async function fetchSectionData(section) {
     const config = sectionData[section];
@@ -168,12 +205,20 @@ async function fetchSectionData(section) {
         // Show loading spinner
         showTableLoader(true);
 
-        const response = await fetch(config.apiEndpoint);
+        const response = await fetch(tableUrl(config.apiEndpoint, {
+            page: tableState.page,
+            page_size: PAGE_SIZE,
+            sort: tableState.sort,
+            search: tableState.search
+        }));
         if (!response.ok) {
             throw new Error('Failed to fetch data');
         }
         const result = await response.json();
         sectionData[section].data = result.data;
+        tableState.total = result.total;
+        tableState.totalIsEstimate = result.totalIsEstimate;
+        tableState.hasNext = result.hasNext;
     } catch (error) {
         console.error('Error fetching data:', error);
         showToast('Failed to load data', 'error');
@@ -186,7 +231,7 @@ async function fetchSectionData(section) {
 // Fetch organizations for select options
 async function fetchOrganizations() {
     try {
-        const response = await fetch('/admin-panel/api/organizations/');
+        const response = await fetch(tableUrl('/admin-panel/api/organizations/', { page_size: 200, sort: 'orgName' }));
         if (!response.ok) {
             throw new Error('Failed to fetch organizations');
         }
@@ -201,7 +246,7 @@ async function fetchOrganizations() {
 // Fetch programs for select options
 async function fetchPrograms() {
     try {
-        const response = await fetch('/admin-panel/api/programs/');
+        const response = await fetch(tableUrl('/admin-panel/api/programs/', { page_size: 200, sort: 'code' }));
         if (!response.ok) {
             throw new Error('Failed to fetch programs');
         }
@@ -219,14 +264,16 @@ async function fetchPrograms() {
 // Fetch staff users for adviser selection
 async function fetchStaffUsers() {
     try {
-        const response = await fetch('/admin-panel/api/users/');
+        const response = await fetch(tableUrl('/admin-panel/api/users/', {
+            page_size: 200,
+            sort: 'email',
+            'filter[role]': 'staff,admin'
+        }));
         if (!response.ok) {
             throw new Error('Failed to fetch users');
         }
         const result = await response.json();
-        // Filter staff users and return as options
         return result.data
-            .filter(user => user.role === 'Staff' || user.role === 'Admin')
             .map(user => ({
                 value: user.id,
                 label: user.email
@@ -307,11 +354,12 @@ async function loadAdminSection(section) {
     if (sectionTitleEl) sectionTitleEl.textContent = data.title || '';
     if (addButtonTextEl) addButtonTextEl.textContent = data.addButton || '';
 
-    // Clear search input when switching sections
+    // Clear search input and paging when switching sections
     const searchInput = document.getElementById('search-input');
     if (searchInput) {
         searchInput.value = '';
     }
+    resetTableState();
 
     // Show/hide Create Organization button based on section
     const createOrgBtn = document.getElementById('create-org-btn');
@@ -323,6 +371,13 @@ async function loadAdminSection(section) {
         createOrgBtn.classList.remove('flex');
     }
 
+    // Show/hide Import Users button based on section
+    const importUsersBtn = document.getElementById('import-users-btn');
+    if (importUsersBtn) {
+        importUsersBtn.classList.toggle('hidden', section !== 'users');
+        importUsersBtn.classList.toggle('flex', section === 'users');
+    }
+
     const tableDiv = document.querySelector('.bg-white.rounded-lg.shadow-sm.border.border-gray-200');
     const analyticsDiv = document.getElementById('analytics-content');
 
@@ -490,12 +545,22 @@ function renderTable() {
 // Update counts
 function updateCounts() {
     const sec = sectionData[currentSection];
-    const total = (sec && sec.data) ? sec.data.length : 0;
+    const shown = (sec && sec.data) ? sec.data.length : 0;
     const totalEl = document.getElementById('total-count');
     const itemCountEl = document.getElementById('item-count');
     const selectedCountEl = document.getElementById('selected-count');
-    if (totalEl) totalEl.textContent = total;
-    if (itemCountEl) itemCountEl.textContent = total;
+    const total = (tableState.totalIsEstimate ? '~' : '') + tableState.total;
+    if (totalEl) totalEl.textContent = shown;
+    if (itemCountEl) {
+        const first = shown ? (tableState.page - 1) * PAGE_SIZE + 1 : 0;
+        const last = shown ? first + shown - 1 : 0;
+        itemCountEl.textContent = `${first}-${last} of ${total}`;
+    }
+
+    const prevBtn = document.getElementById('page-prev');
+    const nextBtn = document.getElementById('page-next');
+    if (prevBtn) prevBtn.disabled = tableState.page <= 1;
+    if (nextBtn) nextBtn.disabled = !tableState.hasNext;
 
     const selected = document.querySelectorAll('.item-checkbox:checked').length;
     if (selectedCountEl) selectedCountEl.textContent = selected;
@@ -1020,71 +1085,52 @@ async function executeBulkAction() {
         return;
     }
 
-    if (action === 'delete') {
-        // Show confirmation dialog
-        const confirmMsg = `Are you sure you want to delete ${selectedIds.length} item(s)? This action cannot be undone.`;
-        if (!confirm(confirmMsg)) {
-            return;
-        }
-
-        // Delete all selected items
-        const section = currentSection;
-        const config = sectionData[section];
-        let successCount = 0;
-        let failCount = 0;
-
-        for (const id of selectedIds) {
-            if (config && config.apiEndpoint) {
-                const base = config.apiEndpoint;
-                const deleteUrl = base.endsWith('/') ? `${base}${id}/` : `${base}/${id}/`;
+    const config = sectionData[currentSection];
+    if (!config || !config.bulkName) {
+        showToast('This table does not support bulk actions', 'error');
+        return;
+    }
 
-                try {
-                    const token = (typeof csrftoken !== 'undefined') ? csrftoken : (window.csrftoken || '');
-                    const resp = await fetch(deleteUrl, {
-                        method: 'DELETE',
-                        headers: {
-                            'X-CSRFToken': token,
-                            'Accept': 'application/json'
-                        }
-                    });
+    const verb = action === 'delete' ? 'delete' : 'deactivate';
+    let confirmMsg = `Are you sure you want to ${verb} ${selectedIds.length} item(s)?`;
+    if (action === 'delete') confirmMsg += ' This action cannot be undone.';
+    if (!confirm(confirmMsg)) {
+        return;
+    }
 
-                    if (resp.ok) {
-                        // Remove from local data
-                        const index = sectionData[section].data.findIndex(item => item.id === id);
-                        if (index > -1) {
-                            sectionData[section].data.splice(index, 1);
-                        }
-                        successCount++;
-                    } else {
-                        failCount++;
-                    }
-                } catch (err) {
-                    console.error('Bulk delete error for id:', id, err);
-                    failCount++;
-                }
-            } else {
-                // Fallback: local-only delete
-                const index = sectionData[section].data.findIndex(item => item.id === id);
-                if (index > -1) {
-                    sectionData[section].data.splice(index, 1);
-                    successCount++;
-                } else {
-                    failCount++;
-                }
-            }
+    // One request for the whole selection; the server reports each id's outcome
+    const token = (typeof csrftoken !== 'undefined') ? csrftoken : (window.csrftoken || '');
+    try {
+        showPageLoader(true);
+        const resp = await fetch(`/admin-panel/api/bulk/${config.bulkName}/`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': token,
+                'Accept': 'application/json'
+            },
+            body: JSON.stringify({ action: action, ids: selectedIds })
+        });
+        const result = await resp.json();
+        if (!resp.ok) {
+            showToast(result.error || `Failed to ${verb} items.`, 'error');
+            return;
         }
 
-        // Update UI
-        renderTable();
-
-        if (successCount > 0 && failCount === 0) {
-            showToast(`Deleted ${successCount} item(s) successfully!`, 'success');
-        } else if (successCount > 0) {
-            showToast(`Deleted ${successCount} item(s), but ${failCount} failed.`, 'error');
+        const summary = result.summary;
+        result.results.filter(row => row.status !== 'deleted' && row.status !== 'updated')
+            .forEach(row => console.warn(`Bulk ${verb} failed for ${row.id}:`, row.error || row.status));
+        if (summary.failed === 0) {
+            showToast(`${action === 'delete' ? 'Deleted' : 'Deactivated'} ${summary.succeeded} item(s) successfully!`, 'success');
         } else {
-            showToast(`Failed to delete items.`, 'error');
+            showToast(`${summary.succeeded} item(s) done, but ${summary.failed} failed (see console).`, 'error');
         }
-
+        await reloadTable();
+    } catch (err) {
+        console.error('Bulk action error', err);
+        showToast(`Failed to ${verb} items.`, 'error');
+    } finally {
+        showPageLoader(false);
         // Reset action dropdown
         document.getElementById('bulk-action-select').value = '';
     }
@@ -1135,34 +1181,95 @@ function showPageLoader(show) {
     }
 }
 
-// Search functionality
-document.getElementById('search-input').addEventListener('input', function (e) {
-    const searchTerm = e.target.value.toLowerCase();
-    const rows = document.querySelectorAll('#table-body tr');
-    let visibleCount = 0;
-
-    rows.forEach(row => {
-        const text = row.textContent.toLowerCase();
-        const isVisible = text.includes(searchTerm);
-        row.style.display = isVisible ? '' : 'none';
-        if (isVisible) visibleCount++;
+// Reload the current page of the table from the server
+async function reloadTable() {
+    const selectAll = document.getElementById('select-all');
+    if (selectAll) selectAll.checked = false;
+    await fetchSectionData(currentSection);
+    renderTable();
+}
+
+// Download the current table (with its search and sort) as CSV or NDJSON
+function exportCurrentTable(format) {
+    const config = sectionData[currentSection];
+    if (!config || !config.exportName) {
+        showToast('This table cannot be exported', 'error');
+        return;
+    }
+    window.location.href = tableUrl(`/admin-panel/api/export/${config.exportName}/`, {
+        format: format,
+        sort: tableState.sort,
+        search: tableState.search
     });
+}
 
-    // Update item count to show filtered results
-    const itemCountEl = document.getElementById('item-count');
-    if (itemCountEl) {
-        if (searchTerm) {
-            itemCountEl.textContent = `${visibleCount} (filtered from ${rows.length})`;
-        } else {
-            itemCountEl.textContent = rows.length;
+// Bulk user import from a CSV or JSONL file
+async function importUsersFile(input) {
+    const file = input.files[0];
+    if (!file) return;
+
+    const formData = new FormData();
+    formData.append('file', file);
+    const token = (typeof csrftoken !== 'undefined') ? csrftoken : (window.csrftoken || '');
+
+    try {
+        showPageLoader(true);
+        const resp = await fetch('/admin-panel/api/users/import/', {
+            method: 'POST',
+            headers: { 'X-CSRFToken': token, 'Accept': 'application/json' },
+            body: formData
+        });
+        const result = await resp.json();
+        if (!resp.ok) {
+            showToast(result.error || 'Import failed', 'error');
+            return;
         }
-    }
 
-    // Clear "select all" checkbox if some rows are hidden
-    const selectAll = document.getElementById('select-all');
-    if (selectAll && searchTerm) {
-        selectAll.checked = false;
+        const summary = result.summary;
+        const failures = result.results.filter(row => row.status === 'error');
+        failures.forEach(row => console.warn(`Import row ${row.row} (${row.email}):`, row.errors));
+        showToast(
+            `Imported ${summary.created} of ${summary.total} user(s)` + (failures.length ? `; ${failures.length} failed (see console)` : ''),
+            failures.length ? 'error' : 'success'
+        );
+        await reloadTable();
+    } catch (err) {
+        console.error('Import error', err);
+        showToast('Import failed', 'error');
+    } finally {
+        showPageLoader(false);
+        input.value = '';
     }
+}
+
+// Paging
+function changePage(delta) {
+    const page = tableState.page + delta;
+    if (page < 1 || (delta > 0 && !tableState.hasNext)) return;
+    tableState.page = page;
+    reloadTable();
+}
+
+// Sorting: clicking a header toggles between ascending and descending
+function sortByColumn(index) {
+    const keys = sectionData[currentSection].sortKeys || [];
+    const key = keys[index];
+    if (!key) return;
+    tableState.sort = tableState.sort === key ? `-${key}` : key;
+    tableState.page = 1;
+    reloadTable();
+}
+
+// Search functionality (server-side, debounced)
+let searchTimer = null;
+document.getElementById('search-input').addEventListener('input', function (e) {
+    const searchTerm = e.target.value.trim();
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => {
+        tableState.search = searchTerm;
+        tableState.page = 1;
+        reloadTable();
+    }, 300);
 });
 
 // Update selected count on checkbox change
@@ -1,41 +1,35 @@
 // Analytics functionality
 let userChart, orgChart, eventChart; // Global chart instances
 
-async function loadAnalytics() {
+let lastAnalytics = null; // Last payload from the analytics API, used for export
+
+async function loadAnalytics(forceRefresh = false) {
     try {
         showLoadingStates();
 
-        // Fetch summary data (check responses before parsing)
-        const endpoints = [
-            '/admin-panel/api/users/',
-            '/admin-panel/api/organizations/',
-            '/admin-panel/api/events/',
-            '/admin-panel/api/rsvps/'
-        ];
-
-        const responses = await Promise.all(endpoints.map(url => fetch(url)));
-
-        for (const resp of responses) {
-            if (!resp.ok) {
-                throw new Error(`Analytics API error: ${resp.status} ${resp.statusText}`);
-            }
+        // Totals and breakdowns are aggregated server-side, so the payload stays small
+        const url = '/admin-panel/api/analytics/' + (forceRefresh ? '?refresh=1' : '');
+        const response = await fetch(url);
+        if (!response.ok) {
+            throw new Error(`Analytics API error: ${response.status} ${response.statusText}`);
         }
-
-        const [users, orgs, events, rsvps] = await Promise.all(responses.map(r => r.json()));
+        const analytics = (await response.json()).data;
+        lastAnalytics = analytics;
+        const totals = analytics.totals;
 
         // Update summary cards with animation
-        animateCounter('total-users', users.data.length);
-        animateCounter('total-orgs', orgs.data.length);
-        animateCounter('total-events', events.data.length);
-        animateCounter('total-rsvps', rsvps.data.length);
+        animateCounter('total-users', totals.users);
+        animateCounter('total-orgs', totals.organizations);
+        animateCounter('total-events', totals.events);
+        animateCounter('total-rsvps', totals.rsvps);
 
         // Update trend indicators
-        updateTrends(users.data.length, orgs.data.length, events.data.length, rsvps.data.length);
+        updateTrends(totals.users, totals.organizations, totals.events, totals.rsvps);
 
         // Create charts with Chart.js
-        const userData = getUserRegistrationData(users.data);
-        const orgData = getOrgTypeData(orgs.data);
-        const eventData = getEventTypeData(events.data);
+        const userData = getUserRegistrationData(analytics.registrations);
+        const orgData = analytics.organizationTypes;
+        const eventData = analytics.eventTypes;
 
         createUserChart(userData);
         createOrgChart(orgData);
@@ -46,7 +40,7 @@ async function loadAnalytics() {
         populateOrgTable(orgData);
         populateEventTable(eventData);
 
-        loadRecentActivity(events.data.slice(0, 5)); // Last 5 events
+        loadRecentActivity(analytics.recentEvents);
 
         hideLoadingStates();
 
@@ -117,35 +111,15 @@ function animateCounter(elementId, targetValue) {
     requestAnimationFrame(update);
 }
 
-function getUserRegistrationData(users) {
-    // Group by month
+function getUserRegistrationData(registrations) {
+    // Monthly series from the API, keyed by display label
     const monthly = {};
-    users.forEach(user => {
-        const date = new Date(user.dateJoined);
-        const month = date.toLocaleString('default', { month: 'short', year: 'numeric' });
-        monthly[month] = (monthly[month] || 0) + 1;
+    registrations.forEach(row => {
+        monthly[row.label] = row.count;
     });
     return monthly;
 }
 
-function getOrgTypeData(orgs) {
-    const types = {};
-    orgs.forEach(org => {
-        const type = org.type || 'Other';
-        types[type] = (types[type] || 0) + 1;
-    });
-    return types;
-}
-
-function getEventTypeData(events) {
-    const types = {};
-    events.forEach(event => {
-        const type = event.activityType || 'Other';
-        types[type] = (types[type] || 0) + 1;
-    });
-    return types;
-}
-
 function createUserChart(data) {
     const ctx = document.getElementById('userRegistrationChart').getContext('2d');
     const chartType = document.getElementById('chart-type').value;
@@ -375,7 +349,7 @@ document.addEventListener('DOMContentLoaded', function () {
     const refreshBtn = document.getElementById('refresh-analytics');
     if (refreshBtn) {
         refreshBtn.addEventListener('click', function () {
-            loadAnalytics();
+            loadAnalytics(true);
         });
     }
 
@@ -621,9 +595,9 @@ function exportAnalytics() {
             rsvps: document.getElementById('total-rsvps').textContent
         },
         charts: {
-            userRegistration: getUserRegistrationData([]),
-            organizationTypes: getOrgTypeData([]),
-            eventTypes: getEventTypeData([])
+            userRegistration: lastAnalytics ? getUserRegistrationData(lastAnalytics.registrations) : {},
+            organizationTypes: lastAnalytics ? lastAnalytics.organizationTypes : {},
+            eventTypes: lastAnalytics ? lastAnalytics.eventTypes : {}
         }
     };
 
@@ -83,7 +83,7 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // Mark individual notification as read
-    document.querySelectorAll('.notification-item').forEach(item => {
+    function bindNotificationItem(item) {
         item.addEventListener('click', async () => {
             const notificationId = item.dataset.notificationId;
             const orgId = item.dataset.orgId;
@@ -115,58 +115,39 @@ document.addEventListener('DOMContentLoaded', function() {
             // Redirect to organization page
             window.location.href = `/organization/orgpage/${orgId}/`;
         });
-    });
+    }
 
-    // Load more functionality
-    const loadMoreBtn = document.querySelector('.mt-8 button');
-    if (loadMoreBtn) {
-        loadMoreBtn.addEventListener('click', () => {
-            // For demo, duplicate the first notification
-            const firstNotification = document.querySelector('.notification-item');
-            if (firstNotification) {
-                const clone = firstNotification.cloneNode(true);
-                // Change some text to make it different
-                const title = clone.querySelector('h3');
-                if (title) title.textContent = 'Another notification loaded';
-                const desc = clone.querySelector('p');
-                if (desc) desc.textContent = 'This is a loaded notification.';
-                const time = clone.querySelector('.flex.items-center.text-xs span');
-                if (time) time.textContent = 'Just now';
+    document.querySelectorAll('.notification-item').forEach(bindNotificationItem);
 
-                // Append to all-notifications
-                document.getElementById('all-notifications').appendChild(clone);
+    // Load more: fetch the next page of the tab, starting after the last cursor
+    document.querySelectorAll('.load-more-btn').forEach(button => {
+        button.addEventListener('click', async () => {
+            const tab = button.dataset.tab;
+            const list = document.querySelector(`#${tab}-notifications .notification-list`);
+            const params = new URLSearchParams({ tab: tab, cursor: button.dataset.cursor });
+            button.disabled = true;
+            try {
+                const res = await fetch(`${window.location.pathname}?${params}`, {
+                    headers: { 'X-Requested-With': 'XMLHttpRequest' },
+                });
+                if (!res.ok) throw new Error(`Request failed (${res.status})`);
+                const data = await res.json();
 
-                // Reattach event listener
-                clone.addEventListener('click', async () => {
-                    const notificationId = clone.dataset.notificationId;
-                    const orgId = clone.dataset.orgId;
+                const template = document.createElement('template');
+                template.innerHTML = data.html;
+                template.content.querySelectorAll('.notification-item').forEach(bindNotificationItem);
+                list.appendChild(template.content);
 
-                    if (clone.classList.contains('unread')) {
-                        try {
-                            const data = await safeFetch(`/notification/mark-read/${notificationId}/`, { method: 'POST' });
-                            if (data.status === 'success') {
-                                clone.classList.remove('unread', 'bg-gradient-to-r', 'from-blue-50', 'to-white', 'border-l-4', 'border-blue-500');
-                                clone.classList.add('bg-white', 'border', 'border-gray-200');
-                                const indicator = clone.querySelector('.absolute');
-                                if (indicator) indicator.remove();
-                                const unreadBadge = document.querySelector('button[data-tab="unread"] span');
-                                if (unreadBadge) {
-                                    let count = parseInt(unreadBadge.textContent) || 0;
-                                    if (count > 0) {
-                                        count--;
-                                        unreadBadge.textContent = count;
-                                    }
-                                }
-                            }
-                        } catch (err) {
-                            showError('Could not mark this notification as read.');
-                            return;
-                        }
-                    }
-
-                    window.location.href = `/organization/orgpage/${orgId}/`;
-                });
+                if (data.next_cursor) {
+                    button.dataset.cursor = data.next_cursor;
+                } else {
+                    button.parentElement.classList.add('hidden');
+                }
+            } catch (err) {
+                showError('Could not load more notifications.');
+            } finally {
+                button.disabled = false;
             }
         });
-    }
+    });
 });
@@ -0,0 +1,108 @@
+import os
+import threading
+from contextlib import contextmanager
+from decouple import config
+
+# Process-wide Supabase clients, keyed by role and created on first use.
+# Each client keeps its own HTTP connection pool, so reusing it avoids a new
+# client (and new TLS connections) per storage URL or table call.
+_clients = {}
+_lock = threading.Lock()
+_override = None
+
+ROLE_ANON = 'anon'
+ROLE_SERVICE = 'service_role'
+
+
+def _reset_after_fork():
+    # HTTP connections must not be shared between gunicorn workers; let each child build its own
+    global _lock
+    _clients.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _credentials(role):
+    url = config("SUPABASE_URL", default="")
+    key = config("SUPABASE_KEY", default="")
+    if role == ROLE_SERVICE:
+        # Fall back to the anon key when no service role key is configured
+        key = config("SUPABASE_SERVICE_ROLE_KEY", default="") or key
+    return url, key
+
+
+def _create_client(role):
+    # Lazy import to prevent Windows crashes
+    from supabase import create_client
+    url, key = _credentials(role)
+    if url and key:
+        return create_client(url, key)
+    return None
+
+
+def get_supabase_client(role=ROLE_ANON):
+    """Return the shared Supabase client for `role`, or None if unavailable.
+
+    Do not sign users in or out with a shared client: auth calls replace the
+    Authorization header for every later request. Use
+    create_supabase_auth_client() for those.
+    """
+    if _override is not None:
+        return _override
+
+    client = _clients.get(role)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(role)
+        if client is None:
+            try:
+                client = _create_client(role)
+            except Exception as e:
+                print(f"Supabase initialization failed: {e}")
+                return None
+            if client is not None:
+                _clients[role] = client
+    return client
+
+
+def get_supabase_admin_client():
+    """Return the shared service role client, used for admin-only operations such as deleting auth users."""
+    return get_supabase_client(ROLE_SERVICE)
+
+
+def create_supabase_auth_client():
+    """Return a new, unshared client for sign-up, sign-in and sign-out flows.
+
+    These calls store the user's session on the client, so each flow needs
+    its own instance.
+    """
+    if _override is not None:
+        return _override
+    try:
+        return _create_client(ROLE_ANON)
+    except Exception as e:
+        print(f"Supabase initialization failed: {e}")
+        return None
+
+
+def clear_supabase_clients():
+    """Drop cached clients so the next call rebuilds them (e.g. after credentials change)."""
+    with _lock:
+        _clients.clear()
+
+
+@contextmanager
+def override_supabase_client(client):
+    """Make every Supabase lookup return `client` (e.g. a local fake in tests)."""
+    global _override
+    previous = _override
+    _override = client
+    try:
+        yield client
+    finally:
+        _override = previous
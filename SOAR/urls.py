@@ -19,7 +19,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from SOAR.accounts.views import landing_page
-from .views import terms_and_policy, privacy_policy
+from .views import terms_and_policy, privacy_policy, search
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -30,6 +30,7 @@ urlpatterns = [
     path("notifications/", include("SOAR.notification.urls")),
     path("terms-and-policy/", terms_and_policy, name='terms_and_policy'),
     path("privacy-policy/", privacy_policy, name='privacy_policy'),
+    path("search/", search, name='global_search'),
     path("", landing_page, name='home'),
 ]
 
@@ -1,7 +1,22 @@
 from django.shortcuts import render
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .search import MAX_SEARCH_RESULTS_PER_TYPE, SEARCH_RESULTS_PER_TYPE, global_search
 
 def terms_and_policy(request):
     return render(request, 'terms/termsandprivacy.html')
 
 def privacy_policy(request):
-    return render(request, 'privacy/privacypolicy.html')
\ No newline at end of file
+    return render(request, 'privacy/privacypolicy.html')
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """Organizations, upcoming events and fellow members matching ?q=..., grouped by type (optional ?limit= per type)."""
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', SEARCH_RESULTS_PER_TYPE)), MAX_SEARCH_RESULTS_PER_TYPE))
+    except ValueError:
+        return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(global_search(request.user, request.query_params.get('q', ''), limit=limit))